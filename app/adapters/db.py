@@ -1,100 +1,431 @@
+import array
+import bisect
+import math
+import sys
+import time
 import uuid
 import threading
-import asyncio
-from typing import Any
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, ItemsView, Iterator, KeysView, Mapping, Sequence
+import pydantic_core
+from app import metrics
+from app.adapters import search as search_index
+from app.domain import configurations, dtos
 from app.ports import repository
 
+_NEVER = math.inf
+# Per-entry cost of the dict slot outside the record and its key string.
+_ENTRY_OVERHEAD = 40
 
-class DB(repository.Repository):
-    """In memory database."""
+
+def _check_json(value: Any) -> None:
+    """Raise TypeError for anything but JSON types (str/int dict keys), so every repository accepts the same data."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if not isinstance(key, (str, int)) or isinstance(key, bool):
+                raise TypeError(f"keys must be str or int, not {type(key).__name__}")
+            _check_json(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _check_json(item)
+    elif value is not None and not isinstance(value, (str, int, float)):
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class Record:
+    """
+    Compact, immutable record, as stored.
+
+    The payload is kept as zlib-compressed JSON in a slotted object instead of a dict holding a list of
+    strings, which cuts memory per stored summary several times over. Reads hand out a ``RecordView``, so callers
+    can never mutate what is stored.
+    """
+
+    __slots__ = ("_id", "_blob", "_expires_at")
+
+    def __init__(self, obj_id: str, data: Mapping[str, Any], expires_at: float = _NEVER) -> None:
+        payload = {k: v for k, v in data.items() if k != "id"}
+        self._id = obj_id
+        # pydantic-core writes the same compact UTF-8 as json.dumps, several times faster, but it also encodes UUIDs,
+        # datetimes, sets and bytes, which would come back as other types; reject them first, as SQLite does.
+        _check_json(payload)
+        self._blob = zlib.compress(pydantic_core.to_json(payload, inf_nan_mode="constants"))
+        self._expires_at = expires_at
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    def view(self) -> "RecordView":
+        return RecordView(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        data = pydantic_core.from_json(zlib.decompress(self._blob))
+        data["id"] = self._id
+        return data
+
+    def to_json(self) -> bytes:
+        """The record as JSON with the id spliced in, for validating straight into a model without a dict."""
+        payload = zlib.decompress(self._blob)
+        head = b'{"id":' + pydantic_core.to_json(self._id)
+        return head + (b"}" if payload == b"{}" else b"," + payload[1:])
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self) + sys.getsizeof(self._blob) + sys.getsizeof(self._id) + _ENTRY_OVERHEAD
+
+    def __repr__(self) -> str:
+        return f"Record({self.to_dict()!r})"
+
+
+class RecordView(Mapping[str, Any]):
+    """
+    One read of a stored ``Record``. The payload is decoded on the first lookup past ``id`` and the dict kept for the
+    rest, so it is decoded at most once per read however the caller walks it; ``to_json()`` skips the dict entirely.
+    """
+
+    __slots__ = ("_record", "_data")
+
+    def __init__(self, record: Record) -> None:
+        self._record = record
+        self._data: dict[str, Any] | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        if self._data is None:
+            self._data = self._record.to_dict()
+        return self._data
+
+    def to_json(self) -> bytes:
+        return self._record.to_json()
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "id":
+            return self._record.id
+        return self.to_dict()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.to_dict())
+
+    def keys(self) -> KeysView[str]:
+        return self.to_dict().keys()
+
+    def items(self) -> ItemsView[str, Any]:
+        return self.to_dict().items()
+
+    def __repr__(self) -> str:
+        return f"Record({self.to_dict()!r})"
+
+
+class _CreationLog:
+    """
+    Record ids in creation order, for cursor pagination (the store itself is reordered by LRU access).
+
+    Each entry costs a list slot and an 8-byte sequence number. Removed ids are left as tombstones and compacted
+    away once they make up half the log; compaction keeps sequence numbers, so outstanding cursors stay valid.
+    """
 
     def __init__(self) -> None:
-        self._store: dict[str, dict[str, Any]] = {}
+        self._ids: list[str] = []
+        self._seqs = array.array("q")
+        self._next_seq = 1
+        self._dead = 0
+
+    def append(self, obj_id: str) -> None:
+        self._ids.append(obj_id)
+        self._seqs.append(self._next_seq)
+        self._next_seq += 1
+
+    def forget(self, live: Mapping[str, Record]) -> None:
+        self._dead += 1
+        if self._dead * 2 > len(self._ids):
+            keep = [i for i, obj_id in enumerate(self._ids) if obj_id in live]
+            self._ids = [self._ids[i] for i in keep]
+            self._seqs = array.array("q", (self._seqs[i] for i in keep))
+            self._dead = 0
+
+    def scan(self, after: int, limit: int, resolve: Callable[[str], Record | None]) -> tuple[list[Record], int | None]:
+        # Look at one record past the page to know whether a next cursor is needed.
+        found: list[tuple[int, Record]] = []
+        position = bisect.bisect_right(self._seqs, after)
+        while position < len(self._ids) and len(found) <= limit:
+            if (record := resolve(self._ids[position])) is not None:
+                found.append((self._seqs[position], record))
+            position += 1
+        more = len(found) > limit
+        found = found[:limit]
+        return [record for _, record in found], found[-1][0] if more else None
+
+
+@dataclass(frozen=True, slots=True)
+class _Limits:
+    max_records: int
+    max_bytes: int
+    ttl_seconds: float
+
+
+@dataclass(slots=True)
+class _Counters:
+    bytes: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+@dataclass(slots=True)
+class _StoredOnce:
+    """``bulk_acreate_once`` keys and the ids stored under them; a key is forgotten once none of its records is left."""
+
+    ids: dict[str, list[str]] = field(default_factory=dict)
+    owners: dict[str, str] = field(default_factory=dict)  # record id -> key
+    remaining: dict[str, int] = field(default_factory=dict)  # key -> records still stored
+
+    @staticmethod
+    def nbytes(key: str, ids: list[str]) -> int:
+        # The id strings are the records' own; only the map entries and the list are extra.
+        return sys.getsizeof(key) + sys.getsizeof(ids) + _ENTRY_OVERHEAD * (len(ids) + 2)
+
+
+class DB(repository.Repository):  # pylint: disable=too-many-instance-attributes  # all state kept under the one lock
+    """
+    In memory database, bounded by record count and/or bytes with LRU and TTL eviction.
+
+    Sync and async methods share a single ``threading.Lock``: every critical section is dict operations with no
+    ``await`` inside and no record encoded, decoded or tokenized, so holding it from the event loop is cheaper than
+    an ``asyncio.Lock`` and, unlike two separate locks, actually excludes sync writers from async ones. Records are
+    immutable and updated copy-on-write. A limit of 0 disables it. An inverted index over summaries and action items
+    is kept in step with every write, eviction and expiry under the same lock, and its postings count towards
+    ``max_bytes`` like the records themselves (they take several times the compressed record).
+    """
+
+    def __init__(
+        self,
+        max_records: int = 0,
+        max_bytes: int = 0,
+        ttl_seconds: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        # A plain dict keeps insertion order, so re-inserting on access makes it an LRU without OrderedDict's
+        # per-entry links.
+        self._store: dict[str, Record] = {}
+        self._log = _CreationLog()
+        self._index = search_index.InvertedIndex()
+        self._limits = _Limits(max_records, max_bytes, ttl_seconds)
+        self._clock = clock
+        self._counters = _Counters()
+        self._stored_once = _StoredOnce()
 
         self._lock = threading.Lock()
-        self._alock = asyncio.Lock()
 
-    def create(self, data: dict[str, Any]) -> dict[str, Any]:
-        new_id = str(uuid.uuid4())
-        record = dict(data)
-        record["id"] = new_id
-        with self._lock:
-            self._store[new_id] = record
+    def _new_record(self, data: Mapping[str, Any], obj_id: str | None = None) -> Record:
+        ttl = self._limits.ttl_seconds
+        expires_at = self._clock() + ttl if ttl else _NEVER
+        return Record(obj_id or str(uuid.uuid4()), data, expires_at)
+
+    def _put(self, record: Record, counts: Mapping[str, int]) -> None:
+        # Caller holds the lock; ``counts`` are the record's search terms, tokenized by the caller.
+        if (previous := self._store.pop(record.id, None)) is not None:
+            self._counters.bytes -= previous.nbytes + self._index.remove(record.id)
+        else:
+            self._log.append(record.id)
+        self._store[record.id] = record
+        self._counters.bytes += record.nbytes + self._index.add(record.id, counts)
+        self._evict()
+
+    def _drop(self, obj_id: str) -> Record | None:
+        # Caller holds the lock.
+        if (record := self._store.pop(obj_id, None)) is not None:
+            self._counters.bytes -= record.nbytes + self._index.remove(obj_id)
+            self._log.forget(self._store)
+            self._forget_once(obj_id)
         return record
 
-    def get(self, obj_id: str) -> dict[str, Any] | None:
+    def _forget_once(self, obj_id: str) -> None:
+        # Caller holds the lock.
+        once = self._stored_once
+        if (key := once.owners.pop(obj_id, None)) is None:
+            return
+        once.remaining[key] -= 1
+        if not once.remaining[key]:
+            del once.remaining[key]
+            self._counters.bytes -= once.nbytes(key, once.ids.pop(key))
+
+    def _evict(self) -> None:
+        now = self._clock()
+        while self._store:
+            oldest = next(iter(self._store.values()))
+            if oldest._expires_at <= now:  # pylint: disable=protected-access
+                self._counters.expirations += 1
+            elif (self._limits.max_records and len(self._store) > self._limits.max_records) or (
+                self._limits.max_bytes and self._counters.bytes > self._limits.max_bytes
+            ):
+                self._counters.evictions += 1
+            else:
+                return
+            self._drop(oldest.id)
+
+    def _live(self, obj_id: str) -> Record | None:
+        # Caller holds the lock. Expired records are dropped lazily; live ones become most recently used.
+        if (record := self._store.get(obj_id)) is None:
+            return None
+        if record._expires_at <= self._clock():  # pylint: disable=protected-access
+            self._drop(obj_id)
+            self._counters.expirations += 1
+            return None
+        self._store[obj_id] = self._store.pop(obj_id)
+        return record
+
+    @metrics.DB_LATENCY.labels("memory", "insert").time()
+    def create(self, data: Mapping[str, Any]) -> RecordView:
+        record, counts = self._new_record(data), search_index.term_counts(data)
+        with self._lock:
+            self._put(record, counts)
+        return record.view()
+
+    @metrics.DB_LATENCY.labels("memory", "insert").time()
+    def bulk_create(self, data: Sequence[Mapping[str, Any]]) -> list[Mapping[str, Any]]:
+        # Records are encoded and tokenized outside the lock; inserting them all takes it exactly once.
+        records = [(self._new_record(d), search_index.term_counts(d)) for d in data]
         with self._lock:
-            obj = self._store.get(obj_id)
-            return dict(obj) if obj is not None else None
+            for record, counts in records:
+                self._put(record, counts)
+        return [record.view() for record, _ in records]
 
+    @metrics.DB_LATENCY.labels("memory", "insert").time()
+    def bulk_create_once(self, key: str, data: Sequence[Mapping[str, Any]]) -> list[str]:
+        records = [(self._new_record(d), search_index.term_counts(d)) for d in data]
+        with self._lock:
+            once = self._stored_once
+            if (ids := once.ids.get(key)) is None:
+                ids = [record.id for record, _ in records]
+                # Registered before the records go in, so one evicted while the rest are inserted is accounted for. A
+                # key with nothing under it is not kept: nothing would ever evict it.
+                if ids:
+                    once.ids[key], once.remaining[key] = ids, len(ids)
+                    once.owners.update(dict.fromkeys(ids, key))
+                    self._counters.bytes += once.nbytes(key, ids)
+                for record, counts in records:
+                    self._put(record, counts)
+        return list(ids)
+
+    @metrics.DB_LATENCY.labels("memory", "get").time()
+    def get(self, obj_id: str) -> RecordView | None:
+        with self._lock:
+            record = self._live(obj_id)
+        return record.view() if record is not None else None
+
+    @metrics.DB_LATENCY.labels("memory", "update").time()
     def update(
         self,
         obj_id: str,
-        data: dict[str, Any],
-    ) -> dict[str, Any] | None:
+        data: Mapping[str, Any],
+    ) -> RecordView | None:
         with self._lock:
-            if obj_id not in self._store:
+            if (current := self._live(obj_id)) is None:
                 return None
-            current = dict(self._store[obj_id])
-            current.update(data)
-            current["id"] = obj_id  # enforce id
-            self._store[obj_id] = current
-            return dict(current)
+            merged = {**current.to_dict(), **data}
+            record = self._new_record(merged, obj_id=obj_id)  # enforce id
+            self._put(record, search_index.term_counts(merged))
+        return record.view()
 
+    @metrics.DB_LATENCY.labels("memory", "delete").time()
     def delete(self, obj_id: str) -> bool:
         with self._lock:
-            if obj_id in self._store:
-                del self._store[obj_id]
-                return True
-            return False
+            return self._drop(obj_id) is not None
 
-    def all(self) -> list[dict[str, Any]]:
+    @metrics.DB_LATENCY.labels("memory", "all").time()
+    def all(self) -> list[Mapping[str, Any]]:
         with self._lock:
-            return [dict(v) for v in self._store.values()]
-
-    async def acreate(self, data: dict[str, Any]) -> dict[str, Any]:
-        new_id = str(uuid.uuid4())
-        record = dict(data)
-        record["id"] = new_id
-        async with self._alock:
-            self._store[new_id] = record
-        return record
+            now = self._clock()
+            records = [record for record in self._store.values() if record._expires_at > now]  # pylint: disable=protected-access
+        return [record.view() for record in records]
+
+    @metrics.DB_LATENCY.labels("memory", "page").time()
+    def page(self, cursor: str | None, limit: int) -> repository.Page:
+        after = repository.cursor_position(cursor)
+
+        def resolve(obj_id: str) -> Record | None:
+            # Listing is not an access: it neither refreshes LRU order nor drops expired records.
+            record = self._store.get(obj_id)
+            return record if record is not None and record._expires_at > now else None  # pylint: disable=protected-access
+
+        # The lock covers one page worth of lookups; records are immutable, so callers decode them outside it.
+        with self._lock:
+            now = self._clock()
+            records, next_seq = self._log.scan(after, limit, resolve)
+        return [record.view() for record in records], str(next_seq) if next_seq is not None else None
+
+    @metrics.DB_LATENCY.labels("memory", "search").time()
+    def search(self, query: str, cursor: str | None, limit: int) -> repository.Page:
+        offset = repository.cursor_position(cursor)
+        # Matching takes the lock; ranking, which is linear in the number of matches, runs outside it so broad
+        # queries never stall writers.
+        with self._lock:
+            matches = self._index.match(query)
+        # Expired records stay indexed until they are swept, so positions count live records only: rank a window,
+        # and widen it until it holds the page plus one more live record or runs out of matches.
+        wanted = window = offset + limit + 1
+        while True:
+            ids = matches.top(window)
+            with self._lock:
+                now = self._clock()
+                found = [self._store.get(obj_id) for obj_id in ids]
+            live = [r for r in found if r is not None and r._expires_at > now]  # pylint: disable=protected-access
+            if len(live) >= wanted or len(ids) < window:
+                break
+            window *= 2
+        return [record.view() for record in live[offset : offset + limit]], str(offset + limit) if len(live) >= wanted else None
+
+    def footprint(self) -> dtos.StoreStats:
+        with self._lock:
+            return dtos.StoreStats(
+                records=len(self._store),
+                bytes=self._counters.bytes,
+                max_records=self._limits.max_records,
+                max_bytes=self._limits.max_bytes,
+                evictions=self._counters.evictions,
+                expirations=self._counters.expirations,
+            )
+
+    async def acreate(self, data: Mapping[str, Any]) -> RecordView:
+        return self.create(data)
 
     async def bulk_acreate(
         self,
-        data: list[dict[str, Any]],
-    ) -> list[dict[str, Any]]:
-        return await asyncio.gather(*[self.acreate(d) for d in data])
+        data: Sequence[Mapping[str, Any]],
+    ) -> list[Mapping[str, Any]]:
+        return self.bulk_create(data)
 
-    async def aget(self, obj_id: str) -> dict[str, Any] | None:
-        async with self._alock:
-            obj = self._store.get(obj_id)
-            return dict(obj) if obj is not None else None
+    async def bulk_acreate_once(self, key: str, data: Sequence[Mapping[str, Any]]) -> list[str]:
+        return self.bulk_create_once(key, data)
+
+    async def aget(self, obj_id: str) -> RecordView | None:
+        return self.get(obj_id)
 
     async def aupdate(
         self,
         obj_id: str,
-        data: dict[str, Any],
-    ) -> dict[str, Any] | None:
-        async with self._alock:
-            if obj_id not in self._store:
-                return None
-            current = dict(self._store[obj_id])
-            current.update(data)
-            current["id"] = obj_id
-            self._store[obj_id] = current
-            return dict(current)
+        data: Mapping[str, Any],
+    ) -> RecordView | None:
+        return self.update(obj_id, data)
 
     async def adelete(self, obj_id: str) -> bool:
-        async with self._alock:
-            if obj_id in self._store:
-                del self._store[obj_id]
-                return True
-            return False
+        return self.delete(obj_id)
+
+    async def aall(self) -> list[Mapping[str, Any]]:
+        return self.all()
+
+    async def apage(self, cursor: str | None, limit: int) -> repository.Page:
+        return self.page(cursor, limit)
 
-    async def aall(self) -> list[dict[str, Any]]:
-        async with self._alock:
-            return [dict(v) for v in self._store.values()]
+    async def asearch(self, query: str, cursor: str | None, limit: int) -> repository.Page:
+        return self.search(query, cursor, limit)
 
 
-database = DB()
+database = DB(
+    max_records=configurations.app_settings.DB_MAX_RECORDS,
+    max_bytes=configurations.app_settings.DB_MAX_BYTES,
+    ttl_seconds=configurations.app_settings.DB_TTL_SECONDS,
+)
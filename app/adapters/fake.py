@@ -0,0 +1,89 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import pydantic
+from app import ports
+from app.domain import errors, tokens, usage
+
+_DEFAULT_PAYLOAD: dict[str, Any] = {
+    "summary": "Fake summary of the transcript.",
+    "action_items": ["Follow up on the discussed topics."],
+}
+
+
+@dataclass(frozen=True, slots=True)
+class _Faults:
+    error_rate: float
+    rate_limit_rate: float
+    retry_after: float | None
+
+
+class FakeLLM(ports.LLm):
+    """
+    Offline LLM returning a canned payload validated into the requested DTO.
+
+    Latency is log-normal around ``latency`` (``latency_sigma=0`` makes it fixed). A ``rate_limit_rate`` share of
+    calls fail like a 429 (retryable, with ``retry_after``) and an ``error_rate`` share fail permanently. Draws come
+    from one seeded generator, so a given seed replays the same sequence of outcomes. Successful calls report
+    usage estimated from the prompt and payload sizes, so token accounting can be exercised offline.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        latency: float = 0.0,
+        payload: dict[str, Any] | None = None,
+        *,
+        latency_sigma: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float | None = None,
+        seed: int | None = None,
+    ) -> None:
+        self._latency = latency
+        self._payload = payload or _DEFAULT_PAYLOAD
+        self._completion_tokens = tokens.estimate_tokens(json.dumps(self._payload))
+        self._latency_sigma = latency_sigma
+        self._faults = _Faults(error_rate, rate_limit_rate, retry_after)
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def _draw(self) -> tuple[float, Exception | None]:
+        with self._rng_lock:
+            latency = self._latency * self._rng.lognormvariate(0, self._latency_sigma) if self._latency_sigma else self._latency
+            roll = self._rng.random()
+        if roll < self._faults.rate_limit_rate:
+            return latency, errors.RetryableLLMError("fake rate limit (429)", retry_after=self._faults.retry_after)
+        if roll < self._faults.rate_limit_rate + self._faults.error_rate:
+            return latency, errors.LLMError("fake upstream error")
+        return latency, None
+
+    def run_completion(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        dto: type[pydantic.BaseModel],
+    ) -> pydantic.BaseModel | None:
+        latency, error = self._draw()
+        time.sleep(latency)
+        if error is not None:
+            raise error
+        usage.record(tokens.estimate_tokens(system_prompt, user_prompt), self._completion_tokens)
+        return dto.model_validate(self._payload)
+
+    async def run_completion_async(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        dto: type[pydantic.BaseModel],
+    ) -> pydantic.BaseModel | None:
+        latency, error = self._draw()
+        await asyncio.sleep(latency)
+        if error is not None:
+            raise error
+        usage.record(tokens.estimate_tokens(system_prompt, user_prompt), self._completion_tokens)
+        return dto.model_validate(self._payload)
@@ -0,0 +1,260 @@
+import asyncio
+import collections
+import contextlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Iterator
+
+import pydantic
+from app import logger, metrics, ports
+from app.domain import dtos, errors
+
+
+@dataclass(frozen=True, slots=True)
+class ConcurrencyPolicy:
+    """
+    AIMD bounds on concurrent async calls: grow by one per success (doubling per round trip until the first sign
+    of congestion, then by about one per round trip), halve on a 429/5xx/timeout or a call slower than
+    ``latency_target`` (0 = errors only). Past ``max_queue`` waiting callers, new calls are refused.
+    """
+
+    initial: int = 4
+    maximum: int = 32
+    latency_target: float = 0.0
+    max_queue: int = 256
+
+
+@dataclass(frozen=True, slots=True)
+class CircuitPolicy:
+    """Open when ``failure_rate`` of the last ``window`` calls (at least ``min_calls``) failed; probe after ``reset_seconds``."""
+
+    failure_rate: float = 0.5
+    min_calls: int = 10
+    window: int = 20
+    reset_seconds: float = 30.0
+    half_open_probes: int = 1
+
+
+@dataclass(slots=True)
+class _Limit:
+    policy: ConcurrencyPolicy
+    value: float
+    inflight: int = 0
+    waiting: int = 0
+    slow_start: bool = True
+    last_decrease: float = float("-inf")
+
+
+@dataclass(slots=True)
+class _Breaker:
+    policy: CircuitPolicy
+    failures: collections.deque[bool]
+    state: dtos.CircuitState = dtos.CircuitState.CLOSED
+    opened_at: float = 0.0
+    opened: int = 0
+    probes: int = 0
+    rejected: int = 0
+
+
+class GuardedLLM(ports.LLm):
+    """
+    Adaptive concurrency limit and circuit breaker in front of one upstream model.
+
+    Only transient upstream failures (``RetryableLLMError``: 429, 5xx, timeouts) count against the model; a bad
+    request says nothing about its health. While the circuit is open every call fails fast with
+    ``LLMUnavailableError``, which the retry policy does not retry, so requests get a quick 503 instead of queueing
+    behind a dead upstream. After ``reset_seconds`` a few probe calls go through: success closes the circuit,
+    failure opens it again. An async call is timed, and admitted as a probe, only once it holds a slot, so queueing
+    doesn't read as upstream latency. Sync calls go through the breaker and feed the limit but never wait for a slot
+    (and don't count as in flight); the threadpool already bounds them.
+    """
+
+    def __init__(
+        self,
+        llm_client: ports.LLm,
+        name: str = "default",
+        concurrency: ConcurrencyPolicy | None = None,
+        circuit: CircuitPolicy | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._llm_client = llm_client
+        self._name = name
+        concurrency = concurrency or ConcurrencyPolicy()
+        circuit = circuit or CircuitPolicy()
+        self._clock = clock
+        self._limit = _Limit(policy=concurrency, value=float(min(concurrency.initial, concurrency.maximum)))
+        self._breaker = _Breaker(policy=circuit, failures=collections.deque(maxlen=circuit.window))
+        self._lock = threading.Lock()
+        self._slots = asyncio.Condition()
+        metrics.LLM_CONCURRENCY_LIMIT.labels(route=name).set(int(self._limit.value))
+        metrics.LLM_CIRCUIT_OPEN.labels(route=name).set(0)
+
+    def run_completion(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        dto: type[pydantic.BaseModel],
+    ) -> pydantic.BaseModel | None:
+        with self._guard() as call:
+            return call(self._llm_client.run_completion(system_prompt, user_prompt, dto))
+
+    async def run_completion_async(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        dto: type[pydantic.BaseModel],
+    ) -> pydantic.BaseModel | None:
+        # Refuse before queueing while the circuit is open, but admit probes and start the clock only once a slot is
+        # taken: time spent waiting for a slot says nothing about upstream latency.
+        self._fail_fast()
+        async with self._slot():
+            with self._guard() as call:
+                return call(await self._llm_client.run_completion_async(system_prompt, user_prompt, dto))
+
+    async def astart(self) -> None:
+        await self._llm_client.astart()
+
+    async def aclose(self) -> None:
+        await self._llm_client.aclose()
+
+    def health(self) -> dtos.CircuitStats:
+        with self._lock:
+            now = self._clock()
+            breaker = self._breaker
+            is_open = breaker.state is dtos.CircuitState.OPEN
+            return dtos.CircuitStats(
+                name=self._name,
+                # An open circuit past its reset time admits the next call as a probe.
+                state=dtos.CircuitState.HALF_OPEN if is_open and self._reset_in(now) <= 0 else breaker.state,
+                retry_after_seconds=max(self._reset_in(now), 0.0) if is_open else None,
+                failure_rate=sum(breaker.failures) / len(breaker.failures) if breaker.failures else 0.0,
+                opened=breaker.opened,
+                concurrency_limit=int(self._limit.value),
+                inflight=self._limit.inflight,
+                waiting=self._limit.waiting,
+                rejected=breaker.rejected,
+            )
+
+    @contextlib.contextmanager
+    def _guard(self) -> Iterator[Callable[[pydantic.BaseModel | None], pydantic.BaseModel | None]]:
+        """Admit a call through the breaker and record how it went; the yielded callable marks it successful."""
+        probe = self._admit()
+        start = self._clock()
+        failed: bool | None = None  # None: refused, cancelled or a bad request, which say nothing about upstream
+
+        def success(result: pydantic.BaseModel | None) -> pydantic.BaseModel | None:
+            nonlocal failed
+            failed = False
+            return result
+
+        try:
+            yield success
+        except errors.LLMUnavailableError:
+            raise
+        except errors.RetryableLLMError:
+            failed = True
+            raise
+        finally:
+            self._record(failed, start, probe)
+
+    def _fail_fast(self) -> None:
+        with self._lock:
+            self._refuse_if_open()
+
+    def _admit(self) -> bool:
+        """Raise if the circuit is open; return whether this call is a half-open probe."""
+        with self._lock:
+            self._refuse_if_open()
+            breaker = self._breaker
+            if breaker.state is dtos.CircuitState.OPEN:
+                breaker.state, breaker.probes = dtos.CircuitState.HALF_OPEN, 0
+                logger.info("circuit %s half-open, probing", self._name)
+            if breaker.state is dtos.CircuitState.HALF_OPEN:
+                breaker.probes += 1
+                return True
+            return False
+
+    def _refuse_if_open(self) -> None:
+        # Caller holds the lock.
+        breaker = self._breaker
+        if breaker.state is dtos.CircuitState.OPEN and (wait := self._reset_in(self._clock())) > 0:
+            self._reject("circuit_open")
+            raise errors.LLMUnavailableError(f"circuit open for {self._name}", retry_after=wait)
+        if breaker.state is dtos.CircuitState.HALF_OPEN and breaker.probes >= breaker.policy.half_open_probes:
+            self._reject("circuit_open")
+            raise errors.LLMUnavailableError(f"circuit half-open for {self._name}, probe in flight")
+
+    @contextlib.asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        async with self._slots:
+            if self._limit.inflight >= int(self._limit.value):
+                if self._limit.waiting >= self._limit.policy.max_queue:
+                    with self._lock:
+                        self._reject("queue_full")
+                    raise errors.LLMUnavailableError(f"{self._name}: {self._limit.waiting} calls already waiting")
+                self._limit.waiting += 1
+                try:
+                    await self._slots.wait_for(lambda: self._limit.inflight < int(self._limit.value))
+                finally:
+                    self._limit.waiting -= 1
+            with self._lock:
+                self._limit.inflight += 1
+        try:
+            yield
+        finally:
+            async with self._slots:
+                with self._lock:
+                    self._limit.inflight -= 1
+                self._slots.notify(max(int(self._limit.value) - self._limit.inflight, 0))
+
+    def _record(self, failed: bool | None, start: float, probe: bool) -> None:
+        with self._lock:
+            now = self._clock()
+            if failed is not None:
+                congested = failed or (0 < self._limit.policy.latency_target < now - start)
+                self._adjust_limit(congested, start)
+            breaker = self._breaker
+            if probe:
+                breaker.probes -= 1
+                if failed:
+                    self._open(now)
+                elif failed is False:
+                    breaker.state = dtos.CircuitState.CLOSED
+                    breaker.failures.clear()
+                    metrics.LLM_CIRCUIT_OPEN.labels(route=self._name).set(0)
+                    logger.info("circuit %s closed", self._name)
+            elif failed is not None and breaker.state is dtos.CircuitState.CLOSED:
+                breaker.failures.append(failed)
+                policy = breaker.policy
+                if len(breaker.failures) >= policy.min_calls and sum(breaker.failures) >= policy.failure_rate * len(breaker.failures):
+                    self._open(now)
+
+    def _adjust_limit(self, congested: bool, start: float) -> None:
+        limit = self._limit
+        if congested:
+            # One decrease per round trip: calls already in flight when we backed off don't count again.
+            if start >= limit.last_decrease:
+                limit.value = max(1.0, limit.value / 2)
+                limit.last_decrease = self._clock()
+                limit.slow_start = False
+        elif limit.slow_start:
+            limit.value = min(float(limit.policy.maximum), limit.value + 1)
+        else:
+            limit.value = min(float(limit.policy.maximum), limit.value + 1 / limit.value)
+        metrics.LLM_CONCURRENCY_LIMIT.labels(route=self._name).set(int(limit.value))
+
+    def _open(self, now: float) -> None:
+        breaker = self._breaker
+        breaker.state, breaker.opened_at = dtos.CircuitState.OPEN, now
+        breaker.opened += 1
+        breaker.failures.clear()
+        metrics.LLM_CIRCUIT_OPEN.labels(route=self._name).set(1)
+        logger.warning("circuit %s open for %.0fs", self._name, self._breaker.policy.reset_seconds)
+
+    def _reset_in(self, now: float) -> float:
+        return self._breaker.opened_at + self._breaker.policy.reset_seconds - now
+
+    def _reject(self, reason: str) -> None:
+        self._breaker.rejected += 1
+        metrics.LLM_REJECTED.labels(route=self._name, reason=reason).inc()
@@ -0,0 +1,52 @@
+import contextlib
+import time
+from typing import Iterator
+
+import pydantic
+from app import metrics, ports
+from app.domain import errors
+
+
+@contextlib.contextmanager
+def _observe(mode: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as exc:
+        # Report the upstream cause (RateLimitError, APITimeoutError...) rather than the domain wrapper.
+        cause = exc.__cause__ or exc
+        metrics.LLM_ERRORS.labels(type=type(cause).__name__, retryable=str(isinstance(exc, errors.RetryableLLMError)).lower()).inc()
+        raise
+    finally:
+        metrics.LLM_LATENCY.labels(mode=mode).observe(time.perf_counter() - start)
+
+
+class InstrumentedLLM(ports.LLm):
+    """Records call latency and failures of the wrapped adapter; sits directly around the real client."""
+
+    def __init__(self, llm_client: ports.LLm) -> None:
+        self._llm_client = llm_client
+
+    def run_completion(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        dto: type[pydantic.BaseModel],
+    ) -> pydantic.BaseModel | None:
+        with _observe("sync"):
+            return self._llm_client.run_completion(system_prompt, user_prompt, dto)
+
+    async def run_completion_async(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        dto: type[pydantic.BaseModel],
+    ) -> pydantic.BaseModel | None:
+        with _observe("async"):
+            return await self._llm_client.run_completion_async(system_prompt, user_prompt, dto)
+
+    async def astart(self) -> None:
+        await self._llm_client.astart()
+
+    async def aclose(self) -> None:
+        await self._llm_client.aclose()
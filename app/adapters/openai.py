@@ -1,15 +1,193 @@
+import asyncio
+import contextlib
+import functools
+import json
+import ssl
+import threading
+from dataclasses import dataclass
+from typing import Any, Final, Iterable, Iterator, Literal, Mapping
+
+import httpx
 import openai
 import pydantic
-from app import ports
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletionMessage, completion_create_params
+from app import logger, ports
+from app.domain import dtos, errors, usage
+from app.ports import batch
+
+
+@contextlib.contextmanager
+def _translate_errors() -> Iterator[None]:
+    """Map SDK exceptions onto domain errors so services can decide what to retry."""
+    try:
+        yield
+    except (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError) as exc:
+        raise errors.RetryableLLMError(str(exc), retry_after=_retry_after(exc)) from exc
+    except openai.APIStatusError as exc:
+        if exc.status_code >= 500:
+            raise errors.RetryableLLMError(str(exc), retry_after=_retry_after(exc)) from exc
+        raise errors.LLMError(str(exc)) from exc
+    except openai.OpenAIError as exc:
+        raise errors.LLMError(str(exc)) from exc
+
+
+def _retry_after(exc: openai.OpenAIError) -> float | None:
+    response = getattr(exc, "response", None)
+    if response is None or (value := response.headers.get("retry-after")) is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _record_usage(reported: CompletionUsage | None) -> None:
+    if reported is not None:
+        usage.record(reported.prompt_tokens, reported.completion_tokens)
+
+
+@functools.cache
+def response_format(dto: type[pydantic.BaseModel]) -> completion_create_params.ResponseFormat:
+    """
+    The strict structured-output schema for ``dto``, built once per model rather than on every call. Built here
+    from pydantic's schema rather than by the SDK's ``.parse()`` helpers, whose schema builder is private.
+    """
+    return {"type": "json_schema", "json_schema": {"name": dto.__name__, "schema": _strict(dto.model_json_schema()), "strict": True}}
+
+
+def _strict(schema: Any) -> Any:
+    # Strict mode wants every object closed and every property required; an optional field stays nullable.
+    if isinstance(schema, list):
+        return [_strict(item) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    strict = {key: _strict(value) for key, value in schema.items() if not (key == "default" and value is None)}
+    if strict.get("type") == "object" and isinstance(properties := strict.get("properties"), dict):
+        strict["additionalProperties"] = False
+        strict["required"] = list(properties)
+    return strict
+
+
+def _parse_message(message: ChatCompletionMessage, dto: type[pydantic.BaseModel]) -> pydantic.BaseModel | None:
+    # Like .parse(): a refusal (or empty content) comes back without a parsed value.
+    if message.refusal or not message.content:
+        return None
+    try:
+        return dto.model_validate_json(message.content)
+    except pydantic.ValidationError as exc:
+        raise errors.LLMError(f"completion did not match the schema: {exc}") from exc
+
+
+@functools.cache
+def _ssl_context() -> ssl.SSLContext:
+    # Loading the CA bundle is the slow part of building a client; every pool shares one context.
+    return httpx.create_ssl_context()
+
+
+_BATCH_ENDPOINT: Final[Literal["/v1/chat/completions"]] = "/v1/chat/completions"
+# Terminal batch states; expired and cancelled batches may still hold results for part of their items.
+_BATCH_FINISHED = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+@dataclass(frozen=True, slots=True)
+class ClientOptions:
+    """
+    Connection pool and timeouts for the adapter's HTTP clients.
+
+    Keep ``max_keepalive_connections`` at or above the scheduler's concurrency so a burst reuses warm connections
+    instead of paying TCP/TLS setup per call. ``http2`` needs the ``h2`` package (the ``http2`` extra).
+    """
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 64
+    keepalive_expiry: float = 30.0
+    timeout: float = 120.0
+    connect_timeout: float = 5.0
+    http2: bool = False
+    warmup_connections: int = 0
+
+    def client_kwargs(self) -> dict[str, Any]:
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            "timeout": httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            "http2": self.http2,
+            "verify": _ssl_context(),
+        }
 
 
 class OpenAIAdapter(ports.LLm):
-    """Adapter for OpenAI API."""
+    """
+    Adapter for OpenAI API.
 
-    def __init__(self, api_key: str, model: str) -> None:
+    The sync and async clients are created on first use (or by ``astart``) over pools sized by ``options``, and
+    ``aclose`` releases them; a call after ``aclose`` starts fresh pools. ``astart`` also builds the schemas of
+    ``response_models`` so no request pays for that.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        api_key: str,
+        model: str,
+        base_url: str | None = None,
+        options: ClientOptions | None = None,
+        *,
+        response_models: Iterable[type[pydantic.BaseModel]] = (),
+    ) -> None:
         self._model = model
-        self._client = openai.OpenAI(api_key=api_key)
-        self._aclient = openai.AsyncOpenAI(api_key=api_key)
+        self._response_models = tuple(response_models)
+        self._credentials = (api_key, base_url)
+        self._options = options or ClientOptions()
+        self._sync_client: openai.OpenAI | None = None
+        self._async_client: openai.AsyncOpenAI | None = None
+        self._clients_lock = threading.Lock()
+
+    @property
+    def _client(self) -> openai.OpenAI:
+        with self._clients_lock:
+            if self._sync_client is None:
+                api_key, base_url = self._credentials
+                # Retries are owned by the service layer's RetryPolicy; SDK retries would multiply attempts.
+                self._sync_client = openai.OpenAI(
+                    api_key=api_key, base_url=base_url, max_retries=0, http_client=httpx.Client(**self._options.client_kwargs())
+                )
+            return self._sync_client
+
+    @property
+    def _aclient(self) -> openai.AsyncOpenAI:
+        with self._clients_lock:
+            if self._async_client is None:
+                api_key, base_url = self._credentials
+                self._async_client = openai.AsyncOpenAI(
+                    api_key=api_key, base_url=base_url, max_retries=0, http_client=httpx.AsyncClient(**self._options.client_kwargs())
+                )
+            return self._async_client
+
+    async def astart(self) -> None:
+        aclient = self._aclient
+        for dto in self._response_models:
+            response_format(dto)
+        if not (count := self._options.warmup_connections):
+            return
+        # Concurrent cheap requests make the pool open ``count`` connections now rather than on the first burst.
+        outcomes = await asyncio.gather(*[aclient.models.retrieve(self._model) for _ in range(count)], return_exceptions=True)
+        if failed := [outcome for outcome in outcomes if isinstance(outcome, Exception)]:
+            logger.warning("connection warm-up: %s of %s requests failed (%s)", len(failed), count, failed[0])
+        else:
+            logger.info("connection warm-up: %s connections open", count)
+
+    async def aclose(self) -> None:
+        with self._clients_lock:
+            clients, self._sync_client, self._async_client = (self._sync_client, self._async_client), None, None
+        sync_client, async_client = clients
+        if sync_client is not None:
+            sync_client.close()
+        if async_client is not None:
+            await async_client.close()
 
     def run_completion(
         self,
@@ -30,15 +208,17 @@ class OpenAIAdapter(ports.LLm):
             more info: https://platform.openai.com/docs/guides/structured-outputs?api-mode=chat
         """
 
-        completion = self._client.beta.chat.completions.parse(
-            model=self._model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            response_format=dto,
-        )
-        return completion.choices[0].message.parsed
+        with _translate_errors():
+            completion = self._client.chat.completions.create(
+                model=self._model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                response_format=response_format(dto),
+            )
+        _record_usage(completion.usage)
+        return _parse_message(completion.choices[0].message, dto)
 
     async def run_completion_async(
         self,
@@ -59,12 +239,116 @@ class OpenAIAdapter(ports.LLm):
 
          more info: https://platform.openai.com/docs/guides/structured-outputs?api-mode=chat
         """
-        completion = await self._aclient.beta.chat.completions.parse(
-            model=self._model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            response_format=dto,
+        with _translate_errors():
+            completion = await self._aclient.chat.completions.create(
+                model=self._model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                response_format=response_format(dto),
+            )
+        _record_usage(completion.usage)
+        return _parse_message(completion.choices[0].message, dto)
+
+
+class OpenAIBatchAdapter(batch.BatchLLm):
+    """
+    Chat completions through the OpenAI Batch API.
+
+    Requests go up as one JSONL file and come back within ``completion_window`` instead of seconds, at half the
+    real-time price and against a separate rate-limit pool, so backfills don't compete with interactive traffic.
+    Responses use the same structured-output schema as ``OpenAIAdapter``. ``base_url`` points the client at a
+    stand-in server in tests.
+    """
+
+    def __init__(self, api_key: str, model: str, base_url: str | None = None) -> None:
+        self._model = model
+        self._credentials = (api_key, base_url)
+
+    @functools.cached_property
+    def _client(self) -> openai.OpenAI:
+        # Built on first use: backfills are rare and the app shouldn't pay for this client at startup.
+        api_key, base_url = self._credentials
+        return openai.OpenAI(api_key=api_key, base_url=base_url, http_client=httpx.Client(verify=_ssl_context()))
+
+    def submit(
+        self,
+        system_prompt: str,
+        user_prompts: Mapping[str, str],
+        dto: type[pydantic.BaseModel],
+    ) -> str:
+        schema = response_format(dto)
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": _BATCH_ENDPOINT,
+                    "body": {
+                        "model": self._model,
+                        "messages": [
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_prompt},
+                        ],
+                        "response_format": schema,
+                    },
+                }
+            )
+            for custom_id, user_prompt in user_prompts.items()
+        ]
+        with _translate_errors():
+            upload = self._client.files.create(file=("batch.jsonl", "\n".join(lines).encode()), purpose="batch")
+            submitted = self._client.batches.create(input_file_id=upload.id, endpoint=_BATCH_ENDPOINT, completion_window="24h")
+        return submitted.id
+
+    def status(self, batch_id: str) -> dtos.BackfillStatus:
+        with _translate_errors():
+            current = self._client.batches.retrieve(batch_id)
+        counts = current.request_counts
+        return dtos.BackfillStatus(
+            id=current.id,
+            status=current.status,
+            finished=current.status in _BATCH_FINISHED,
+            total=counts.total if counts else 0,
+            completed=counts.completed if counts else 0,
+            failed=counts.failed if counts else 0,
         )
-        return completion.choices[0].message.parsed
+
+    def results(self, batch_id: str, dto: type[pydantic.BaseModel]) -> dict[str, batch.Outcome]:
+        outcomes: dict[str, batch.Outcome] = {}
+        with _translate_errors():
+            current = self._client.batches.retrieve(batch_id)
+            for file_id in (current.output_file_id, current.error_file_id):
+                if file_id is None:
+                    continue
+                for line in self._client.files.content(file_id).text.splitlines():
+                    if line.strip():
+                        item = json.loads(line)
+                        outcomes[item["custom_id"]] = _parse_batch_item(item, dto)
+        return outcomes
+
+
+def _parse_batch_item(item: dict[str, Any], dto: type[pydantic.BaseModel]) -> batch.Outcome:
+    response = item.get("response") or {}
+    body = response.get("body") or {}
+    reported = body.get("usage") or {}
+    spent = dtos.TokenUsage(
+        prompt_tokens=reported.get("prompt_tokens", 0),
+        completion_tokens=reported.get("completion_tokens", 0),
+        total_tokens=reported.get("total_tokens", 0),
+    )
+    status_code = response.get("status_code")
+    if item.get("error") or status_code != 200:
+        error = item.get("error") or body.get("error") or {}
+        message = f"batch item failed ({status_code}): {error.get('message', 'no response')}"
+        retryable = status_code is not None and (status_code == 429 or status_code >= 500)
+        return (errors.RetryableLLMError(message) if retryable else errors.LLMError(message)), spent
+
+    message = body["choices"][0]["message"]
+    if message.get("refusal") or not message.get("content"):
+        return errors.LLMError(f"batch item refused: {message.get('refusal')}"), spent
+    try:
+        return dto.model_validate_json(message["content"]), spent
+    except pydantic.ValidationError as exc:
+        return errors.LLMError(f"batch item did not match the schema: {exc}"), spent
@@ -0,0 +1,232 @@
+import asyncio
+import collections
+import contextlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+import pydantic
+from app import metrics, ports
+from app.domain import dtos, tokens, usage
+
+
+@dataclass(frozen=True, slots=True)
+class Route:
+    """A model tier: prompts estimated at or under ``max_prompt_tokens`` may go here (``None`` = no limit)."""
+
+    name: str
+    llm_client: ports.LLm
+    max_prompt_tokens: int | None = None
+
+
+@dataclass(slots=True)
+class _Stats:
+    latencies: collections.deque[float]
+    calls: int = 0
+    failures: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+
+    def percentile(self, q: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[round(q * (len(ordered) - 1))]
+
+
+@dataclass(slots=True)
+class _Hedging:
+    percentile: float
+    min_samples: int
+    max_fraction: float
+    calls: int = 0  # async calls that could have been hedged
+    sent: int = 0
+
+
+class RoutingLLM(ports.LLm):
+    """
+    Sends each completion to the first route whose token limit fits the prompt, optionally hedged.
+
+    With a ``hedge`` route, an async call that is still running after its route's ``hedge_percentile`` latency is
+    duplicated to the hedge model; the first successful answer wins and the other call is cancelled. The threshold
+    comes from the route's recent latencies, so nothing is hedged until ``min_samples`` calls have finished, and
+    ``max_hedge_fraction`` caps the extra load. The caller's admission slot covers only the primary call, so the
+    hedge first takes its own from ``hedge_slot`` (given the estimated prompt tokens, e.g. the shared scheduler's
+    ``slot``) and counts against the same concurrency and rate limits. A cancelled call never reports its usage,
+    so it is charged its estimated prompt tokens: the provider bills a request it has received even when nobody
+    reads the answer. Sync calls are routed but never hedged: a thread can't be cancelled.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        routes: Sequence[Route],
+        hedge: Route | None = None,
+        *,
+        hedge_percentile: float = 0.95,
+        min_samples: int = 20,
+        max_hedge_fraction: float = 0.1,
+        window: int = 500,
+        hedge_slot: Callable[[int], contextlib.AbstractAsyncContextManager[object]] | None = None,
+    ) -> None:
+        if not routes:
+            raise ValueError("at least one route is required")
+        self._routes = sorted(routes, key=lambda route: float("inf") if route.max_prompt_tokens is None else route.max_prompt_tokens)
+        self._hedge = hedge
+        self._hedging = _Hedging(percentile=hedge_percentile, min_samples=min_samples, max_fraction=max_hedge_fraction)
+        self._hedge_slot = hedge_slot
+        names = [route.name for route in self._all_routes()]
+        if len(set(names)) != len(names):
+            raise ValueError(f"route names must be unique: {names}")
+        self._stats = {name: _Stats(latencies=collections.deque(maxlen=window)) for name in names}
+        self._lock = threading.Lock()
+
+    @property
+    def routes(self) -> list[Route]:
+        """Every route, smallest limit first, then the hedge route if there is one."""
+        return self._all_routes()
+
+    def route(self, system_prompt: str, user_prompt: str) -> Route:
+        estimate = tokens.estimate_tokens(system_prompt, user_prompt)
+        for route in self._routes:
+            if route.max_prompt_tokens is None or estimate <= route.max_prompt_tokens:
+                return route
+        return self._routes[-1]
+
+    def run_completion(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        dto: type[pydantic.BaseModel],
+    ) -> pydantic.BaseModel | None:
+        route = self.route(system_prompt, user_prompt)
+        start = time.perf_counter()
+        try:
+            result = route.llm_client.run_completion(system_prompt, user_prompt, dto)
+        except Exception:
+            self._observe(route, time.perf_counter() - start, failed=True)
+            raise
+        self._observe(route, time.perf_counter() - start)
+        return result
+
+    async def run_completion_async(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        dto: type[pydantic.BaseModel],
+    ) -> pydantic.BaseModel | None:
+        route = self.route(system_prompt, user_prompt)
+        if (delay := self._hedge_after(route)) is None:
+            return await self._acall(route, system_prompt, user_prompt, dto)
+        primary = asyncio.ensure_future(self._acall(route, system_prompt, user_prompt, dto))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except BaseException:
+            primary.cancel()
+            raise
+        if done or self._hedge is None or not self._take_hedge():
+            return await primary
+
+        hedge = asyncio.ensure_future(self._ahedge(self._hedge, system_prompt, user_prompt, dto))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer the primary when both land together; a failed call leaves the other one running.
+                for task in sorted(done, key=lambda task: task is not primary):
+                    if task.exception() is None:
+                        self._settle_hedge(route, hedge_won=task is hedge)
+                        return task.result()
+            self._settle_hedge(route, hedge_won=False)
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def astart(self) -> None:
+        for route in self._all_routes():
+            await route.llm_client.astart()
+
+    async def aclose(self) -> None:
+        for route in self._all_routes():
+            await route.llm_client.aclose()
+
+    def stats(self) -> dtos.RoutingStats:
+        with self._lock:
+            return dtos.RoutingStats(
+                routes=[self._route_stats(route) for route in self._routes],
+                hedge=self._route_stats(self._hedge) if self._hedge else None,
+            )
+
+    def _all_routes(self) -> list[Route]:
+        return [*self._routes, *([self._hedge] if self._hedge else [])]
+
+    async def _ahedge(self, route: Route, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]) -> pydantic.BaseModel | None:
+        if self._hedge_slot is None:
+            return await self._acall(route, system_prompt, user_prompt, dto)
+        async with self._hedge_slot(tokens.estimate_tokens(system_prompt, user_prompt)):
+            return await self._acall(route, system_prompt, user_prompt, dto)
+
+    async def _acall(self, route: Route, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]) -> pydantic.BaseModel | None:
+        start = time.perf_counter()
+        try:
+            result = await route.llm_client.run_completion_async(system_prompt, user_prompt, dto)
+        except asyncio.CancelledError:
+            # A cancelled loser ran at least this long; dropping it would hide exactly the slow tail we hedge against.
+            self._observe(route, time.perf_counter() - start)
+            usage.record(tokens.estimate_tokens(system_prompt, user_prompt), 0)
+            raise
+        except Exception:
+            self._observe(route, time.perf_counter() - start, failed=True)
+            raise
+        self._observe(route, time.perf_counter() - start)
+        return result
+
+    def _observe(self, route: Route, seconds: float, failed: bool = False) -> None:
+        metrics.LLM_ROUTE_LATENCY.labels(route=route.name).observe(seconds)
+        with self._lock:
+            stats = self._stats[route.name]
+            stats.calls += 1
+            if failed:
+                stats.failures += 1
+            else:
+                stats.latencies.append(seconds)
+
+    def _hedge_after(self, route: Route) -> float | None:
+        if self._hedge is None or route is self._hedge:
+            return None
+        with self._lock:
+            self._hedging.calls += 1
+            stats = self._stats[route.name]
+            if len(stats.latencies) < self._hedging.min_samples:
+                return None
+            return stats.percentile(self._hedging.percentile)
+
+    def _take_hedge(self) -> bool:
+        with self._lock:
+            if self._hedging.sent + 1 > self._hedging.max_fraction * self._hedging.calls:
+                return False
+            self._hedging.sent += 1
+            return True
+
+    def _settle_hedge(self, route: Route, hedge_won: bool) -> None:
+        metrics.LLM_HEDGES.labels(route=route.name, winner="hedge" if hedge_won else "primary").inc()
+        with self._lock:
+            stats = self._stats[route.name]
+            stats.hedged += 1
+            stats.hedge_wins += hedge_won
+
+    def _route_stats(self, route: Route) -> dtos.RouteStats:
+        stats = self._stats[route.name]
+        hedging = self._hedge is not None and route is not self._hedge and len(stats.latencies) >= self._hedging.min_samples
+        return dtos.RouteStats(
+            name=route.name,
+            max_prompt_tokens=route.max_prompt_tokens,
+            calls=stats.calls,
+            failures=stats.failures,
+            p50_seconds=stats.percentile(0.5),
+            p95_seconds=stats.percentile(0.95),
+            hedge_after_seconds=stats.percentile(self._hedging.percentile) if hedging else None,
+            hedged=stats.hedged,
+            hedge_wins=stats.hedge_wins,
+        )
@@ -0,0 +1,136 @@
+import collections
+import heapq
+import math
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+_WORD = re.compile(r"[^\W_]+")
+# BM25 term-frequency saturation and length normalization.
+_K1 = 1.2
+_B = 0.75
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have he her his in into is it its of on or our she so that the their "
+    "them they this to was we were will with you your".split()
+)
+# Traced cost of one posting entry and of a document's own entries (length, term tuple header), measured with
+# benchmarks/db_memory.py on a store that is evicting: dicts that keep losing and gaining entries settle at about three
+# times their live size. Used to charge the index to the owning store's byte budget.
+_POSTING_BYTES = 64
+_DOC_BYTES = 120
+
+
+def terms(text: str) -> list[str]:
+    """Lower-cased word tokens without stopwords; queries and records go through the same function."""
+    return [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+
+
+def record_text(record: Mapping[str, Any]) -> str:
+    return " ".join([record.get("summary") or "", *(record.get("action_items") or [])])
+
+
+def term_counts(record: Mapping[str, Any]) -> collections.Counter[str]:
+    return collections.Counter(terms(record_text(record)))
+
+
+@dataclass(slots=True)
+class Matches:
+    """
+    Matching ids plus what BM25 needs to rank them.
+
+    Ranking only reads the live index one key at a time and tolerates records removed since ``match``.
+    """
+
+    ids: set[str] = field(default_factory=set)
+    postings: list[dict[str, int]] = field(default_factory=list)
+    weights: list[float] = field(default_factory=list)
+    lengths: Mapping[str, int] = field(default_factory=dict)
+    average_length: float = 1.0
+
+    def top(self, limit: int, offset: int = 0) -> list[str]:
+        base, slope = _K1 * (1 - _B), _K1 * _B / self.average_length
+        terms_ = list(zip(self.weights, self.postings))
+        lengths = self.lengths
+
+        def score(doc_id: str) -> float:
+            norm = base + slope * lengths.get(doc_id, self.average_length)
+            total = 0.0
+            for weight, postings in terms_:
+                frequency = postings.get(doc_id, 0)
+                total += weight * frequency * (_K1 + 1) / (frequency + norm)
+            return total
+
+        return heapq.nlargest(offset + limit, self.ids, key=score)[offset:]
+
+
+class InvertedIndex:
+    """
+    Term -> {record id: term frequency} index over summaries and action items, ranked with BM25.
+
+    Queries match records containing every term, starting from the postings of the rarest one, so their cost
+    follows the number of matches rather than the size of the store. Each document's terms are kept, as the same
+    string objects the postings are keyed by, so removing it never needs the document again. Not thread-safe: the
+    owning repository serializes writes and ``match`` under its own lock.
+    """
+
+    def __init__(self) -> None:
+        self._postings: dict[str, dict[str, int]] = {}
+        self._lengths: dict[str, int] = {}
+        self._terms: dict[str, tuple[str, ...]] = {}
+        self._vocabulary: dict[str, str] = {}  # one string per distinct term, shared by every document that has it
+        self._total_length = 0
+
+    def add(self, doc_id: str, counts: Mapping[str, int]) -> int:
+        """Index a document (replacing any earlier version); returns roughly how many bytes it now takes."""
+        self.remove(doc_id)
+        self._lengths[doc_id] = length = sum(counts.values())
+        self._total_length += length
+        canonical = self._vocabulary.setdefault
+        self._terms[doc_id] = terms_ = tuple(canonical(term, term) for term in counts)
+        for term, frequency in zip(terms_, counts.values()):
+            self._postings.setdefault(term, {})[doc_id] = frequency
+        return _nbytes(terms_)
+
+    def remove(self, doc_id: str) -> int:
+        """Drop a document; returns the bytes ``add`` reported for it (0 if it wasn't indexed)."""
+        if (length := self._lengths.pop(doc_id, None)) is None:
+            return 0
+        self._total_length -= length
+        terms_ = self._terms.pop(doc_id)
+        for term in terms_:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term], self._vocabulary[term]
+        return _nbytes(terms_)
+
+    def match(self, query: str) -> Matches:
+        """
+        Records containing every query term.
+
+        Only set operations on the postings run here, rarest term first and at C speed, so this is cheap enough for
+        the owner to call under its lock; ranking can then happen outside it.
+        """
+        if not (query_terms := set(terms(query))) or not self._lengths:
+            return Matches()
+        postings = sorted((self._postings.get(term, {}) for term in query_terms), key=len)
+        ids = set(postings[0])
+        for p in postings[1:]:
+            ids &= p.keys()
+        count = len(self._lengths)
+        return Matches(
+            ids=ids,
+            postings=postings,
+            weights=[math.log(1 + (count - len(p) + 0.5) / (len(p) + 0.5)) for p in postings],
+            lengths=self._lengths,
+            average_length=self._total_length / count,
+        )
+
+    def search(self, query: str, limit: int, offset: int = 0) -> list[str]:
+        """Ids of the best ``limit`` matches after skipping ``offset``, best first."""
+        return self.match(query).top(limit, offset)
+
+
+def _nbytes(terms_: tuple[str, ...]) -> int:
+    return _DOC_BYTES + sys.getsizeof(terms_) + _POSTING_BYTES * len(terms_)
@@ -0,0 +1,109 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Hashable
+
+import pydantic
+from app import ports
+
+
+class _Abandoned(Exception):
+    """The leading caller was cancelled before its call finished; a follower issues the call instead."""
+
+
+class SingleFlightLLM(ports.LLm):
+    """
+    Coalesces identical in-flight completions so concurrent callers share one upstream call.
+
+    Sync (threadpool) and async callers join the same pending future, so a burst of identical
+    requests costs a single completion regardless of which path they arrive through. Followers
+    share the leader's result or error, but not its cancellation: if the leader is cancelled,
+    they re-join and one of them makes the call.
+    """
+
+    def __init__(self, llm_client: ports.LLm) -> None:
+        self._llm_client = llm_client
+        self._inflight: dict[Hashable, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+
+    def run_completion(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        dto: type[pydantic.BaseModel],
+    ) -> pydantic.BaseModel | None:
+        key = (system_prompt, user_prompt, dto)
+        while not (joined := self._join(key))[1]:
+            try:
+                return joined[0].result()
+            except _Abandoned:
+                continue
+        future = joined[0]
+        try:
+            result = self._llm_client.run_completion(system_prompt, user_prompt, dto)
+        except Exception as exc:
+            self._settle(key, future, exc=exc)
+            raise
+        except BaseException:
+            self._settle(key, future, exc=_Abandoned())
+            raise
+        self._settle(key, future, result=result)
+        return result
+
+    async def run_completion_async(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        dto: type[pydantic.BaseModel],
+    ) -> pydantic.BaseModel | None:
+        key = (system_prompt, user_prompt, dto)
+        while not (joined := self._join(key))[1]:
+            try:
+                # Shield so a cancelled follower does not cancel the call everyone else is waiting on.
+                return await asyncio.shield(asyncio.wrap_future(joined[0]))
+            except _Abandoned:
+                continue
+        future = joined[0]
+        try:
+            result = await self._llm_client.run_completion_async(system_prompt, user_prompt, dto)
+        except Exception as exc:
+            self._settle(key, future, exc=exc)
+            raise
+        except BaseException:
+            # A cancelled leader says nothing about the call; its followers re-join and one of them issues it.
+            self._settle(key, future, exc=_Abandoned())
+            raise
+        self._settle(key, future, result=result)
+        return result
+
+    async def astart(self) -> None:
+        await self._llm_client.astart()
+
+    async def aclose(self) -> None:
+        await self._llm_client.aclose()
+
+    def inflight(self) -> int:
+        with self._lock:
+            return len(self._inflight)
+
+    def _join(self, key: Hashable) -> tuple[concurrent.futures.Future, bool]:
+        with self._lock:
+            if (future := self._inflight.get(key)) is not None:
+                return future, False
+            future = concurrent.futures.Future()
+            self._inflight[key] = future
+            return future, True
+
+    def _settle(
+        self,
+        key: Hashable,
+        future: concurrent.futures.Future,
+        result: pydantic.BaseModel | None = None,
+        exc: BaseException | None = None,
+    ) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
@@ -0,0 +1,223 @@
+import asyncio
+import contextlib
+import json
+import queue
+import sqlite3
+import uuid
+from typing import Any, Iterator, Mapping, Sequence
+
+from app import metrics
+from app.adapters import search as search_index
+from app.ports import repository
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    seq  INTEGER PRIMARY KEY AUTOINCREMENT,
+    id   TEXT NOT NULL UNIQUE,
+    data TEXT NOT NULL
+)
+"""
+
+# Ids stored by bulk_acreate_once, by key; the row is written in the same transaction as the records.
+_ONCE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stored_once (
+    key TEXT PRIMARY KEY,
+    ids TEXT NOT NULL
+)
+"""
+
+# Searchable text of a record row: its summary followed by its action items.
+_BODY = """
+coalesce(json_extract({row}.data, '$.summary'), '') || ' ' ||
+coalesce((SELECT group_concat(value, ' ') FROM json_each({row}.data, '$.action_items')), '')
+"""
+
+# FTS5 index keyed by records.seq and kept in step by triggers, so every writer (and every worker process)
+# maintains it inside its own transaction. The backfill only runs when the index is created on an older file.
+_SEARCH_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5(body);
+CREATE TRIGGER IF NOT EXISTS records_fts_insert AFTER INSERT ON records BEGIN
+    INSERT INTO records_fts (rowid, body) VALUES (new.seq, {_BODY.format(row="new")});
+END;
+CREATE TRIGGER IF NOT EXISTS records_fts_update AFTER UPDATE OF data ON records BEGIN
+    UPDATE records_fts SET body = {_BODY.format(row="new")} WHERE rowid = new.seq;
+END;
+CREATE TRIGGER IF NOT EXISTS records_fts_delete AFTER DELETE ON records BEGIN
+    DELETE FROM records_fts WHERE rowid = old.seq;
+END;
+INSERT INTO records_fts (rowid, body)
+    SELECT seq, {_BODY.format(row="records")} FROM records WHERE NOT EXISTS (SELECT 1 FROM records_fts);
+"""
+
+
+class SQLiteDB(repository.Repository):
+    """
+    SQLite-backed repository shared by every worker process on the host.
+
+    Runs in WAL mode so readers never block the single writer, keeps a small pool of connections,
+    and offloads the async twins to a thread so they never block the event loop.
+    """
+
+    def __init__(self, path: str, pool_size: int = 4, timeout: float = 5.0) -> None:
+        self._path = path
+        self._pool: queue.Queue[sqlite3.Connection] = queue.Queue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._pool.put(self._connect(timeout))
+        with self._connection() as conn:
+            conn.execute(_SCHEMA)
+            conn.execute(_ONCE_SCHEMA)
+            conn.executescript(_SEARCH_SCHEMA)
+
+    def _connect(self, timeout: float) -> sqlite3.Connection:
+        # Autocommit mode; multi-statement writes open explicit transactions.
+        conn = sqlite3.connect(self._path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextlib.contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self) -> None:
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+    @staticmethod
+    def _row(obj_id: str, data: str) -> dict[str, Any]:
+        record = json.loads(data)
+        record["id"] = obj_id
+        return record
+
+    @staticmethod
+    def _encode(data: Mapping[str, Any]) -> str:
+        return json.dumps({k: v for k, v in data.items() if k != "id"})
+
+    def create(self, data: Mapping[str, Any]) -> Mapping[str, Any]:
+        return self._insert_many([data])[0]
+
+    @metrics.DB_LATENCY.labels("sqlite", "insert").time()
+    def _insert_many(self, data: Sequence[Mapping[str, Any]]) -> list[Mapping[str, Any]]:
+        rows = [(str(uuid.uuid4()), self._encode(d)) for d in data]
+        with self._transaction() as conn:
+            conn.executemany("INSERT INTO records (id, data) VALUES (?, ?)", rows)
+        return [{**d, "id": new_id} for d, (new_id, _) in zip(data, rows)]
+
+    @metrics.DB_LATENCY.labels("sqlite", "insert").time()
+    def _insert_once(self, key: str, data: Sequence[Mapping[str, Any]]) -> list[str]:
+        rows = [(str(uuid.uuid4()), self._encode(d)) for d in data]
+        # BEGIN IMMEDIATE takes the write lock before the lookup, so two processes can't both miss the key.
+        with self._transaction() as conn:
+            if (row := conn.execute("SELECT ids FROM stored_once WHERE key = ?", (key,)).fetchone()) is not None:
+                return json.loads(row[0])
+            conn.executemany("INSERT INTO records (id, data) VALUES (?, ?)", rows)
+            ids = [new_id for new_id, _ in rows]
+            conn.execute("INSERT INTO stored_once (key, ids) VALUES (?, ?)", (key, json.dumps(ids)))
+        return ids
+
+    @metrics.DB_LATENCY.labels("sqlite", "get").time()
+    def get(self, obj_id: str) -> Mapping[str, Any] | None:
+        with self._connection() as conn:
+            row = conn.execute("SELECT id, data FROM records WHERE id = ?", (obj_id,)).fetchone()
+        return self._row(*row) if row else None
+
+    @metrics.DB_LATENCY.labels("sqlite", "update").time()
+    def update(
+        self,
+        obj_id: str,
+        data: Mapping[str, Any],
+    ) -> Mapping[str, Any] | None:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT id, data FROM records WHERE id = ?", (obj_id,)).fetchone()
+            if row is None:
+                return None
+            current = self._row(*row)
+            current.update(data)
+            current["id"] = obj_id  # enforce id
+            conn.execute("UPDATE records SET data = ? WHERE id = ?", (self._encode(current), obj_id))
+        return current
+
+    @metrics.DB_LATENCY.labels("sqlite", "delete").time()
+    def delete(self, obj_id: str) -> bool:
+        with self._connection() as conn:
+            return conn.execute("DELETE FROM records WHERE id = ?", (obj_id,)).rowcount > 0
+
+    @metrics.DB_LATENCY.labels("sqlite", "all").time()
+    def all(self) -> list[Mapping[str, Any]]:
+        with self._connection() as conn:
+            return [self._row(*row) for row in conn.execute("SELECT id, data FROM records ORDER BY seq")]
+
+    @metrics.DB_LATENCY.labels("sqlite", "page").time()
+    def page(self, cursor: str | None, limit: int) -> repository.Page:
+        after = repository.cursor_position(cursor)
+        with self._connection() as conn:
+            # One extra row tells whether another page follows without a COUNT.
+            rows = conn.execute("SELECT seq, id, data FROM records WHERE seq > ? ORDER BY seq LIMIT ?", (after, limit + 1)).fetchall()
+        more = len(rows) > limit
+        rows = rows[:limit]
+        return [self._row(obj_id, data) for _, obj_id, data in rows], str(rows[-1][0]) if more else None
+
+    @metrics.DB_LATENCY.labels("sqlite", "search").time()
+    def search(self, query: str, cursor: str | None, limit: int) -> repository.Page:
+        offset = repository.cursor_position(cursor)
+        if not (terms := search_index.terms(query)):
+            return [], None
+        # Quote every term so user input is never parsed as FTS5 syntax; adjacent strings are ANDed.
+        match = " ".join(f'"{term}"' for term in terms)
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT r.id, r.data FROM records_fts JOIN records r ON r.seq = records_fts.rowid "
+                "WHERE records_fts MATCH ? ORDER BY rank LIMIT ? OFFSET ?",
+                (match, limit + 1, offset),
+            ).fetchall()
+        return [self._row(*row) for row in rows[:limit]], str(offset + limit) if len(rows) > limit else None
+
+    async def acreate(self, data: Mapping[str, Any]) -> Mapping[str, Any]:
+        return await asyncio.to_thread(self.create, data)
+
+    async def bulk_acreate(
+        self,
+        data: Sequence[Mapping[str, Any]],
+    ) -> list[Mapping[str, Any]]:
+        # One transaction for the whole batch instead of one commit per record.
+        return await asyncio.to_thread(self._insert_many, data)
+
+    async def bulk_acreate_once(self, key: str, data: Sequence[Mapping[str, Any]]) -> list[str]:
+        return await asyncio.to_thread(self._insert_once, key, data)
+
+    async def aget(self, obj_id: str) -> Mapping[str, Any] | None:
+        return await asyncio.to_thread(self.get, obj_id)
+
+    async def aupdate(
+        self,
+        obj_id: str,
+        data: Mapping[str, Any],
+    ) -> Mapping[str, Any] | None:
+        return await asyncio.to_thread(self.update, obj_id, data)
+
+    async def adelete(self, obj_id: str) -> bool:
+        return await asyncio.to_thread(self.delete, obj_id)
+
+    async def aall(self) -> list[Mapping[str, Any]]:
+        return await asyncio.to_thread(self.all)
+
+    async def apage(self, cursor: str | None, limit: int) -> repository.Page:
+        return await asyncio.to_thread(self.page, cursor, limit)
+
+    async def asearch(self, query: str, cursor: str | None, limit: int) -> repository.Page:
+        return await asyncio.to_thread(self.search, query, cursor, limit)
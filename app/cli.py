@@ -0,0 +1,91 @@
+"""
+Command-line entry points, wired exactly like the API (backend, cache, scheduler, retries and repository come from the
+same settings).
+
+    uv run python -m app.cli bulk transcripts.jsonl --output summaries.jsonl --concurrency 32
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import Sequence
+
+from app import views
+from app.domain import dtos
+from app.services import bulk
+
+
+def _duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def _format_progress(progress: dtos.BulkProgress) -> str:
+    eta = _duration(progress.eta_seconds) if progress.eta_seconds is not None else "--"
+    retry = f", {progress.retryable} to retry" if progress.retryable else ""
+    return (
+        f"{progress.completed}/{progress.total} lines, {progress.failed} failed{retry} | "
+        f"{progress.items_per_second:.1f} items/s | elapsed {_duration(progress.elapsed_seconds)} | ETA {eta}"
+    )
+
+
+async def _bulk(args: argparse.Namespace) -> int:
+    runner = bulk.BulkRunner(
+        views.master_control,
+        args.input,
+        args.output,
+        bulk.BulkPolicy(concurrency=args.concurrency, checkpoint_seconds=args.checkpoint_seconds),
+    )
+    if args.restart:
+        runner.reset()
+    # On a terminal the progress line is redrawn in place; redirected, each report is its own line.
+    end = "\r" if sys.stderr.isatty() else "\n"
+
+    def report(progress: dtos.BulkProgress) -> None:
+        print(_format_progress(progress), end=end, file=sys.stderr, flush=True)
+
+    await views.llm_client.astart()
+    try:
+        progress = await runner.run(report, args.progress_seconds)
+    except ValueError as e:
+        print(f"error: {e}; pass --restart to start over", file=sys.stderr)
+        return 2
+    finally:
+        await views.llm_client.aclose()
+    print(_format_progress(progress), file=sys.stderr)
+    if progress.retryable:
+        print(f"{progress.retryable} lines failed with a retryable error; run the same command again to retry them", file=sys.stderr)
+    return 1 if progress.failed or progress.retryable else 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    defaults = bulk.BulkPolicy()
+    bulk_parser = commands.add_parser(
+        "bulk",
+        help="summarize a JSONL file of transcripts, resumably",
+        description=bulk.BulkRunner.__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    bulk_parser.add_argument("input", type=Path, help='JSONL with a {"text": ...} (or "body") object per line')
+    bulk_parser.add_argument("--output", "-o", type=Path, required=True, help="JSONL of LLMStreamItem, one per input line")
+    bulk_parser.add_argument("--concurrency", type=int, default=defaults.concurrency, help="transcripts summarized at once")
+    bulk_parser.add_argument("--checkpoint-seconds", type=float, default=defaults.checkpoint_seconds)
+    bulk_parser.add_argument("--progress-seconds", type=float, default=1.0)
+    bulk_parser.add_argument("--restart", action="store_true", help="discard the output and checkpoint of an earlier run")
+
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(_bulk(args))
+    except KeyboardInterrupt:
+        # The run saved its checkpoint on the way out.
+        print("\ninterrupted; run the same command again to resume", file=sys.stderr)
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
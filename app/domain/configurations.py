@@ -1,3 +1,5 @@
+from typing import Literal
+
 import pydantic_settings
 
 
@@ -12,6 +14,82 @@ class AppSettings(pydantic_settings.BaseSettings):
 
     OPENAI_API_KEY: str = "no-key-4-u"
     OPENAI_MODEL: str = "gpt-4o-2024-08-06"
+    OPENAI_BASE_URL: str | None = None  # None = the SDK default (api.openai.com or $OPENAI_BASE_URL)
+    # HTTP pool shared by every OpenAI call; keep-alive connections should cover LLM_MAX_CONCURRENCY.
+    OPENAI_MAX_CONNECTIONS: int = 100
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 64
+    OPENAI_KEEPALIVE_EXPIRY: float = 30.0
+    OPENAI_TIMEOUT: float = 120.0  # per request, seconds
+    OPENAI_CONNECT_TIMEOUT: float = 5.0
+    OPENAI_HTTP2: bool = False  # needs the http2 extra
+    OPENAI_WARMUP_CONNECTIONS: int = 0  # connections to open at startup; 0 skips warm-up
+
+    # Prompts estimated at or under ROUTING_SMALL_MAX_TOKENS go to OPENAI_SMALL_MODEL; unset sends everything to OPENAI_MODEL.
+    OPENAI_SMALL_MODEL: str | None = None
+    ROUTING_SMALL_MAX_TOKENS: int = 2000
+    # Async calls still running past their route's HEDGE_PERCENTILE latency are duplicated to OPENAI_HEDGE_MODEL (unset = off).
+    OPENAI_HEDGE_MODEL: str | None = None
+    HEDGE_PERCENTILE: float = 0.95
+    HEDGE_MIN_SAMPLES: int = 20  # finished calls on a route before it starts hedging
+    HEDGE_MAX_FRACTION: float = 0.1  # of async calls
+
+    # "fake" swaps OpenAI for an offline adapter, for load tests without network or spend.
+    LLM_BACKEND: Literal["openai", "fake"] = "openai"
+    FAKE_LLM_LATENCY: float = 0.5  # median seconds
+    FAKE_LLM_LATENCY_SIGMA: float = 0.0  # log-normal shape; 0 = fixed latency
+    FAKE_LLM_ERROR_RATE: float = 0.0
+    FAKE_LLM_RATE_LIMIT_RATE: float = 0.0
+    FAKE_LLM_RETRY_AFTER: float | None = None
+    FAKE_LLM_SEED: int | None = None
+
+    REPOSITORY_BACKEND: Literal["memory", "sqlite"] = "memory"
+    DB_MAX_RECORDS: int = 0  # 0 = unbounded
+    DB_MAX_BYTES: int = 256 * 1024 * 1024
+    DB_TTL_SECONDS: float = 0  # 0 = records never expire
+    SQLITE_PATH: str = "summaries.db"
+    SQLITE_POOL_SIZE: int = 4
+
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_TTL_SECONDS: float = 3600.0
+
+    LLM_MAX_CONCURRENCY: int = 32
+    LLM_REQUESTS_PER_MINUTE: int = 500
+    LLM_TOKENS_PER_MINUTE: int = 150_000
+
+    # Rolling admission budget, checked before work starts; keep it below the provider's TPM limit.
+    TOKEN_BUDGET_PER_MINUTE: int = 120_000  # 0 disables the budget (usage is still metered)
+    TOKEN_BUDGET_COMPLETION_TOKENS: int = 300  # expected output per transcript when estimating a request
+
+    # Per-model adaptive (AIMD) concurrency: starts at the initial limit, halves on 429/5xx/timeouts or calls slower
+    # than the latency target (0 = errors only), grows back on success up to the maximum.
+    LLM_ADAPTIVE_INITIAL_CONCURRENCY: int = 4
+    LLM_ADAPTIVE_MAX_CONCURRENCY: int = 32
+    LLM_ADAPTIVE_LATENCY_TARGET: float = 0.0
+    LLM_MAX_QUEUE: int = 256  # async calls waiting for a slot before new ones get a 503
+    # The circuit opens when CIRCUIT_FAILURE_RATE of the last CIRCUIT_WINDOW calls (at least CIRCUIT_MIN_CALLS) failed.
+    CIRCUIT_FAILURE_RATE: float = 0.5
+    CIRCUIT_MIN_CALLS: int = 10
+    CIRCUIT_WINDOW: int = 20
+    CIRCUIT_RESET_SECONDS: float = 30.0  # open time before a probe call is let through
+
+    LLM_MAX_ATTEMPTS: int = 3
+    LLM_RETRY_BASE_DELAY: float = 0.5
+    LLM_RETRY_MAX_DELAY: float = 8.0
+
+    # Applied in order before prompts are built; empty disables preprocessing. Set as a JSON list in the environment.
+    PREPROCESS_STAGES: tuple[Literal["whitespace", "speakers", "filler"], ...] = ("whitespace", "speakers")
+
+    MAP_REDUCE_THRESHOLD_TOKENS: int = 6000  # 0 disables map-reduce summarization
+    MAP_REDUCE_CHUNK_TOKENS: int = 2000
+
+    # POST /summary/upload: whole body, one transcript (a JSONL line or a .txt file) and transcripts processed at once.
+    UPLOAD_MAX_BYTES: int = 100 * 1024 * 1024
+    UPLOAD_MAX_TRANSCRIPT_BYTES: int = 1024 * 1024
+    UPLOAD_MAX_INFLIGHT: int = 32
+
+    JOB_WORKERS: int = 8
+    JOB_RETENTION_SECONDS: float = 3600.0
 
 
 app_settings = AppSettings()
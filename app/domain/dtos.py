@@ -1,18 +1,51 @@
+import enum
+from typing import Literal
 from uuid import UUID
 import pydantic
 
 
 class LLMresponses(pydantic.BaseModel):
-    responses: list[LLMResponseId]
+    responses: list[LLMResponseId | None]
+    errors: list[LLMItemError] = []
 
 
 class LLMResponse(pydantic.BaseModel):
+    # Parsed completions are shared by the cache and by every stored copy of a duplicate transcript.
+    model_config = pydantic.ConfigDict(frozen=True)
+
     summary: str
     action_items: list[str]
 
 
+class TokenUsage(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+
+
 class LLMResponseId(LLMResponse):
     id: UUID
+    # What producing this summary cost; zero when it was served from the cache, absent on older records.
+    usage: TokenUsage | None = None
+
+
+class LLMItemError(pydantic.BaseModel):
+    index: int
+    error: str
+    retryable: bool
+
+
+class LLMStreamItem(pydantic.BaseModel):
+    index: int
+    response: LLMResponseId | None = None
+    error: LLMItemError | None = None
+
+
+class SummaryPage(pydantic.BaseModel):
+    items: list[LLMResponseId]
+    next_cursor: str | None = None
 
 
 class Transcript(pydantic.BaseModel):
@@ -28,3 +61,124 @@ class Transcript(pydantic.BaseModel):
 
 class Transcripts(pydantic.BaseModel):
     transcripts: list[Transcript]
+
+
+class CacheStats(pydantic.BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    bytes: int
+    max_bytes: int
+
+
+class StoreStats(pydantic.BaseModel):
+    records: int
+    bytes: int
+    max_records: int
+    max_bytes: int
+    evictions: int
+    expirations: int
+
+
+class SchedulerStats(pydantic.BaseModel):
+    max_concurrency: int
+    running: int
+    waiting: int
+    admitted: int
+    avg_queue_wait_seconds: float
+
+
+class PreprocessStats(pydantic.BaseModel):
+    stages: list[str]
+    transcripts: int
+    input_tokens: int  # estimated, before any stage
+    output_tokens: int
+    saved_tokens: dict[str, int]  # per stage, in the order they run
+
+
+class RouteStats(pydantic.BaseModel):
+    name: str
+    max_prompt_tokens: int | None
+    calls: int
+    failures: int
+    p50_seconds: float | None
+    p95_seconds: float | None
+    hedge_after_seconds: float | None  # the current hedge threshold; None until enough calls have finished
+    hedged: int
+    hedge_wins: int
+
+
+class RoutingStats(pydantic.BaseModel):
+    routes: list[RouteStats]
+    hedge: RouteStats | None = None
+
+
+class CircuitState(enum.StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitStats(pydantic.BaseModel):
+    name: str
+    state: CircuitState
+    retry_after_seconds: float | None  # until the next half-open probe, while open
+    failure_rate: float  # over the recent window of calls
+    opened: int
+    concurrency_limit: int
+    inflight: int
+    waiting: int
+    rejected: int
+
+
+class Health(pydantic.BaseModel):
+    status: Literal["ok", "degraded", "unavailable"]
+    circuits: list[CircuitStats]
+
+
+class BackfillStatus(pydantic.BaseModel):
+    id: str
+    status: str  # as reported by the provider: validating, in_progress, completed, expired...
+    finished: bool
+    total: int
+    completed: int = 0
+    failed: int = 0
+    # Filled in once the finished batch has been collected and stored.
+    result_ids: list[UUID | None] = []
+    errors: list[LLMItemError] = []
+
+
+class TokenBudgetStats(pydantic.BaseModel):
+    max_tokens: int
+    window_seconds: float
+    spent_tokens: int
+    reserved_tokens: int
+    rejected: int
+
+
+class JobState(enum.StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+
+
+class JobStatus(pydantic.BaseModel):
+    id: UUID
+    status: JobState
+    total: int
+    completed: int
+    result_ids: list[UUID | None]
+    errors: list[LLMItemError]
+
+
+class BulkProgress(pydantic.BaseModel):
+    total: int  # input lines
+    completed: int  # including lines finished by an earlier, interrupted run
+    failed: int  # in this run
+    retryable: int  # failed with a retryable error; the next run summarizes them again
+    resumed: int  # already finished when this run started
+    elapsed_seconds: float
+    items_per_second: float  # summarized over the last 30 seconds
+    eta_seconds: float | None  # None until the first item of this run finishes
@@ -0,0 +1,30 @@
+class LLMError(Exception):
+    """Upstream LLM failure that is not worth retrying (bad request, auth, refusal...)."""
+
+
+class RetryableLLMError(LLMError):
+    """Transient upstream failure (rate limit, 5xx, timeout) that is safe to retry."""
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMUnavailableError(RetryableLLMError):
+    """Refused without calling upstream (circuit open or queue full); retry later, not within the same request."""
+
+
+class TokenBudgetExceeded(Exception):
+    """The rolling token budget cannot take on this work yet; ``retry_after`` says when it likely can."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"token budget exhausted, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class UploadTooLarge(ValueError):
+    """An upload, or one transcript in it, is over its configured size ``limit`` in bytes."""
+
+    def __init__(self, message: str, limit: int) -> None:
+        super().__init__(message)
+        self.limit = limit
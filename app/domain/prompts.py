@@ -8,3 +8,17 @@ RAW_USER_PROMPT = """Given the transcript below, generate:
 
                     Transcript:
                     {transcript}"""
+
+CHUNK_USER_PROMPT = """The transcript below is part {part} of {parts} of a longer conversation. Generate:
+                    1. A brief summary of the key points discussed in this part.
+                    2. A list of the next actions recommended or agreed in this part.
+
+                    Transcript part:
+                    {transcript}"""
+
+REDUCE_USER_PROMPT = """The summaries below cover consecutive parts of a single conversation transcript. Merge them into:
+                    1. One brief, insightful summary of the whole conversation.
+                    2. One clear, de-duplicated, structured list of recommended next actions.
+
+                    Partial summaries:
+                    {partials}"""
@@ -0,0 +1,9 @@
+import math
+
+# Rough average for English text with OpenAI tokenizers; avoids pulling in a tokenizer dependency.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Cheap upper-bound-ish token estimate for one or more prompt fragments."""
+    return sum(math.ceil(len(text) / CHARS_PER_TOKEN) for text in texts)
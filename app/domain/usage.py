@@ -0,0 +1,62 @@
+"""
+Token usage accounting for LLM calls.
+
+Adapters report what each completion actually cost with ``record``; callers that want to know the cost of a
+piece of work open a ``metered`` block around it. Meters nest, so a per-transcript meter inside a per-request
+meter feeds both, and the current meter follows the work into tasks spawned from the block. Calls made outside
+any meter are simply not attributed.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import threading
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from app.domain import dtos
+
+# Sync map-reduce reports from pool threads; one lock keeps the counters exact without a lock per meter.
+_LOCK = threading.Lock()
+
+
+@dataclass(slots=True)
+class UsageMeter:
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    parent: UsageMeter | None = field(default=None, repr=False)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, prompt_tokens: int, completion_tokens: int) -> None:
+        with _LOCK:
+            meter: UsageMeter | None = self
+            while meter is not None:
+                meter.prompt_tokens += prompt_tokens
+                meter.completion_tokens += completion_tokens
+                meter = meter.parent
+
+    def usage(self) -> dtos.TokenUsage:
+        return dtos.TokenUsage(prompt_tokens=self.prompt_tokens, completion_tokens=self.completion_tokens, total_tokens=self.total_tokens)
+
+
+_current: contextvars.ContextVar[UsageMeter | None] = contextvars.ContextVar("usage_meter", default=None)
+
+
+@contextlib.contextmanager
+def metered() -> Iterator[UsageMeter]:
+    meter = UsageMeter(parent=_current.get())
+    token = _current.set(meter)
+    try:
+        yield meter
+    finally:
+        _current.reset(token)
+
+
+def record(prompt_tokens: int, completion_tokens: int) -> None:
+    """Attribute one completion's usage to every meter open in the calling context."""
+    if (meter := _current.get()) is not None:
+        meter.add(prompt_tokens, completion_tokens)
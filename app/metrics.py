@@ -0,0 +1,64 @@
+"""
+Prometheus metrics for the summarization pipeline.
+
+Metrics are process-global, like the logger. Under several uvicorn workers, point ``PROMETHEUS_MULTIPROC_DIR`` at
+an empty, writable directory so ``/metrics`` aggregates every worker instead of whichever one served the scrape.
+"""
+
+import os
+
+import prometheus_client
+from prometheus_client import multiprocess
+
+# LLM calls take seconds; the defaults top out at 10s.
+_LLM_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, 120.0, float("inf"))
+_DB_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, float("inf"))
+_BATCH_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, float("inf"))
+
+REQUEST_LATENCY = prometheus_client.Histogram(
+    "http_request_duration_seconds", "HTTP request latency until the response starts.", ["method", "endpoint", "status"]
+)
+LLM_LATENCY = prometheus_client.Histogram(
+    "llm_completion_duration_seconds", "Time spent inside the LLM adapter per call.", ["mode"], buckets=_LLM_BUCKETS
+)
+LLM_ROUTE_LATENCY = prometheus_client.Histogram(
+    "llm_route_duration_seconds", "Completion latency per model route, cancelled hedge losers included.", ["route"], buckets=_LLM_BUCKETS
+)
+LLM_HEDGES = prometheus_client.Counter(
+    "llm_hedged_requests_total", "Completions hedged to the secondary model, by winner.", ["route", "winner"]
+)
+LLM_CONCURRENCY_LIMIT = prometheus_client.Gauge(
+    "llm_concurrency_limit", "Adaptive concurrency limit per model route.", ["route"], multiprocess_mode="livesum"
+)
+LLM_CIRCUIT_OPEN = prometheus_client.Gauge(
+    "llm_circuit_open", "1 while a route's circuit breaker is open.", ["route"], multiprocess_mode="livemax"
+)
+LLM_REJECTED = prometheus_client.Counter(
+    "llm_rejected_total", "Completions refused without calling upstream, by reason.", ["route", "reason"]
+)
+LLM_ERRORS = prometheus_client.Counter("llm_errors_total", "LLM adapter failures by upstream error type.", ["type", "retryable"])
+QUEUE_WAIT = prometheus_client.Histogram("llm_queue_wait_seconds", "Time waiting for a scheduler slot.", buckets=_LLM_BUCKETS)
+DB_LATENCY = prometheus_client.Histogram(
+    "repository_operation_duration_seconds", "Repository operation latency.", ["backend", "operation"], buckets=_DB_BUCKETS
+)
+BATCH_SIZE = prometheus_client.Histogram("summary_batch_size", "Transcripts per batch request.", ["endpoint"], buckets=_BATCH_BUCKETS)
+LLM_TOKENS = prometheus_client.Counter("llm_tokens_total", "Tokens billed by the LLM provider.", ["endpoint", "kind"])
+TOKEN_BUDGET_REJECTIONS = prometheus_client.Counter(
+    "token_budget_rejections_total", "Requests turned away by the rolling token budget.", ["endpoint"]
+)
+PREPROCESS_TOKENS_SAVED = prometheus_client.Counter(
+    "preprocess_tokens_saved_total", "Estimated prompt tokens removed from transcripts by each preprocessing stage.", ["stage"]
+)
+TRANSCRIPT_CHARS = prometheus_client.Counter("transcript_characters_total", "Characters of transcript received.", ["endpoint"])
+STORE_RECORDS = prometheus_client.Gauge("store_records", "Records held by the in-memory store.", multiprocess_mode="livesum")
+STORE_BYTES = prometheus_client.Gauge("store_bytes", "Approximate bytes held by the in-memory store.", multiprocess_mode="livesum")
+
+CONTENT_TYPE = prometheus_client.CONTENT_TYPE_LATEST
+
+
+def render() -> bytes:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return prometheus_client.generate_latest(registry)
+    return prometheus_client.generate_latest()
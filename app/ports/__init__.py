@@ -1 +1,2 @@
 from app.ports.llm import LLm
+from app.ports.batch import BatchLLm
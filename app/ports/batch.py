@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from typing import Mapping
+
+import pydantic
+from app.domain import dtos
+
+# One item's parsed response (or why it has none) and the tokens it was billed for.
+Outcome = tuple[pydantic.BaseModel | Exception, dtos.TokenUsage]
+
+
+class BatchLLm(ABC):
+    """Asynchronous bulk completions: submit many prompts at once, poll, then fetch every result."""
+
+    @abstractmethod
+    def submit(
+        self,
+        system_prompt: str,
+        user_prompts: Mapping[str, str],
+        dto: type[pydantic.BaseModel],
+    ) -> str:
+        """Queue one completion per ``user_prompts`` entry, keyed by its custom id; returns the batch id."""
+
+    @abstractmethod
+    def status(self, batch_id: str) -> dtos.BackfillStatus:
+        pass
+
+    @abstractmethod
+    def results(self, batch_id: str, dto: type[pydantic.BaseModel]) -> dict[str, Outcome]:
+        """Outcomes of a finished batch by custom id; items the provider never processed are absent."""
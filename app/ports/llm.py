@@ -22,3 +22,9 @@ class LLm(ABC):
         dto: type[pydantic.BaseModel],
     ) -> pydantic.BaseModel | None:
         pass
+
+    async def astart(self) -> None:
+        """Open long-lived resources such as connection pools; called once from the app lifespan."""
+
+    async def aclose(self) -> None:
+        """Release whatever ``astart`` or first use opened."""
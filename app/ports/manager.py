@@ -12,6 +12,13 @@ class Manager(ABC):
     ) -> dtos.LLMResponse | None:
         pass
 
+    @abstractmethod
+    async def asummarize_transcript(
+        self,
+        text: dtos.Transcript,
+    ) -> dtos.LLMResponse | None:
+        pass
+
     @abstractmethod
     async def asummarize(
         self,
@@ -1,22 +1,43 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, List, Mapping, Optional, Sequence
+
+Page = tuple[List[Mapping[str, Any]], Optional[str]]
+
+_CURSOR_MAX = 2**63 - 1  # SQLite INTEGER
+
+
+def cursor_position(cursor: Optional[str]) -> int:
+    """The position a page or search cursor holds; ``ValueError`` unless it is an integer a store can compare with."""
+    if cursor is None:
+        return 0
+    if not 0 <= (position := int(cursor)) <= _CURSOR_MAX:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return position
 
 
 class Repository(ABC):
-    """Repository interface."""
+    """
+    Repository interface.
+
+    Returned records are read-only mappings; callers must not mutate them.
+
+    Pages are ordered by creation. A cursor is an opaque string returned with the previous page (``None`` starts
+    from the beginning, and a ``None`` next cursor means there is nothing left); a malformed cursor raises
+    ``ValueError``. Search pages are ranked best first and their cursors are positions in that ranking.
+    """
 
     @abstractmethod
-    def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def create(self, data: Mapping[str, Any]) -> Mapping[str, Any]:
         raise NotImplementedError
 
     @abstractmethod
-    def get(self, obj_id: str) -> Optional[Dict[str, Any]]:
+    def get(self, obj_id: str) -> Optional[Mapping[str, Any]]:
         raise NotImplementedError
 
     @abstractmethod
-    def update(self, obj_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def update(self, obj_id: str, data: Mapping[str, Any]) -> Optional[Mapping[str, Any]]:
         raise NotImplementedError
 
     @abstractmethod
@@ -24,27 +45,44 @@ class Repository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def all(self) -> List[Dict[str, Any]]:
+    def all(self) -> List[Mapping[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def page(self, cursor: Optional[str], limit: int) -> Page:
+        raise NotImplementedError
+
+    @abstractmethod
+    def search(self, query: str, cursor: Optional[str], limit: int) -> Page:
         raise NotImplementedError
 
     # ───── async ─────
     @abstractmethod
-    async def acreate(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    async def acreate(self, data: Mapping[str, Any]) -> Mapping[str, Any]:
         raise NotImplementedError
 
     @abstractmethod
     async def bulk_acreate(
         self,
-        data: list[dict[str, Any]],
-    ) -> list[dict[str, Any]]:
+        data: Sequence[Mapping[str, Any]],
+    ) -> list[Mapping[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def bulk_acreate_once(self, key: str, data: Sequence[Mapping[str, Any]]) -> list[str]:
+        """
+        Store ``data`` unless an earlier call with the same ``key`` did, atomically for every process sharing the
+        store, and return the ids stored under ``key`` in order. A store that evicts may forget a key once none of
+        its records is left.
+        """
         raise NotImplementedError
 
     @abstractmethod
-    async def aget(self, obj_id: str) -> Optional[Dict[str, Any]]:
+    async def aget(self, obj_id: str) -> Optional[Mapping[str, Any]]:
         raise NotImplementedError
 
     @abstractmethod
-    async def aupdate(self, obj_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def aupdate(self, obj_id: str, data: Mapping[str, Any]) -> Optional[Mapping[str, Any]]:
         raise NotImplementedError
 
     @abstractmethod
@@ -52,5 +90,23 @@ class Repository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def aall(self) -> List[Dict[str, Any]]:
+    async def aall(self) -> List[Mapping[str, Any]]:
         raise NotImplementedError
+
+    @abstractmethod
+    async def apage(self, cursor: Optional[str], limit: int) -> Page:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def asearch(self, query: str, cursor: Optional[str], limit: int) -> Page:
+        raise NotImplementedError
+
+    async def aiter_records(self, batch_size: int = 100) -> AsyncIterator[Mapping[str, Any]]:
+        """Yield every record page by page, so neither memory nor lock hold time grows with the store."""
+        cursor: Optional[str] = None
+        while True:
+            records, cursor = await self.apage(cursor, batch_size)
+            for record in records:
+                yield record
+            if cursor is None:
+                return
@@ -0,0 +1,99 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any
+
+from app import logger, metrics
+from app.adapters import db
+from app.domain import dtos, errors, prompts
+from app.ports import batch
+from app.ports import repository as repository_port
+from app.services import controller, preprocess
+
+# Collected outcomes kept for repeat polls; older ones are rebuilt from the provider's results, without storing again.
+_COLLECTED_MAX = 256
+
+
+class BackfillService:
+    """
+    Offline summarization through a batch LLM, for backfills that can wait hours in exchange for cost.
+
+    Submitting returns as soon as the provider has the batch. The first poll that sees it finished parses the
+    results and stores the successes through the repository; later polls return that outcome without storing
+    again. The repository keys the stored results by batch id, so polls landing on different worker processes
+    (sharing a SQLite store) still store them once. Transcripts go out whole: long ones are not map-reduced and may fail on the model's context limit.
+    """
+
+    def __init__(
+        self,
+        batch_client: batch.BatchLLm,
+        repository: repository_port.Repository | None = None,
+        preprocessor: preprocess.Preprocessor | None = None,
+    ) -> None:
+        self._batch_client = batch_client
+        self._repository = repository
+        self._preprocessor = preprocessor
+        self._collected: OrderedDict[str, dtos.BackfillStatus] = OrderedDict()
+        self._collect_lock = asyncio.Lock()
+
+    @property
+    def _db(self) -> repository_port.Repository:
+        return self._repository if self._repository is not None else db.database
+
+    async def asubmit(self, documents: dtos.Transcripts) -> dtos.BackfillStatus:
+        # Custom ids are positions, so results map back onto the submitted order.
+        user_prompts = {
+            str(index): prompts.RAW_USER_PROMPT.format(transcript=self._preprocessor.run(text.text) if self._preprocessor else text.text)
+            for index, text in enumerate(documents.transcripts)
+        }
+        batch_id = await asyncio.to_thread(self._batch_client.submit, prompts.SYSTEM_PROMPT, user_prompts, dtos.LLMResponse)
+        logger.info("backfill %s submitted: %s transcripts", batch_id, len(user_prompts))
+        return dtos.BackfillStatus(id=batch_id, status="submitted", finished=False, total=len(user_prompts))
+
+    async def astatus(self, batch_id: str) -> dtos.BackfillStatus:
+        if collected := self._collected.get(batch_id):
+            self._collected.move_to_end(batch_id)
+            return collected
+        current = await asyncio.to_thread(self._batch_client.status, batch_id)
+        return await self._acollect(current) if current.finished else current
+
+    async def arun(self, documents: dtos.Transcripts, poll_interval: float = 60.0) -> dtos.BackfillStatus:
+        """Submit and wait for the batch to finish and be stored; for scripts rather than request handlers."""
+        current = await self.asubmit(documents)
+        while not (current := await self.astatus(current.id)).finished:
+            await asyncio.sleep(poll_interval)
+        return current
+
+    async def _acollect(self, current: dtos.BackfillStatus) -> dtos.BackfillStatus:
+        # Concurrent polls of the same finished batch fetch its results once; the repository stores them once.
+        async with self._collect_lock:
+            if collected := self._collected.get(current.id):
+                return collected
+            outcomes = await asyncio.to_thread(self._batch_client.results, current.id, dtos.LLMResponse)
+            resolved = [outcomes.get(str(index), self._unprocessed(current)) for index in range(current.total)]
+
+            successes: list[dict[str, Any]] = []
+            for outcome, spent in resolved:
+                metrics.LLM_TOKENS.labels(endpoint="backfill", kind="prompt").inc(spent.prompt_tokens)
+                metrics.LLM_TOKENS.labels(endpoint="backfill", kind="completion").inc(spent.completion_tokens)
+                if not isinstance(outcome, Exception):
+                    successes.append({**outcome.model_dump(), "usage": spent.model_dump()})
+            stored = iter(await self._db.bulk_acreate_once(f"backfill:{current.id}", successes))
+
+            result_ids: list[str | None] = []
+            item_errors: list[dtos.LLMItemError] = []
+            for index, (outcome, _) in enumerate(resolved):
+                if isinstance(outcome, Exception):
+                    result_ids.append(None)
+                    item_errors.append(controller.Controller.item_error(index, outcome))
+                else:
+                    result_ids.append(next(stored))
+            collected = dtos.BackfillStatus.model_validate({**current.model_dump(), "result_ids": result_ids, "errors": item_errors})
+            self._collected[current.id] = collected
+            if len(self._collected) > _COLLECTED_MAX:
+                self._collected.popitem(last=False)
+        logger.info("backfill %s stored: %s of %s failed", current.id, len(item_errors), current.total)
+        return collected
+
+    @staticmethod
+    def _unprocessed(current: dtos.BackfillStatus) -> batch.Outcome:
+        return errors.RetryableLLMError(f"not processed before the batch ended ({current.status})"), dtos.TokenUsage()
@@ -0,0 +1,114 @@
+import asyncio
+import collections
+import contextlib
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable
+
+from app import metrics
+from app.domain import dtos, errors, prompts, tokens, usage
+
+
+@dataclass(slots=True)
+class _Ledger:
+    spent: collections.deque[tuple[float, int]] = field(default_factory=collections.deque)
+    spent_total: int = 0
+    reserved: int = 0
+    rejected: int = 0
+
+
+class TokenBudget:
+    """
+    Rolling cap on tokens per window, checked before a request starts rather than per LLM call.
+
+    The scheduler paces calls once work is admitted; this decides whether to take the work on at all, so a burst
+    is turned away (or deferred) up front instead of queueing into the provider's TPM limit. Spend is what the
+    adapters report once a request finishes, and requests still in flight hold a reservation of their estimate so
+    a burst can't all pass the check before any of it is billed. A budget of 0 disables the limit; usage is still
+    metered per endpoint either way. Meant to be used from the event loop only.
+    """
+
+    def __init__(
+        self,
+        tokens_per_window: int,
+        window_seconds: float = 60.0,
+        completion_tokens: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._limit = tokens_per_window
+        self._window = window_seconds
+        self._completion_tokens = completion_tokens
+        self._clock = clock
+        self._ledger = _Ledger()
+
+    def estimate(self, transcripts: list[dtos.Transcript]) -> int:
+        return sum(
+            tokens.estimate_tokens(prompts.SYSTEM_PROMPT, prompts.RAW_USER_PROMPT, text.text) + self._completion_tokens
+            for text in transcripts
+        )
+
+    def retry_after(self, estimate: int) -> float:
+        """Seconds until ``estimate`` more tokens fit in the window; 0 when they fit now."""
+        if not self._limit:
+            return 0.0
+        now = self._clock()
+        self._expire(now)
+        # Anything larger than the whole budget is let through once the window is otherwise empty.
+        excess = self._ledger.spent_total + self._ledger.reserved + min(estimate, self._limit) - self._limit
+        if excess <= 0:
+            return 0.0
+        freed = 0
+        for at, amount in self._ledger.spent:
+            freed += amount
+            if freed >= excess:
+                return at + self._window - now
+        # Reservations turn into spend when their requests finish, and only leave the window after that.
+        return self._window
+
+    def check(self, endpoint: str, estimate: int) -> None:
+        if (delay := self.retry_after(estimate)) > 0:
+            self._ledger.rejected += 1
+            metrics.TOKEN_BUDGET_REJECTIONS.labels(endpoint=endpoint).inc()
+            raise errors.TokenBudgetExceeded(delay)
+
+    @contextlib.asynccontextmanager
+    async def admit(self, endpoint: str, estimate: int, *, wait: bool = False) -> AsyncIterator[usage.UsageMeter]:
+        """
+        Hold a reservation for the duration of the block and charge what it actually spent on exit.
+
+        Raises ``TokenBudgetExceeded`` when the budget is exhausted, or sleeps until it is not when ``wait`` is set.
+        """
+        if wait:
+            while (delay := self.retry_after(estimate)) > 0:
+                await asyncio.sleep(delay)
+        else:
+            self.check(endpoint, estimate)
+        self._ledger.reserved += estimate
+        try:
+            with usage.metered() as meter:
+                yield meter
+        finally:
+            self._ledger.reserved -= estimate
+            self._charge(meter.total_tokens)
+            metrics.LLM_TOKENS.labels(endpoint=endpoint, kind="prompt").inc(meter.prompt_tokens)
+            metrics.LLM_TOKENS.labels(endpoint=endpoint, kind="completion").inc(meter.completion_tokens)
+
+    def stats(self) -> dtos.TokenBudgetStats:
+        self._expire(self._clock())
+        return dtos.TokenBudgetStats(
+            max_tokens=self._limit,
+            window_seconds=self._window,
+            spent_tokens=self._ledger.spent_total,
+            reserved_tokens=self._ledger.reserved,
+            rejected=self._ledger.rejected,
+        )
+
+    def _charge(self, amount: int) -> None:
+        if amount:
+            self._ledger.spent.append((self._clock(), amount))
+            self._ledger.spent_total += amount
+
+    def _expire(self, now: float) -> None:
+        spent = self._ledger.spent
+        while spent and spent[0][0] <= now - self._window:
+            self._ledger.spent_total -= spent.popleft()[1]
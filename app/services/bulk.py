@@ -0,0 +1,275 @@
+import collections
+import contextlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Callable
+
+from app import logger
+from app.domain import dtos
+from app.services import controller, ingest
+
+_RATE_WINDOW_SECONDS = 30.0
+
+
+@dataclass(frozen=True, slots=True)
+class BulkPolicy:
+    """Transcripts summarized at once, and how often the checkpoint is rewritten."""
+
+    concurrency: int = 32
+    checkpoint_seconds: float = 5.0
+
+
+@dataclass(slots=True)
+class Checkpoint:
+    """
+    How far a run got: every input line before ``line`` (which starts at byte ``offset``) has its outcome in the
+    output, and so do the later lines in ``done``. Lines in ``retry`` (``[line, offset]`` pairs) failed with a retryable
+    error; they are left out of the output and summarized again by the next run. Output past ``output_offset`` was
+    written after the checkpoint and is read back on resume, so nothing finished between checkpoints is summarized twice.
+    """
+
+    input: str
+    line: int = 0
+    offset: int = 0
+    done: list[int] = field(default_factory=list)
+    retry: list[list[int]] = field(default_factory=list)
+    output_offset: int = 0
+
+
+@dataclass(slots=True)
+class _Stats:
+    summarized: int = 0
+    failed: int = 0
+    resumed: int = 0
+    samples: collections.deque[tuple[float, int]] = field(default_factory=collections.deque)  # (time, summarized)
+
+
+@dataclass(slots=True)
+class _Run:
+    checkpoint: Checkpoint
+    done: set[int]  # finished lines past ``checkpoint.line``
+    retry: dict[int, int]  # line -> byte offset it starts at, for lines that failed with a retryable error
+    total: int
+    started: float
+    spans: dict[int, tuple[int, int]] = field(default_factory=dict)  # byte range of each line read and not yet checkpointed
+    stats: _Stats = field(default_factory=_Stats)
+
+    def __post_init__(self) -> None:
+        self.stats.resumed = self.completed
+        self.stats.samples.append((self.started, 0))
+
+    @property
+    def completed(self) -> int:
+        # A retryable line is counted by the watermark or ``done`` like any other, but it is not finished.
+        return self.checkpoint.line + len(self.done) - len(self.retry)
+
+    def record(self, item: dtos.LLMStreamItem) -> bool:
+        """Account for a summarized line; False when it failed with a retryable error and is left for the next run."""
+        self.stats.summarized += 1
+        if item.error is not None and item.error.retryable:
+            if item.index not in self.retry:  # read in this run; a line retried from an earlier one keeps its entry
+                self.retry[item.index] = self.spans[item.index][0]
+                self.finish(item.index)
+            return False
+        self.stats.failed += item.error is not None
+        if self.retry.pop(item.index, None) is None:  # a retried line is already behind the checkpoint
+            self.finish(item.index)
+        return True
+
+    def finish(self, index: int) -> None:
+        self.done.add(index)
+        # Lines finish out of order; the checkpoint only moves past the ones that have all been read and written.
+        checkpoint = self.checkpoint
+        while checkpoint.line in self.done and checkpoint.line in self.spans:
+            self.done.remove(checkpoint.line)
+            checkpoint.offset = self.spans.pop(checkpoint.line)[1]
+            checkpoint.line += 1
+
+    def progress(self, now: float) -> dtos.BulkProgress:
+        # Throughput over the last stretch of the run, so the ETA follows rate limits and slowdowns as they happen.
+        stats = self.stats
+        stats.samples.append((now, stats.summarized))
+        while len(stats.samples) > 2 and stats.samples[1][0] <= now - _RATE_WINDOW_SECONDS:
+            stats.samples.popleft()
+        since, summarized = stats.samples[0]
+        rate = (stats.summarized - summarized) / (now - since) if now > since else 0.0
+        remaining = self.total - self.checkpoint.line - len(self.done)
+        return dtos.BulkProgress(
+            total=self.total,
+            completed=self.completed,
+            failed=stats.failed,
+            retryable=len(self.retry),
+            resumed=stats.resumed,
+            elapsed_seconds=now - self.started,
+            items_per_second=rate,
+            eta_seconds=remaining / rate if rate else None,
+        )
+
+
+class BulkRunner:
+    """
+    Summarizes a JSONL file of transcripts through the controller, appending one ``LLMStreamItem`` per input line to
+    an output JSONL as each item finishes.
+
+    Input lines are ``{"text": ...}`` objects (``{"body": ...}`` also works, as in ``requests.jsonl``); ``index`` in
+    the output is the input line number, from 0, and blank lines are skipped. The output is flushed per item and a
+    checkpoint is kept beside it (``<output>.checkpoint``), so an interrupted run resumes where it stopped. A failed
+    item is written with its error and counts as done, unless the error is retryable (a 429, a timeout, an open
+    circuit): such a line is left out of the output and the next run summarizes it again.
+    """
+
+    def __init__(
+        self,
+        master_control: controller.Controller,
+        input_path: Path,
+        output_path: Path,
+        policy: BulkPolicy | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._master_control = master_control
+        self._input = input_path
+        self._output = output_path
+        self._policy = policy or BulkPolicy()
+        self._clock = clock
+        self.checkpoint_path = output_path.with_name(output_path.name + ".checkpoint")
+
+    def reset(self) -> None:
+        """Forget an earlier run: delete its output and checkpoint."""
+        self._output.unlink(missing_ok=True)
+        self.checkpoint_path.unlink(missing_ok=True)
+
+    async def run(
+        self,
+        on_progress: Callable[[dtos.BulkProgress], None] | None = None,
+        progress_seconds: float = 1.0,
+    ) -> dtos.BulkProgress:
+        checkpoint = self._load()
+        recovered = self._recover(checkpoint)
+        state = _Run(
+            checkpoint,
+            done=set(checkpoint.done) | {index for index in recovered if index >= checkpoint.line},
+            retry={index: offset for index, offset in checkpoint.retry if index not in recovered},
+            total=_count_lines(self._input),
+            started=self._clock(),
+        )
+        if state.stats.resumed or state.retry:
+            logger.info(
+                "resuming %s at line %d, %d lines already done, %d to retry",
+                self._input,
+                checkpoint.line,
+                state.stats.resumed,
+                len(state.retry),
+            )
+        last_saved = last_report = state.started
+
+        with self._output.open("ab") as output:
+            # Saved before any output, so an output file without a checkpoint is never one of ours.
+            self._save(state, output)
+            try:
+                results = ingest.process_numbered(self._lines(state), self._master_control.asummarize_item, self._policy.concurrency)
+                async with contextlib.aclosing(results):
+                    async for item in results:
+                        if state.record(item):
+                            output.write(item.model_dump_json().encode() + b"\n")
+                            output.flush()
+                        if (now := self._clock()) - last_saved >= self._policy.checkpoint_seconds:
+                            self._save(state, output)
+                            last_saved = now
+                        if on_progress and now - last_report >= progress_seconds:
+                            on_progress(state.progress(now))
+                            last_report = now
+            finally:
+                self._save(state, output)
+        logger.info(
+            "bulk run of %s: %d summarized, %d failed, %d left to retry",
+            self._input,
+            state.stats.summarized,
+            state.stats.failed,
+            len(state.retry),
+        )
+        return state.progress(self._clock())
+
+    async def _lines(self, state: _Run) -> AsyncIterator[tuple[int, ingest.Parsed]]:
+        checkpoint = state.checkpoint
+        with self._input.open("rb") as source:
+            # Lines that failed with a retryable error last time come first; they are behind the checkpoint.
+            for index, offset in sorted(state.retry.items()):
+                source.seek(offset)
+                yield index, _transcript(source.readline())
+            source.seek(checkpoint.offset)
+            offset = checkpoint.offset
+            for index, raw in enumerate(source, start=checkpoint.line):
+                state.spans[index] = (offset, offset + len(raw))
+                offset += len(raw)
+                if index in state.done or not raw.strip():
+                    state.finish(index)
+                else:
+                    yield index, _transcript(raw)
+
+    def _load(self) -> Checkpoint:
+        source = str(self._input.resolve())
+        if not self.checkpoint_path.exists():
+            if self._output.exists() and self._output.stat().st_size:
+                raise ValueError(f"{self._output} already exists and has no checkpoint")
+            return Checkpoint(input=source)
+        checkpoint = Checkpoint(**json.loads(self.checkpoint_path.read_text()))
+        if checkpoint.input != source:
+            raise ValueError(f"{self._output} holds results for {checkpoint.input}, not {source}")
+        return checkpoint
+
+    def _recover(self, checkpoint: Checkpoint) -> set[int]:
+        """Lines finished after the checkpoint was written; a last line torn by a crash is dropped."""
+        done: set[int] = set()
+        size = self._output.stat().st_size if self._output.exists() else 0
+        if size < checkpoint.output_offset:
+            raise ValueError(f"{self._output} is shorter than its checkpoint")
+        if size == checkpoint.output_offset:
+            return done
+        with self._output.open("r+b") as output:
+            output.seek(checkpoint.output_offset)
+            end = checkpoint.output_offset
+            for line in output:
+                if not line.endswith(b"\n"):
+                    break
+                done.add(dtos.LLMStreamItem.model_validate_json(line).index)
+                end += len(line)
+            output.truncate(end)
+        return done
+
+    def _save(self, state: _Run, output: BinaryIO) -> None:
+        # The output must be on disk before a checkpoint that counts it.
+        output.flush()
+        os.fsync(output.fileno())
+        checkpoint = state.checkpoint
+        checkpoint.output_offset = output.tell()
+        checkpoint.done = sorted(state.done)
+        checkpoint.retry = [[index, offset] for index, offset in sorted(state.retry.items())]
+        pending = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+        pending.write_text(json.dumps(asdict(checkpoint)))
+        os.replace(pending, self.checkpoint_path)
+
+
+def _count_lines(path: Path) -> int:
+    count, last = 0, b"\n"
+    with path.open("rb") as source:
+        while chunk := source.read(1024 * 1024):
+            count += chunk.count(b"\n")
+            last = chunk[-1:]
+    return count + (last != b"\n")
+
+
+def _transcript(raw: bytes) -> ingest.Parsed:
+    try:
+        item = json.loads(raw)
+    except ValueError as e:
+        return e
+    text = item.get("text") or item.get("body") if isinstance(item, dict) else None
+    if not isinstance(text, str):
+        return ValueError("expected a JSON object with a text (or body) field")
+    try:
+        return dtos.Transcript(text=text)
+    except ValueError as e:  # whitespace only
+        return e
@@ -0,0 +1,102 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import pydantic
+
+from app.domain import dtos
+
+
+def normalize(text: str) -> str:
+    """Collapse whitespace so cosmetic differences map to the same transcript."""
+    return " ".join(text.split())
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: pydantic.BaseModel
+    size: int
+    expires_at: float
+
+
+@dataclass(slots=True)
+class _Counters:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class ResultCache:
+    """
+    Content-addressed LRU cache for LLM results with TTL expiry and a byte budget.
+
+    Keys are a SHA-256 of the normalized transcript plus a namespace (model and prompt templates),
+    so changing any of those naturally invalidates previous entries.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float, namespace: tuple[str, ...] = ()) -> None:
+        self._max_bytes = max_bytes
+        self._ttl = ttl_seconds
+        self._namespace = hashlib.sha256("\x00".join(namespace).encode()).hexdigest()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._counters = _Counters()
+        self._lock = threading.Lock()
+
+    def key(self, text: str) -> str:
+        digest = hashlib.sha256(self._namespace.encode())
+        digest.update(normalize(text).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> pydantic.BaseModel | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self._counters.expirations += 1
+                self._counters.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters.hits += 1
+            return entry.value
+
+    def put(self, key: str, value: pydantic.BaseModel) -> None:
+        size = self._sizeof(key, value)
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value=value, size=size, expires_at=time.monotonic() + self._ttl)
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._counters.evictions += 1
+
+    def stats(self) -> dtos.CacheStats:
+        with self._lock:
+            return dtos.CacheStats(
+                hits=self._counters.hits,
+                misses=self._counters.misses,
+                evictions=self._counters.evictions,
+                expirations=self._counters.expirations,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self._max_bytes,
+            )
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    @staticmethod
+    def _sizeof(key: str, value: pydantic.BaseModel) -> int:
+        # Serialized size is a good enough proxy to keep the budget honest without deep introspection.
+        return len(key) + len(value.model_dump_json())
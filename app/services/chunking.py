@@ -0,0 +1,97 @@
+import re
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+import pydantic
+
+from app.domain import tokens
+
+# A speaker turn starts a line with a short label followed by a colon, e.g. "Mark Foster | MCC, ACTC: Hey there".
+_SPEAKER_TURN = re.compile(r"^[^\n:]{1,80}:\s", re.MULTILINE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+@dataclass(frozen=True, slots=True)
+class ChunkingPolicy:
+    """Transcripts estimated above ``threshold_tokens`` are map-reduced in chunks of ``chunk_tokens``."""
+
+    threshold_tokens: int = 6000
+    chunk_tokens: int = 2000
+
+
+def split_turns(text: str) -> list[str]:
+    """Split a transcript into speaker turns; text before the first label is kept as its own turn."""
+    starts = [match.start() for match in _SPEAKER_TURN.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    bounds = zip(starts, [*starts[1:], len(text)])
+    return [turn for start, end in bounds if (turn := text[start:end].strip())]
+
+
+def chunk_transcript(text: str, max_tokens: int) -> list[str]:
+    """Greedily pack whole speaker turns into chunks that stay within ``max_tokens``."""
+    chunks: list[str] = []
+    current: list[str] = []
+    used = 0
+    for piece in _pieces(split_turns(text), max_tokens):
+        size = tokens.estimate_tokens(piece)
+        if current and used + size > max_tokens:
+            chunks.append("\n".join(current))
+            current, used = [], 0
+        current.append(piece)
+        used += size
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def format_partials(partials: Iterable[pydantic.BaseModel]) -> str:
+    sections = []
+    for number, partial in enumerate(partials, start=1):
+        data = partial.model_dump()
+        actions = "\n".join(f"- {item}" for item in data.get("action_items", []))
+        sections.append(f"Part {number}:\nSummary: {data.get('summary', '')}\nNext actions:\n{actions}")
+    return "\n\n".join(sections)
+
+
+def group_partials(partials: Sequence[pydantic.BaseModel], max_tokens: int) -> list[list[pydantic.BaseModel]]:
+    """
+    Pack consecutive partial summaries into groups whose formatted text stays within ``max_tokens``, to be merged
+    in rounds. A group takes at least two partials (only the last may be alone), so each round halves them or better.
+    """
+    groups: list[list[pydantic.BaseModel]] = []
+    current: list[pydantic.BaseModel] = []
+    used = 0
+    for partial in partials:
+        size = tokens.estimate_tokens(format_partials([partial]))
+        if len(current) >= 2 and used + size > max_tokens:
+            groups.append(current)
+            current, used = [], 0
+        current.append(partial)
+        used += size
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _pieces(turns: list[str], max_tokens: int) -> Iterable[str]:
+    """Yield turns, breaking any single turn that is over budget on sentence (then character) boundaries."""
+    max_chars = max_tokens * tokens.CHARS_PER_TOKEN
+    for turn in turns:
+        if tokens.estimate_tokens(turn) <= max_tokens:
+            yield turn
+            continue
+        buffer = ""
+        for sentence in _SENTENCE_END.split(turn):
+            while len(sentence) > max_chars:
+                if buffer:
+                    yield buffer
+                    buffer = ""
+                yield sentence[:max_chars]
+                sentence = sentence[max_chars:]
+            if buffer and len(buffer) + 1 + len(sentence) > max_chars:
+                yield buffer
+                buffer = ""
+            buffer = f"{buffer} {sentence}" if buffer else sentence
+        if buffer:
+            yield buffer
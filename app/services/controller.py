@@ -1,71 +1,337 @@
 import asyncio
+import concurrent.futures
+import contextvars
+import time
+import uuid
+from typing import Any, AsyncIterator, Mapping
+
+import pydantic
 
 from app.ports import llm, manager
-from app.domain import dtos
-from app.domain import prompts
+from app.ports import repository as repository_port
+from app.domain import dtos, errors
+from app.domain import prompts, tokens, usage
 from app.adapters import db
+from app.services import cache as result_cache
+from app.services import chunking, preprocess, retry
+from app.services import scheduler as llm_scheduler
 from app import logger
 
+# Sync chunk calls in flight at once, across every request, when there is no scheduler to size them by.
+_MAP_WORKERS = 8
+
+# An outcome plus the tokens spent producing it.
+_Resolved = tuple[pydantic.BaseModel | Exception, dtos.TokenUsage]
 
-class Controller(manager.Manager):
+
+class Controller(manager.Manager):  # pylint: disable=too-many-instance-attributes  # one per injected collaborator
     """Controller class."""
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         llm_client: llm.LLm,
+        *,
+        cache: result_cache.ResultCache | None = None,
+        scheduler: llm_scheduler.RateLimitedScheduler | None = None,
+        retry_policy: retry.RetryPolicy | None = None,
+        chunking_policy: chunking.ChunkingPolicy | None = None,
+        preprocessor: preprocess.Preprocessor | None = None,
+        repository: repository_port.Repository | None = None,
     ):
         self._llm_client = llm_client
+        self._cache = cache
+        self._scheduler = scheduler
+        self._retry_policy = retry_policy or retry.RetryPolicy()
+        self._chunking_policy = chunking_policy
+        self._preprocessor = preprocessor
+        self._repository = repository
+        # Shared by every sync map-reduce, so a burst of long transcripts can't start a thread per chunk; sized like
+        # the async path's scheduler.
+        self._map_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=scheduler.stats().max_concurrency if scheduler else _MAP_WORKERS, thread_name_prefix="map-reduce"
+        )
+
+    @property
+    def _db(self) -> repository_port.Repository:
+        # Fall back to the module-level in-memory store, resolved at call time so it can be swapped.
+        return self._repository if self._repository is not None else db.database
 
     def summarize(
         self,
         text: dtos.Transcript,
     ) -> dtos.LLMResponseId | None:
-        user_prompt = prompts.RAW_USER_PROMPT.format(
-            transcript=text,
-        )
-        summary = self._llm_client.run_completion(
-            system_prompt=prompts.SYSTEM_PROMPT,
-            user_prompt=user_prompt,
-            dto=dtos.LLMResponse,
-        )
-        if not summary:
-            return None
-        response = db.database.create(summary.model_dump())
-        return dtos.LLMResponseId.model_validate(response)
+        key = self._cache.key(text.text) if self._cache else None
+        with usage.metered() as meter:
+            if not (summary := self._cache_get(key)):
+                summary = self._complete(text)
+                if not summary:
+                    return None
+                self._cache_put(key, summary)
+        spent = meter.usage()
+        return self._stored(summary, spent, self._db.create(self._record(summary, spent)))
+
+    async def asummarize_transcript(
+        self,
+        text: dtos.Transcript,
+    ) -> dtos.LLMResponseId | None:
+        key = self._cache.key(text.text) if self._cache else None
+        with usage.metered() as meter:
+            if not (summary := self._cache_get(key)):
+                summary = await self._acomplete(text)
+                if not summary:
+                    return None
+                self._cache_put(key, summary)
+        spent = meter.usage()
+        return self._stored(summary, spent, await self._db.acreate(self._record(summary, spent)))
 
     async def asummarize(
         self,
         documents: dtos.Transcripts,
     ) -> dtos.LLMresponses | None:
-        system_prompt = prompts.SYSTEM_PROMPT
+        outcomes = await self._aresolve(documents.transcripts)
+
+        successes = [self._record(outcome, spent) for outcome, spent in outcomes if isinstance(outcome, pydantic.BaseModel)]
+        stored = iter(await self._db.bulk_acreate(successes))
+
+        # Failed items keep their slot so responses[i] always answers transcripts[i].
+        responses: list[dtos.LLMResponseId | None] = []
+        item_errors: list[dtos.LLMItemError] = []
+        for index, (outcome, spent) in enumerate(outcomes):
+            if isinstance(outcome, pydantic.BaseModel):
+                responses.append(self._stored(outcome, spent, next(stored)))
+            else:
+                responses.append(None)
+                item_errors.append(self.item_error(index, outcome))
+
+        return dtos.LLMresponses(responses=responses, errors=item_errors)
+
+    async def astream_summarize(
+        self,
+        documents: dtos.Transcripts,
+    ) -> AsyncIterator[dtos.LLMStreamItem]:
+        """Yield each item as soon as it is summarized and persisted, in completion order."""
+        # Identical transcripts still share one LLM call, but each copy is stored and emitted separately.
+        shared: dict[str, asyncio.Future[_Resolved]] = {}
+
+        async def process(index: int, text: dtos.Transcript) -> dtos.LLMStreamItem:
+            normalized = result_cache.normalize(text.text)
+            if normalized not in shared:
+                shared[normalized] = asyncio.ensure_future(self._aresolve_one(text))
+            return await self._astore(index, await asyncio.shield(shared[normalized]))
+
+        tasks: list[asyncio.Future] = [asyncio.ensure_future(process(index, text)) for index, text in enumerate(documents.transcripts)]
         try:
-            async with asyncio.TaskGroup() as tg:
-                tasks = []
-                for text in documents.transcripts:
-                    user_prompt = prompts.RAW_USER_PROMPT.format(
-                        transcript=text,
-                    )
-
-                    tasks.append(
-                        tg.create_task(
-                            self._llm_client.run_completion_async(
-                                system_prompt=system_prompt,
-                                user_prompt=user_prompt,
-                                dto=dtos.LLMResponse,
-                            )
-                        )
-                    )
-        except Exception as e:  # pylint: disable=broad-except  # multiple things can go wrong here
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # The client may disconnect mid-stream; don't leave orphaned LLM calls behind.
+            for future in [*tasks, *shared.values()]:
+                future.cancel()
+
+    async def asummarize_item(self, index: int, text: dtos.Transcript) -> dtos.LLMStreamItem:
+        """Summarize and persist a single item; failures are reported on the item rather than raised."""
+        return await self._astore(index, await self._aresolve_one(text))
+
+    async def _aresolve(
+        self,
+        transcripts: list[dtos.Transcript],
+    ) -> list[_Resolved]:
+        # Identical transcripts within one payload share a single LLM call.
+        unique: dict[str, dtos.Transcript] = {}
+        for text in transcripts:
+            unique.setdefault(result_cache.normalize(text.text), text)
+
+        async with asyncio.TaskGroup() as tg:
+            tasks = {normalized: tg.create_task(self._aresolve_one(text)) for normalized, text in unique.items()}
+
+        return [tasks[result_cache.normalize(text.text)].result() for text in transcripts]
+
+    async def _aresolve_one(self, text: dtos.Transcript) -> _Resolved:
+        key = self._cache.key(text.text) if self._cache else None
+        with usage.metered() as meter:
+            if hit := self._cache_get(key):
+                return hit, meter.usage()
+            outcome = await self._asummarize_one(text)
+        if isinstance(outcome, pydantic.BaseModel):
+            self._cache_put(key, outcome)
+        return outcome, meter.usage()
+
+    async def _astore(self, index: int, resolved: _Resolved) -> dtos.LLMStreamItem:
+        outcome, spent = resolved
+        if isinstance(outcome, Exception):
+            return dtos.LLMStreamItem(index=index, error=self.item_error(index, outcome))
+        record = await self._db.acreate(self._record(outcome, spent))
+        return dtos.LLMStreamItem(index=index, response=self._stored(outcome, spent, record))
+
+    @staticmethod
+    def _record(summary: pydantic.BaseModel, spent: dtos.TokenUsage) -> dict[str, Any]:
+        return {**summary.model_dump(), "usage": spent.model_dump()}
+
+    @staticmethod
+    def _stored(summary: pydantic.BaseModel, spent: dtos.TokenUsage, record: Mapping[str, Any]) -> dtos.LLMResponseId:
+        # Built from the models just stored rather than read back: validating the record would decode, copy and
+        # check the same fields again. Only the id is new, and the repository always hands back a UUID string.
+        return dtos.LLMResponseId.model_construct(id=uuid.UUID(record["id"]), usage=spent, **dict(summary))
+
+    @staticmethod
+    def _loaded(record: Mapping[str, Any]) -> dtos.LLMResponseId:
+        # A compact in-memory record would be decoded into a dict only to be validated; parse its JSON in one pass instead.
+        if isinstance(record, db.RecordView):
+            return dtos.LLMResponseId.model_validate_json(record.to_json())
+        return dtos.LLMResponseId.model_validate(record)
+
+    async def _asummarize_one(self, text: dtos.Transcript) -> pydantic.BaseModel | Exception:
+        try:
+            result = await self._acomplete(text)
+        except Exception as e:  # pylint: disable=broad-except  # one bad item must not sink the whole batch
             logger.exception(e)
-            return None
+            return e
+        return result if result is not None else errors.LLMError("LLM returned no parsed completion")
+
+    @staticmethod
+    def item_error(index: int, exc: Exception) -> dtos.LLMItemError:
+        return dtos.LLMItemError(
+            index=index,
+            error=f"{type(exc).__name__}: {exc}",
+            retryable=isinstance(exc, errors.RetryableLLMError),
+        )
+
+    def _complete(self, text: dtos.Transcript) -> pydantic.BaseModel | None:
+        transcript = self._prepare(text)
+        if not (chunks := self._chunks(transcript)):
+            return self._call(prompts.RAW_USER_PROMPT.format(transcript=transcript))
+
+        partials = self._call_all(self._chunk_prompts(chunks))
+        # Reduce: merge in rounds while the partials are too long for one prompt.
+        while len(groups := self._reduce_groups(partials)) > 1:
+            merged = self._call_all([self._reduce_prompt(group) for group in groups if len(group) > 1])
+            partials = [group[0] if len(group) == 1 else merged.pop(0) for group in groups]
+        return self._call(self._reduce_prompt(groups[0])) if groups else None
+
+    def _call_all(self, user_prompts: list[str]) -> list[pydantic.BaseModel | None]:
+        # Pool threads don't inherit context; copy it so chunk usage lands on the caller's meter.
+        futures = [self._map_pool.submit(contextvars.copy_context().run, self._call, prompt) for prompt in user_prompts]
+        return [future.result() for future in futures]
+
+    async def _acomplete(self, text: dtos.Transcript) -> pydantic.BaseModel | None:
+        transcript = self._prepare(text)
+        if not (chunks := self._chunks(transcript)):
+            return await self._acall(prompts.RAW_USER_PROMPT.format(transcript=transcript))
+
+        # Map: chunks run concurrently, so latency tracks the chunk size rather than the transcript length.
+        partials = await self._acall_all(self._chunk_prompts(chunks))
+        while len(groups := self._reduce_groups(partials)) > 1:
+            merged = await self._acall_all([self._reduce_prompt(group) for group in groups if len(group) > 1])
+            partials = [group[0] if len(group) == 1 else merged.pop(0) for group in groups]
+        return await self._acall(self._reduce_prompt(groups[0])) if groups else None
+
+    async def _acall_all(self, user_prompts: list[str]) -> list[pydantic.BaseModel | None]:
+        tasks = [asyncio.ensure_future(self._acall(prompt)) for prompt in user_prompts]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    def _prepare(self, text: dtos.Transcript) -> str:
+        # The raw text, never the model: formatting the DTO would put its repr (escaped newlines and all) in the prompt.
+        return self._preprocessor.run(text.text) if self._preprocessor else text.text
+
+    def _chunks(self, transcript: str) -> list[str]:
+        policy = self._chunking_policy
+        if policy is None or tokens.estimate_tokens(transcript) <= policy.threshold_tokens:
+            return []
+        chunks = chunking.chunk_transcript(transcript, policy.chunk_tokens)
+        logger.info("map-reduce summarization: %s chunks", len(chunks))
+        return chunks if len(chunks) > 1 else []
+
+    @staticmethod
+    def _chunk_prompts(chunks: list[str]) -> list[str]:
+        return [
+            prompts.CHUNK_USER_PROMPT.format(part=number, parts=len(chunks), transcript=chunk)
+            for number, chunk in enumerate(chunks, start=1)
+        ]
+
+    def _reduce_groups(self, partials: list[pydantic.BaseModel | None]) -> list[list[pydantic.BaseModel]]:
+        """Partials to merge, one group per reduce call; a single group once they all fit in one chunk's budget."""
+        if not (present := [partial for partial in partials if partial is not None]):
+            return []
+        assert self._chunking_policy is not None  # only chunked transcripts are reduced
+        if tokens.estimate_tokens(self._reduce_prompt(present)) <= self._chunking_policy.chunk_tokens:
+            return [present]
+        return chunking.group_partials(present, self._chunking_policy.chunk_tokens)
 
-        results = []
-        for task in tasks:
-            r = task.result()
-            if r:
-                results.append(r.model_dump())
+    @staticmethod
+    def _reduce_prompt(partials: list[pydantic.BaseModel]) -> str:
+        return prompts.REDUCE_USER_PROMPT.format(partials=chunking.format_partials(partials))
 
-        return dtos.LLMresponses.model_validate({"responses": await db.database.bulk_acreate(results)})
+    def _call(self, user_prompt: str) -> pydantic.BaseModel | None:
+        return retry.retry(
+            lambda: self._llm_client.run_completion(
+                system_prompt=prompts.SYSTEM_PROMPT,
+                user_prompt=user_prompt,
+                dto=dtos.LLMResponse,
+            ),
+            self._retry_policy,
+        )
+
+    async def _acall(self, user_prompt: str) -> pydantic.BaseModel | None:
+        return await retry.aretry(lambda: self._acall_once(user_prompt), self._retry_policy)
+
+    async def _acall_once(self, user_prompt: str) -> pydantic.BaseModel | None:
+        if self._scheduler is None:
+            return await self._llm_client.run_completion_async(
+                system_prompt=prompts.SYSTEM_PROMPT,
+                user_prompt=user_prompt,
+                dto=dtos.LLMResponse,
+            )
+
+        async with self._scheduler.slot(tokens.estimate_tokens(prompts.SYSTEM_PROMPT, user_prompt)) as ticket:
+            start = time.perf_counter()
+            result = await self._llm_client.run_completion_async(
+                system_prompt=prompts.SYSTEM_PROMPT,
+                user_prompt=user_prompt,
+                dto=dtos.LLMResponse,
+            )
+        logger.info("llm call: queue_wait=%.3fs llm_latency=%.3fs tokens~%s", ticket.queue_wait, time.perf_counter() - start, ticket.tokens)
+        return result
 
     def get_summary(self, id: str):  # pylint: disable=redefined-builtin
-        return dtos.LLMResponseId.model_validate(db.database.get(id))
+        if (record := self._db.get(id)) is None:
+            return None
+        return self._loaded(record)
+
+    async def alist_summaries(self, cursor: str | None, limit: int) -> dtos.SummaryPage:
+        records, next_cursor = await self._db.apage(cursor, limit)
+        return dtos.SummaryPage(items=[self._loaded(r) for r in records], next_cursor=next_cursor)
+
+    async def asearch_summaries(self, query: str, cursor: str | None, limit: int) -> dtos.SummaryPage:
+        records, next_cursor = await self._db.asearch(query, cursor, limit)
+        return dtos.SummaryPage(items=[self._loaded(r) for r in records], next_cursor=next_cursor)
+
+    async def aexport_summaries(self, batch_size: int = 100) -> AsyncIterator[dtos.LLMResponseId]:
+        async for record in self._db.aiter_records(batch_size):
+            yield self._loaded(record)
+
+    def cache_stats(self) -> dtos.CacheStats | None:
+        return self._cache.stats() if self._cache else None
+
+    def scheduler_stats(self) -> dtos.SchedulerStats | None:
+        return self._scheduler.stats() if self._scheduler else None
+
+    def preprocess_stats(self) -> dtos.PreprocessStats | None:
+        return self._preprocessor.stats() if self._preprocessor else None
+
+    def store_stats(self) -> dtos.StoreStats | None:
+        # Only the in-memory store has a footprint worth bounding; SQLite lives on disk.
+        return self._db.footprint() if isinstance(self._db, db.DB) else None
+
+    def _cache_get(self, key: str | None) -> pydantic.BaseModel | None:
+        if self._cache is None or key is None:
+            return None
+        return self._cache.get(key)
+
+    def _cache_put(self, key: str | None, value: pydantic.BaseModel) -> None:
+        if self._cache is not None and key is not None:
+            self._cache.put(key, value)
@@ -0,0 +1,170 @@
+import asyncio
+import contextlib
+from dataclasses import dataclass
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Callable, Iterable, Literal
+
+from app.domain import dtos, errors
+from app.services import controller
+
+Format = Literal["text", "jsonl"]
+# One parsed transcript, or why a piece of the upload could not become one; either way it takes an index.
+Parsed = dtos.Transcript | Exception
+
+
+@dataclass(frozen=True, slots=True)
+class UploadPolicy:
+    """Bounds on one streamed upload: whole body, one transcript (a line, or a ``.txt`` file) and items in flight."""
+
+    max_bytes: int = 100 * 1024 * 1024
+    max_transcript_bytes: int = 1024 * 1024
+    max_inflight: int = 32
+
+
+class _Budget:
+    """Counts body bytes across every part of one upload."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.read = 0
+
+    @property
+    def exceeded(self) -> bool:
+        return self.read > self.max_bytes
+
+    def take(self, chunk: bytes) -> bool:
+        self.read += len(chunk)
+        return not self.exceeded
+
+
+async def parse(chunks: AsyncIterator[bytes], fmt: Format, policy: UploadPolicy) -> AsyncIterator[Parsed]:
+    """
+    Turn a body read chunk by chunk into transcripts as soon as each one is complete.
+
+    ``text`` is a single transcript; ``jsonl`` is one ``{"text": ...}`` object per line, blank lines ignored. A bad
+    or oversized transcript yields its error and parsing goes on; past ``max_bytes`` the error is yielded and
+    parsing stops. Nothing but the transcript being read is ever buffered.
+    """
+    async for item in parse_files([(fmt, chunks)], policy):
+        yield item
+
+
+async def parse_files(files: Iterable[tuple[Format, AsyncIterator[bytes]]], policy: UploadPolicy) -> AsyncIterator[Parsed]:
+    """``parse`` over several uploaded files in turn, with ``max_bytes`` counted across all of them."""
+    budget = _Budget(policy.max_bytes)
+    for fmt, chunks in files:
+        pieces = (
+            _lines(chunks, policy.max_transcript_bytes, budget) if fmt == "jsonl" else _whole(chunks, policy.max_transcript_bytes, budget)
+        )
+        async for piece in pieces:
+            if isinstance(piece, Exception):
+                yield piece
+            elif fmt == "text" or piece.strip():
+                yield _transcript(piece, fmt)
+        if budget.exceeded:
+            return
+
+
+async def process(
+    items: AsyncIterator[Parsed],
+    summarize: Callable[[int, dtos.Transcript], Awaitable[dtos.LLMStreamItem]],
+    max_inflight: int,
+) -> AsyncGenerator[dtos.LLMStreamItem, None]:
+    """
+    Start each transcript as soon as it is parsed and yield results in completion order.
+
+    At most ``max_inflight`` items run at once; past that, reading waits for one to finish, so a fast upload is
+    held back by the model rather than piling up in memory. Items are numbered in upload order.
+    """
+
+    async def numbered() -> AsyncIterator[tuple[int, Parsed]]:
+        index = 0
+        async for item in items:
+            yield index, item
+            index += 1
+
+    async with contextlib.aclosing(process_numbered(numbered(), summarize, max_inflight)) as results:
+        async for result in results:
+            yield result
+
+
+async def process_numbered(
+    items: AsyncIterator[tuple[int, Parsed]],
+    summarize: Callable[[int, dtos.Transcript], Awaitable[dtos.LLMStreamItem]],
+    max_inflight: int,
+) -> AsyncGenerator[dtos.LLMStreamItem, None]:
+    """``process`` for items that already carry their index, e.g. lines of a file resumed part-way through."""
+
+    async def run(index: int, text: dtos.Transcript) -> dtos.LLMStreamItem:
+        try:
+            return await summarize(index, text)
+        except Exception as e:  # pylint: disable=broad-except  # one bad item must not end the upload
+            return dtos.LLMStreamItem(index=index, error=controller.Controller.item_error(index, e))
+
+    pending: set[asyncio.Task[dtos.LLMStreamItem]] = set()
+    try:
+        async for index, item in items:
+            if isinstance(item, Exception):
+                yield dtos.LLMStreamItem(index=index, error=controller.Controller.item_error(index, item))
+            else:
+                pending.add(asyncio.create_task(run(index, item)))
+            # Hand back whatever is already done, and block only when the in-flight bound is reached.
+            done = {task for task in pending if task.done()}
+            if len(pending) >= max_inflight:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.discard(task)
+                yield task.result()
+        for next_done in asyncio.as_completed(pending):
+            yield await next_done
+    finally:
+        # The client may disconnect mid-upload; don't leave LLM calls running for nobody.
+        for task in pending:
+            task.cancel()
+
+
+async def _lines(chunks: AsyncIterator[bytes], max_line: int, budget: _Budget) -> AsyncIterator[bytes | Exception]:
+    buffer = bytearray()
+    skipping = False  # inside a line already reported as too long
+    async for chunk in chunks:
+        if not budget.take(chunk):
+            yield _too_large("upload", budget.max_bytes)
+            return
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            if not skipping:
+                buffer += chunk[start:end]
+                yield bytes(buffer) if len(buffer) <= max_line else _too_large("line", max_line)
+            buffer.clear()
+            skipping, start = False, end + 1
+        if not skipping:
+            buffer += chunk[start:]
+            if len(buffer) > max_line:
+                buffer.clear()
+                skipping = True
+                yield _too_large("line", max_line)
+    if buffer and not skipping:
+        yield bytes(buffer)
+
+
+async def _whole(chunks: AsyncIterator[bytes], max_size: int, budget: _Budget) -> AsyncIterator[bytes | Exception]:
+    buffer = bytearray()
+    async for chunk in chunks:
+        if not budget.take(chunk):
+            yield _too_large("upload", budget.max_bytes)
+            return
+        buffer += chunk
+        if len(buffer) > max_size:
+            yield _too_large("transcript", max_size)
+            return
+    yield bytes(buffer)
+
+
+def _transcript(raw: bytes, fmt: Format) -> Parsed:
+    try:
+        return dtos.Transcript(text=raw.decode()) if fmt == "text" else dtos.Transcript.model_validate_json(raw)
+    except ValueError as e:  # invalid JSON or UTF-8, or an empty transcript
+        return e
+
+
+def _too_large(what: str, limit: int) -> errors.UploadTooLarge:
+    return errors.UploadTooLarge(f"{what} exceeds {limit} bytes", limit=limit)
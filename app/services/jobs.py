@@ -0,0 +1,122 @@
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from app.domain import dtos
+from app.services import budget as token_budget
+from app.services import controller
+from app import logger
+
+
+@dataclass(slots=True)
+class _Job:
+    id: uuid.UUID
+    total: int
+    results: list[dtos.LLMStreamItem | None]
+    created_at: float = field(default_factory=time.monotonic)
+    finished_at: float | None = None
+    completed: int = 0
+
+
+@dataclass(slots=True)
+class _WorkItem:
+    job: _Job
+    index: int
+    text: dtos.Transcript
+
+
+class JobManager:
+    """
+    In-process background jobs drained by a fixed pool of asyncio workers.
+
+    Submitting only enqueues work, so request latency is independent of batch size; the worker count
+    bounds how many items are in progress at once. Finished jobs are kept for ``retention_seconds`` so
+    clients can poll their status. When the token budget is exhausted, workers wait for it instead of
+    rejecting items.
+    """
+
+    def __init__(
+        self,
+        master_control: controller.Controller,
+        workers: int,
+        retention_seconds: float,
+        budget: token_budget.TokenBudget | None = None,
+    ) -> None:
+        self._master_control = master_control
+        self._budget = budget or token_budget.TokenBudget(0)
+        self._workers = workers
+        self._retention = retention_seconds
+        self._jobs: dict[uuid.UUID, _Job] = {}
+        self._queue: asyncio.Queue[_WorkItem] | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._work(), name=f"job-worker-{n}") for n in range(self._workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, documents: dtos.Transcripts) -> dtos.JobStatus:
+        """Enqueue a job; call it on the event loop the workers run on, never from a worker thread."""
+        if self._queue is None:
+            raise RuntimeError("JobManager.start() must be awaited before submitting jobs")
+        self._prune()
+        total = len(documents.transcripts)
+        job = _Job(id=uuid.uuid4(), total=total, results=[None] * total)
+        if total == 0:
+            job.finished_at = time.monotonic()
+        self._jobs[job.id] = job
+        for index, text in enumerate(documents.transcripts):
+            self._queue.put_nowait(_WorkItem(job=job, index=index, text=text))
+        return self._status(job)
+
+    def status(self, job_id: uuid.UUID) -> dtos.JobStatus | None:
+        if (job := self._jobs.get(job_id)) is None:
+            return None
+        return self._status(job)
+
+    async def _work(self) -> None:
+        assert self._queue is not None
+        while True:
+            item = await self._queue.get()
+            try:
+                async with self._budget.admit("jobs", self._budget.estimate([item.text]), wait=True):
+                    result = await self._master_control.asummarize_item(item.index, item.text)
+            except Exception as e:  # pylint: disable=broad-except  # a worker must survive any single item
+                logger.exception(e)
+                result = dtos.LLMStreamItem(index=item.index, error=controller.Controller.item_error(item.index, e))
+            finally:
+                self._queue.task_done()
+            item.job.results[item.index] = result
+            item.job.completed += 1
+            if item.job.completed == item.job.total:
+                item.job.finished_at = time.monotonic()
+                logger.info("job %s finished: %s items", item.job.id, item.job.total)
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self._retention
+        for job_id in [job.id for job in self._jobs.values() if job.finished_at is not None and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    @staticmethod
+    def _status(job: _Job) -> dtos.JobStatus:
+        if job.finished_at is not None:
+            state = dtos.JobState.COMPLETED
+        elif job.completed:
+            state = dtos.JobState.RUNNING
+        else:
+            state = dtos.JobState.QUEUED
+        done = [result for result in job.results if result is not None]
+        return dtos.JobStatus(
+            id=job.id,
+            status=state,
+            total=job.total,
+            completed=job.completed,
+            result_ids=[result.response.id if result and result.response else None for result in job.results],
+            errors=[result.error for result in done if result.error],
+        )
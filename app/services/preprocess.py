@@ -0,0 +1,102 @@
+import collections
+import re
+import threading
+from typing import Callable, Iterable, Literal
+
+from app import metrics
+from app.domain import dtos, tokens
+
+Stage = Literal["whitespace", "speakers", "filler"]
+
+DEFAULT_STAGES: tuple[Stage, ...] = ("whitespace", "speakers")
+
+# Same shape as a chunking speaker turn: a short label at the start of a line, then a colon.
+_LABEL = re.compile(r"^([^\n:]{1,80}):(?=\s)", re.MULTILINE)
+_FIRST_NAME = re.compile(r"[^\W\d_][\w'’-]*")
+# Disfluencies only; "uh-huh", "mm-hmm" and "like" carry meaning often enough to keep.
+_FILLER = re.compile(r"(?:,[ \t]*)?(?:(?<![\w-])(?:u+h+|u+m+|e+r+m+|h+m+)(?![\w-]),?|\b(?:you know|I mean),)", re.IGNORECASE)
+_SPACE_BEFORE_PUNCTUATION = re.compile(r"[ \t]+(?=[,.!?])")
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of spaces and drop blank lines, keeping one line per line so speaker turns stay intact."""
+    return "\n".join(collapsed for line in text.splitlines() if (collapsed := " ".join(line.split())))
+
+
+def alias_speakers(text: str) -> str:
+    """
+    Shorten repeated speaker labels to the speaker's first name, with a one-line legend of the full labels.
+
+    Only labels seen on two or more turns are speakers worth aliasing, and only when the first name is unambiguous
+    among all labels and the turns save more than the legend entry costs.
+    """
+    counts = collections.Counter(match[1] for match in _LABEL.finditer(text))
+    first_names = collections.Counter(name[0] for label in counts if (name := _FIRST_NAME.match(label)))
+    aliases: dict[str, str] = {}
+    for label, count in counts.items():
+        if count < 2 or not (name := _FIRST_NAME.match(label)) or first_names[name[0]] > 1 or name[0] in counts:
+            continue
+        alias = name[0]
+        if count * (len(label) - len(alias)) > len(f"{alias} = {label}; "):
+            aliases[label] = alias
+    if not aliases:
+        return text
+    legend = "; ".join(f"{alias} = {label}" for label, alias in aliases.items())
+    return f"Speakers: {legend}\n" + _LABEL.sub(lambda match: aliases.get(match[1], match[1]) + ":", text)
+
+
+def drop_filler(text: str) -> str:
+    """Remove verbal filler ("um", "uh", "you know,") that adds tokens but no content."""
+    return normalize_whitespace(_SPACE_BEFORE_PUNCTUATION.sub("", _FILLER.sub(" ", text)))
+
+
+_STAGES: dict[Stage, Callable[[str], str]] = {
+    "whitespace": normalize_whitespace,
+    "speakers": alias_speakers,
+    "filler": drop_filler,
+}
+
+
+class Preprocessor:
+    """
+    Shrinks transcripts before they are formatted into prompts, one stage at a time in the configured order.
+
+    Savings are counted per stage with the same chars-per-token estimate the scheduler uses, so whitespace savings
+    read higher than what the provider bills (its tokenizer already merges most whitespace). Thread-safe.
+    """
+
+    def __init__(self, stages: Iterable[Stage] = DEFAULT_STAGES) -> None:
+        self._stages = tuple(stages)
+        if unknown := [stage for stage in self._stages if stage not in _STAGES]:
+            raise ValueError(f"unknown preprocessing stages: {unknown}")
+        self._saved: collections.Counter[str] = collections.Counter()
+        self._transcripts = 0
+        self._input_tokens = 0
+        self._output_tokens = 0
+        self._lock = threading.Lock()
+
+    def run(self, text: str) -> str:
+        before = input_tokens = tokens.estimate_tokens(text)
+        saved: dict[str, int] = {}
+        for stage in self._stages:
+            text = _STAGES[stage](text)
+            after = tokens.estimate_tokens(text)
+            saved[stage], before = before - after, after
+        with self._lock:
+            self._transcripts += 1
+            self._input_tokens += input_tokens
+            self._output_tokens += before
+            self._saved.update(saved)
+        for name, amount in saved.items():
+            metrics.PREPROCESS_TOKENS_SAVED.labels(stage=name).inc(max(amount, 0))
+        return text
+
+    def stats(self) -> dtos.PreprocessStats:
+        with self._lock:
+            return dtos.PreprocessStats(
+                stages=list(self._stages),
+                transcripts=self._transcripts,
+                input_tokens=self._input_tokens,
+                output_tokens=self._output_tokens,
+                saved_tokens={stage: self._saved[stage] for stage in self._stages},
+            )
@@ -0,0 +1,53 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+
+from app.domain import errors
+from app import logger
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter, honouring the provider's ``Retry-After`` when given."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        ceiling = min(self.max_delay, self.base_delay * 2**attempt)
+        return max(random.uniform(0, ceiling), retry_after or 0.0)
+
+
+def retry(fn: Callable[[], T], policy: RetryPolicy) -> T:
+    for attempt in range(policy.max_attempts):
+        try:
+            return fn()
+        except errors.LLMUnavailableError:
+            raise  # upstream is known to be unhealthy; waiting here would only queue work behind it
+        except errors.RetryableLLMError as exc:
+            if attempt + 1 >= policy.max_attempts:
+                raise
+            delay = policy.delay(attempt, exc.retry_after)
+            logger.warning("retryable LLM error (attempt %s/%s), retrying in %.2fs: %s", attempt + 1, policy.max_attempts, delay, exc)
+            time.sleep(delay)
+    raise RuntimeError("RetryPolicy.max_attempts must be at least 1")
+
+
+async def aretry(fn: Callable[[], Awaitable[T]], policy: RetryPolicy) -> T:
+    for attempt in range(policy.max_attempts):
+        try:
+            return await fn()
+        except errors.LLMUnavailableError:
+            raise  # upstream is known to be unhealthy; waiting here would only queue work behind it
+        except errors.RetryableLLMError as exc:
+            if attempt + 1 >= policy.max_attempts:
+                raise
+            delay = policy.delay(attempt, exc.retry_after)
+            logger.warning("retryable LLM error (attempt %s/%s), retrying in %.2fs: %s", attempt + 1, policy.max_attempts, delay, exc)
+            await asyncio.sleep(delay)
+    raise RuntimeError("RetryPolicy.max_attempts must be at least 1")
@@ -0,0 +1,120 @@
+import asyncio
+import contextlib
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable
+
+from app import metrics
+from app.domain import dtos
+
+
+@dataclass(slots=True)
+class Ticket:
+    """Admission receipt handed to the caller; ``queue_wait`` excludes the LLM call itself."""
+
+    tokens: int
+    queue_wait: float
+
+
+@dataclass(slots=True)
+class _Gauges:
+    waiting: int = 0
+    running: int = 0
+    admitted: int = 0
+    queue_wait_total: float = 0.0
+
+
+class _TokenBucket:
+    """Continuously refilled bucket sized to one minute of budget."""
+
+    def __init__(self, per_minute: int, clock: Callable[[], float]) -> None:
+        self._capacity = float(per_minute)
+        self._rate = per_minute / 60.0
+        self._level = float(per_minute)
+        self._clock = clock
+        self._updated = clock()
+
+    def wait_time(self, amount: float) -> float:
+        now = self._clock()
+        self._level = min(self._capacity, self._level + (now - self._updated) * self._rate)
+        self._updated = now
+        deficit = min(amount, self._capacity) - self._level
+        return deficit / self._rate if deficit > 0 else 0.0
+
+    def take(self, amount: float) -> None:
+        self._level -= min(amount, self._capacity)
+
+
+class RateLimitedScheduler:
+    """
+    Process-wide admission control for LLM calls.
+
+    Bounds concurrent calls and enforces requests-per-minute and tokens-per-minute budgets. One instance
+    is meant to be shared by every request in the process so concurrent batches split the budget instead of
+    each assuming they own it. A budget of 0 disables that limit.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rate_lock = asyncio.Lock()
+        self._clock = clock
+        self._requests = _TokenBucket(requests_per_minute, clock) if requests_per_minute > 0 else None
+        self._tokens = _TokenBucket(tokens_per_minute, clock) if tokens_per_minute > 0 else None
+        self._max_concurrency = max_concurrency
+        self._gauges = _Gauges()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, tokens: int) -> AsyncIterator[Ticket]:
+        start = self._clock()
+        self._gauges.waiting += 1
+        try:
+            await self._semaphore.acquire()
+            try:
+                await self._reserve(tokens)
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self._gauges.waiting -= 1
+
+        ticket = Ticket(tokens=tokens, queue_wait=self._clock() - start)
+        metrics.QUEUE_WAIT.observe(ticket.queue_wait)
+        self._gauges.admitted += 1
+        self._gauges.queue_wait_total += ticket.queue_wait
+        self._gauges.running += 1
+        try:
+            yield ticket
+        finally:
+            self._gauges.running -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dtos.SchedulerStats:
+        return dtos.SchedulerStats(
+            max_concurrency=self._max_concurrency,
+            running=self._gauges.running,
+            waiting=self._gauges.waiting,
+            admitted=self._gauges.admitted,
+            avg_queue_wait_seconds=self._gauges.queue_wait_total / self._gauges.admitted if self._gauges.admitted else 0.0,
+        )
+
+    async def _reserve(self, tokens: int) -> None:
+        # Serialise reservations so waiters are admitted in arrival order rather than racing on refill.
+        async with self._rate_lock:
+            while (wait := self._wait_time(tokens)) > 0:
+                await asyncio.sleep(wait)
+            if self._requests:
+                self._requests.take(1)
+            if self._tokens:
+                self._tokens.take(tokens)
+
+    def _wait_time(self, tokens: int) -> float:
+        return max(
+            self._requests.wait_time(1) if self._requests else 0.0,
+            self._tokens.wait_time(tokens) if self._tokens else 0.0,
+        )
@@ -1,27 +1,316 @@
-from typing import Annotated
-from fastapi import FastAPI, HTTPException, Body
-from app.domain import dtos, configurations
-from app.services import controller
-from app.adapters import openai
+import contextlib
+import math
+import time
+import uuid
+from typing import Annotated, AsyncGenerator, AsyncIterator, Awaitable, Callable
+import pydantic
+import pydantic_core
+from fastapi import FastAPI, HTTPException, Body, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
+from starlette.types import Receive, Scope, Send
+from app.domain import dtos, configurations, errors
+from app.services import backfill, budget, controller, cache, chunking, ingest, jobs, preprocess, retry, scheduler
+from app.adapters import db, fake, guarded, instrumented, routing, singleflight
+from app.domain import prompts
 
 
-from app import logger
+from app import logger, metrics
+from app.ports import llm, repository
+
+
+# Backends are imported only when configured: the OpenAI SDK alone is a third of the import time, and cold starts
+# on a scale-to-zero deployment are paid by the request that woke the instance.
+def _build_repository() -> repository.Repository:
+    if configurations.app_settings.REPOSITORY_BACKEND == "sqlite":
+        from app.adapters import sqlite  # pylint: disable=import-outside-toplevel
+
+        return sqlite.SQLiteDB(configurations.app_settings.SQLITE_PATH, pool_size=configurations.app_settings.SQLITE_POOL_SIZE)
+    return db.database
+
+
+def _build_llm(model: str) -> llm.LLm:
+    settings = configurations.app_settings
+    if settings.LLM_BACKEND == "fake":
+        return fake.FakeLLM(
+            latency=settings.FAKE_LLM_LATENCY,
+            latency_sigma=settings.FAKE_LLM_LATENCY_SIGMA,
+            error_rate=settings.FAKE_LLM_ERROR_RATE,
+            rate_limit_rate=settings.FAKE_LLM_RATE_LIMIT_RATE,
+            retry_after=settings.FAKE_LLM_RETRY_AFTER,
+            seed=settings.FAKE_LLM_SEED,
+        )
+    from app.adapters import openai  # pylint: disable=import-outside-toplevel
+
+    return openai.OpenAIAdapter(
+        settings.OPENAI_API_KEY,
+        model,
+        base_url=settings.OPENAI_BASE_URL,
+        options=openai.ClientOptions(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY,
+            timeout=settings.OPENAI_TIMEOUT,
+            connect_timeout=settings.OPENAI_CONNECT_TIMEOUT,
+            http2=settings.OPENAI_HTTP2,
+            warmup_connections=settings.OPENAI_WARMUP_CONNECTIONS,
+        ),
+        response_models=[dtos.LLMResponse],
+    )
+
+
+def _guard(name: str, model: str) -> guarded.GuardedLLM:
+    settings = configurations.app_settings
+    # The guard sits outside the instrumentation, so refused calls never show up as upstream traffic.
+    return guarded.GuardedLLM(
+        instrumented.InstrumentedLLM(_build_llm(model)),
+        name,
+        concurrency=guarded.ConcurrencyPolicy(
+            initial=settings.LLM_ADAPTIVE_INITIAL_CONCURRENCY,
+            maximum=settings.LLM_ADAPTIVE_MAX_CONCURRENCY,
+            latency_target=settings.LLM_ADAPTIVE_LATENCY_TARGET,
+            max_queue=settings.LLM_MAX_QUEUE,
+        ),
+        circuit=guarded.CircuitPolicy(
+            failure_rate=settings.CIRCUIT_FAILURE_RATE,
+            min_calls=settings.CIRCUIT_MIN_CALLS,
+            window=settings.CIRCUIT_WINDOW,
+            reset_seconds=settings.CIRCUIT_RESET_SECONDS,
+        ),
+    )
+
+
+def _build_router() -> routing.RoutingLLM:
+    settings = configurations.app_settings
+    # Each route gets its own guarded, instrumented client: upstream metrics see every call a hedge sends, and one
+    # model tripping its circuit doesn't stop the others.
+    routes = [routing.Route("default", _guard("default", settings.OPENAI_MODEL))]
+    if settings.OPENAI_SMALL_MODEL:
+        routes.append(
+            routing.Route("small", _guard("small", settings.OPENAI_SMALL_MODEL), max_prompt_tokens=settings.ROUTING_SMALL_MAX_TOKENS)
+        )
+    hedge = routing.Route("hedge", _guard("hedge", settings.OPENAI_HEDGE_MODEL)) if settings.OPENAI_HEDGE_MODEL else None
+    return routing.RoutingLLM(
+        routes,
+        hedge,
+        hedge_percentile=settings.HEDGE_PERCENTILE,
+        min_samples=settings.HEDGE_MIN_SAMPLES,
+        max_hedge_fraction=settings.HEDGE_MAX_FRACTION,
+        hedge_slot=llm_scheduler.slot,
+    )
+
+
+def _build_backfill(summaries: repository.Repository, preprocessor: preprocess.Preprocessor | None) -> backfill.BackfillService | None:
+    settings = configurations.app_settings
+    if settings.LLM_BACKEND != "openai":
+        return None
+    from app.adapters import openai  # pylint: disable=import-outside-toplevel
+
+    return backfill.BackfillService(
+        openai.OpenAIBatchAdapter(settings.OPENAI_API_KEY, settings.OPENAI_MODEL, base_url=settings.OPENAI_BASE_URL),
+        repository=summaries,
+        preprocessor=preprocessor,
+    )
+
+
+# The object graph is wired at import on purpose: it takes well under a millisecond once the backends are lazy, and
+# uvicorn finishes the lifespan startup before it accepts a connection, so building it there would not bring the
+# first response any closer. The CLI, benchmarks and tests use these module-level collaborators without a lifespan;
+# what does open connections (client warm-up, job workers) is started in the lifespan below.
+summary_repository = _build_repository()
+# One scheduler per process so concurrent batches, and the hedges they send, share the provider's rate limits.
+llm_scheduler = scheduler.RateLimitedScheduler(
+    max_concurrency=configurations.app_settings.LLM_MAX_CONCURRENCY,
+    requests_per_minute=configurations.app_settings.LLM_REQUESTS_PER_MINUTE,
+    tokens_per_minute=configurations.app_settings.LLM_TOKENS_PER_MINUTE,
+)
+# Nothing connects until the lifespan starts the client (or the first call does).
+llm_router = _build_router()
+llm_client = singleflight.SingleFlightLLM(llm_router)
+transcript_preprocessor = (
+    preprocess.Preprocessor(configurations.app_settings.PREPROCESS_STAGES) if configurations.app_settings.PREPROCESS_STAGES else None
+)
 
-app = FastAPI()
 
 master_control = controller.Controller(
-    llm_client=openai.OpenAIAdapter(
-        configurations.app_settings.OPENAI_API_KEY,
-        configurations.app_settings.OPENAI_MODEL,
+    llm_client=llm_client,
+    cache=(
+        cache.ResultCache(
+            max_bytes=configurations.app_settings.CACHE_MAX_BYTES,
+            ttl_seconds=configurations.app_settings.CACHE_TTL_SECONDS,
+            namespace=(
+                configurations.app_settings.OPENAI_MODEL,
+                # Any routed or hedged model may produce the cached summary.
+                str(configurations.app_settings.OPENAI_SMALL_MODEL),
+                str(configurations.app_settings.ROUTING_SMALL_MAX_TOKENS),
+                str(configurations.app_settings.OPENAI_HEDGE_MODEL),
+                prompts.SYSTEM_PROMPT,
+                prompts.RAW_USER_PROMPT,
+                prompts.CHUNK_USER_PROMPT,
+                prompts.REDUCE_USER_PROMPT,
+                # Keys hash the raw transcript, so a different pipeline must not reuse summaries of differently shrunk prompts.
+                *configurations.app_settings.PREPROCESS_STAGES,
+            ),
+        )
+        if configurations.app_settings.CACHE_ENABLED
+        else None
+    ),
+    scheduler=llm_scheduler,
+    retry_policy=retry.RetryPolicy(
+        max_attempts=configurations.app_settings.LLM_MAX_ATTEMPTS,
+        base_delay=configurations.app_settings.LLM_RETRY_BASE_DELAY,
+        max_delay=configurations.app_settings.LLM_RETRY_MAX_DELAY,
+    ),
+    chunking_policy=(
+        chunking.ChunkingPolicy(
+            threshold_tokens=configurations.app_settings.MAP_REDUCE_THRESHOLD_TOKENS,
+            chunk_tokens=configurations.app_settings.MAP_REDUCE_CHUNK_TOKENS,
+        )
+        if configurations.app_settings.MAP_REDUCE_THRESHOLD_TOKENS
+        else None
     ),
+    preprocessor=transcript_preprocessor,
+    repository=summary_repository,
 )
 
+backfill_service = _build_backfill(summary_repository, transcript_preprocessor)
+
+# Shared by every endpoint so a burst across all of them is measured against one budget.
+token_budget = budget.TokenBudget(
+    configurations.app_settings.TOKEN_BUDGET_PER_MINUTE,
+    completion_tokens=configurations.app_settings.TOKEN_BUDGET_COMPLETION_TOKENS,
+)
+
+upload_policy = ingest.UploadPolicy(
+    max_bytes=configurations.app_settings.UPLOAD_MAX_BYTES,
+    max_transcript_bytes=configurations.app_settings.UPLOAD_MAX_TRANSCRIPT_BYTES,
+    max_inflight=configurations.app_settings.UPLOAD_MAX_INFLIGHT,
+)
+
+job_manager = jobs.JobManager(
+    master_control,
+    workers=configurations.app_settings.JOB_WORKERS,
+    retention_seconds=configurations.app_settings.JOB_RETENTION_SECONDS,
+    budget=token_budget,
+)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    await llm_client.astart()
+    await job_manager.start()
+    yield
+    await job_manager.stop()
+    await llm_client.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.middleware("http")
+async def observe_latency(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+    start = time.perf_counter()
+    response = await call_next(request)
+    # The route template keeps label cardinality bounded (no ids or query strings).
+    route = request.scope.get("route")
+    metrics.REQUEST_LATENCY.labels(
+        method=request.method, endpoint=getattr(route, "path", "unmatched"), status=response.status_code
+    ).observe(time.perf_counter() - start)
+    return response
+
+
+@app.exception_handler(errors.TokenBudgetExceeded)
+async def token_budget_exceeded(_: Request, exc: errors.TokenBudgetExceeded) -> JSONResponse:
+    return JSONResponse(status_code=429, content={"detail": str(exc)}, headers={"Retry-After": str(math.ceil(exc.retry_after))})
+
+
+@app.exception_handler(errors.LLMUnavailableError)
+async def llm_unavailable(_: Request, exc: errors.LLMUnavailableError) -> JSONResponse:
+    headers = {"Retry-After": str(math.ceil(exc.retry_after))} if exc.retry_after is not None else None
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers=headers)
+
+
+class _ModelResponse(Response):
+    """
+    A response model encoded by pydantic-core in one pass. Returned as is, it skips FastAPI's default path (dump to a
+    dict, validate again, then json.dumps), which costs more than building the models for a page of summaries.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: pydantic.BaseModel) -> bytes:
+        return pydantic_core.to_json(content)
+
+
+def _observe_batch(endpoint: str, documents: dtos.Transcripts) -> None:
+    metrics.BATCH_SIZE.labels(endpoint=endpoint).observe(len(documents.transcripts))
+    metrics.TRANSCRIPT_CHARS.labels(endpoint=endpoint).inc(sum(len(t.text) for t in documents.transcripts))
+
 
 @app.get("/")
 async def root():
     return {"message": "Hello AceUp"}
 
 
+@app.get("/health")
+def get_health(response: Response) -> dtos.Health:
+    circuits = [route.llm_client.health() for route in llm_router.routes if isinstance(route.llm_client, guarded.GuardedLLM)]
+    # The hedge only ever duplicates calls, so losing it degrades latency but never availability.
+    serving = [circuit for circuit in circuits if circuit.name != "hedge"]
+    if serving and all(circuit.state is dtos.CircuitState.OPEN for circuit in serving):
+        response.status_code = 503
+        return dtos.Health(status="unavailable", circuits=circuits)
+    degraded = any(circuit.state is not dtos.CircuitState.CLOSED for circuit in circuits)
+    return dtos.Health(status="degraded" if degraded else "ok", circuits=circuits)
+
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics() -> Response:
+    if stats := master_control.store_stats():
+        metrics.STORE_RECORDS.set(stats.records)
+        metrics.STORE_BYTES.set(stats.bytes)
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/cache/stats")
+def get_cache_stats() -> dtos.CacheStats:
+    if not (stats := master_control.cache_stats()):
+        raise HTTPException(status_code=404, detail="Cache disabled")
+    return stats
+
+
+@app.get("/scheduler/stats")
+def get_scheduler_stats() -> dtos.SchedulerStats:
+    if not (stats := master_control.scheduler_stats()):
+        raise HTTPException(status_code=404, detail="Scheduler disabled")
+    return stats
+
+
+@app.get("/budget/stats")
+def get_budget_stats() -> dtos.TokenBudgetStats:
+    return token_budget.stats()
+
+
+@app.get("/routing/stats")
+def get_routing_stats() -> dtos.RoutingStats:
+    return llm_router.stats()
+
+
+@app.get("/preprocess/stats")
+def get_preprocess_stats() -> dtos.PreprocessStats:
+    if not (stats := master_control.preprocess_stats()):
+        raise HTTPException(status_code=404, detail="Preprocessing disabled")
+    return stats
+
+
+@app.get("/store/stats")
+def get_store_stats() -> dtos.StoreStats:
+    if not (stats := master_control.store_stats()):
+        raise HTTPException(status_code=404, detail="Store is not in memory")
+    return stats
+
+
 @app.get("/summary")
 def get_summary(id: str) -> dtos.LLMResponseId:  # pylint: disable=redefined-builtin
     if not (result := master_control.get_summary(id=id)):
@@ -29,8 +318,41 @@ def get_summary(id: str) -> dtos.LLMResponseId:  # pylint: disable=redefined-bui
     return result
 
 
+@app.get("/summaries", response_model=dtos.SummaryPage)
+async def list_summaries(cursor: str | None = None, limit: Annotated[int, Query(ge=1, le=1000)] = 100) -> _ModelResponse:
+    """One page of stored summaries in creation order; pass `next_cursor` back to get the following page."""
+    try:
+        return _ModelResponse(await master_control.alist_summaries(cursor, limit))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+@app.get("/summaries/export")
+async def export_summaries() -> StreamingResponse:
+    """Stream every stored summary as NDJSON, reading the store one page at a time."""
+
+    async def ndjson() -> AsyncIterator[str]:
+        async for summary in master_control.aexport_summaries():
+            yield summary.model_dump_json() + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@app.get("/summary/search", response_model=dtos.SummaryPage)
+async def search_summaries(
+    q: Annotated[str, Query(min_length=1)],
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+) -> _ModelResponse:
+    """Summaries whose text or action items contain every word of `q`, best match first."""
+    try:
+        return _ModelResponse(await master_control.asearch_summaries(q, cursor, limit))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
 @app.post("/summary/generate")
-def summarize(
+async def summarize(
     text: Annotated[
         dtos.Transcript,
         Body(
@@ -42,14 +364,17 @@ def summarize(
         ),
     ],
 ) -> dtos.LLMResponseId:
-    logger.info("Processing transcript syncronously: with, %s chars", {len(text.text)})
-    if not (summary := master_control.summarize(text=text)):
+    logger.info("Processing transcript: with %s chars", len(text.text))
+    metrics.TRANSCRIPT_CHARS.labels(endpoint="generate").inc(len(text.text))
+    async with token_budget.admit("generate", token_budget.estimate([text])):
+        summary = await master_control.asummarize_transcript(text=text)
+    if not summary:
         raise HTTPException(status_code=404, detail="Invalid summary")
     logger.info("transcript processed")
     return summary
 
 
-@app.post("/summary/batch_generate")
+@app.post("/summary/batch_generate", response_model=dtos.LLMresponses)
 async def asummarize(
     documents: Annotated[
         dtos.Transcripts,
@@ -68,15 +393,157 @@ async def asummarize(
             ]
         ),
     ],
-) -> dtos.LLMresponses:
-    logger.info(
-        "Processing documents asyncrously: with %s documents",
-        {len(documents.transcripts)},
-    )
-    if not (summaries := await master_control.asummarize(documents=documents)):
+) -> _ModelResponse:
+    logger.info("Processing documents asyncrously: with %s documents", len(documents.transcripts))
+    _observe_batch("batch_generate", documents)
+    async with token_budget.admit("batch_generate", token_budget.estimate(documents.transcripts)):
+        summaries = await master_control.asummarize(documents=documents)
+    if not summaries:
         raise HTTPException(status_code=404, detail="Invalid summary")
-    logger.info("documents processed")
-    return summaries
+    if summaries.errors and not any(summaries.responses):
+        raise HTTPException(status_code=502, detail=[error.model_dump() for error in summaries.errors])
+    logger.info("documents processed: %s of %s failed", len(summaries.errors), len(summaries.responses))
+    return _ModelResponse(summaries)
+
+
+@app.post("/summary/batch_generate/stream")
+async def astream_summarize(documents: dtos.Transcripts) -> StreamingResponse:
+    """Stream one NDJSON `LLMStreamItem` per transcript as soon as it is summarized and stored."""
+    logger.info("Streaming documents: with %s documents", len(documents.transcripts))
+    _observe_batch("batch_generate_stream", documents)
+    # Reject before the 200 goes out; once streaming, a lost race for the budget waits instead.
+    estimate = token_budget.estimate(documents.transcripts)
+    token_budget.check("batch_generate_stream", estimate)
+
+    async def ndjson() -> AsyncIterator[str]:
+        async with token_budget.admit("batch_generate_stream", estimate, wait=True):
+            async for item in master_control.astream_summarize(documents=documents):
+                yield item.model_dump_json() + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+_BODY_FORMATS: dict[str, ingest.Format] = {"text/plain": "text", "application/x-ndjson": "jsonl", "application/jsonl": "jsonl"}
+_FILE_FORMATS: dict[str, ingest.Format] = {"txt": "text", "jsonl": "jsonl", "ndjson": "jsonl"}
+
+
+async def _file_chunks(upload: UploadFile, size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    while chunk := await upload.read(size):
+        yield chunk
+
+
+async def _capped(chunks: AsyncIterator[bytes], max_bytes: int) -> AsyncGenerator[bytes, None]:
+    # Counts what actually arrives: a chunked body has no Content-Length to check up front.
+    read = 0
+    async for chunk in chunks:
+        read += len(chunk)
+        if read > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Upload exceeds {max_bytes} bytes")
+        yield chunk
+
+
+class _BodyStreamingResponse(StreamingResponse):
+    """
+    A streaming response for a handler still reading its request body.
+
+    `StreamingResponse` watches `receive` for a disconnect while it streams, which would take body chunks away from
+    `request.stream()`; here the body reader owns `receive` and reports a disconnect itself (`ClientDisconnect`).
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+@app.post("/summary/upload")
+async def upload_transcripts(request: Request) -> StreamingResponse:
+    """
+    Summarize an uploaded transcript set, streaming one NDJSON `LLMStreamItem` per transcript as it finishes.
+
+    The body is a `.txt` transcript (`text/plain`), JSONL with one `{"text": ...}` per line (`application/x-ndjson`)
+    or `multipart/form-data` with any number of `.txt`/`.jsonl` files. Transcripts start as soon as they are read.
+    """
+    policy = upload_policy
+    if int(request.headers.get("content-length") or 0) > policy.max_bytes:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds {policy.max_bytes} bytes")
+    token_budget.check("upload", 0)
+    content_type = request.headers.get("content-type", "").partition(";")[0].strip().lower()
+    form = None
+    if content_type == "multipart/form-data":
+        # The whole form is received before the first file is read; the parser spools each file to disk past 1 MiB, so
+        # memory stays flat while disk holds up to max_bytes, and the cap is enforced as the body arrives.
+        try:
+            form = await MultiPartParser(request.headers, _capped(request.stream(), policy.max_bytes)).parse()
+        except MultiPartException as e:
+            raise HTTPException(status_code=400, detail=e.message) from e
+        uploads = [value for _, value in form.multi_items() if isinstance(value, UploadFile)]
+        suffixes = [(upload.filename or "").rpartition(".")[2].lower() for upload in uploads]
+        if not uploads or any(suffix not in _FILE_FORMATS for suffix in suffixes):
+            await form.close()
+            raise HTTPException(status_code=415, detail="Upload .txt, .jsonl or .ndjson files")
+        items = ingest.parse_files([(_FILE_FORMATS[suffix], _file_chunks(upload)) for suffix, upload in zip(suffixes, uploads)], policy)
+    elif content_type in _BODY_FORMATS:
+        items = ingest.parse(request.stream(), _BODY_FORMATS[content_type], policy)
+    else:
+        raise HTTPException(status_code=415, detail="Send text/plain, application/x-ndjson or multipart/form-data")
+
+    async def summarize_one(index: int, text: dtos.Transcript) -> dtos.LLMStreamItem:
+        metrics.TRANSCRIPT_CHARS.labels(endpoint="upload").inc(len(text.text))
+        async with token_budget.admit("upload", token_budget.estimate([text]), wait=True):
+            return await master_control.asummarize_item(index, text)
+
+    async def ndjson() -> AsyncIterator[str]:
+        count = 0
+        try:
+            async for item in ingest.process(items, summarize_one, policy.max_inflight):
+                count += 1
+                yield item.model_dump_json() + "\n"
+        finally:
+            metrics.BATCH_SIZE.labels(endpoint="upload").observe(count)
+            if form is not None:
+                await form.close()
+
+    return _BodyStreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@app.post("/summary/jobs", status_code=202)
+async def create_job(documents: dtos.Transcripts) -> dtos.JobStatus:
+    """Enqueue transcripts for background processing and return immediately with the job id."""
+    # async so submit() runs on the event loop: the job queue is an asyncio.Queue, which is not thread-safe.
+    logger.info("Queueing job: with %s documents", len(documents.transcripts))
+    _observe_batch("jobs", documents)
+    return job_manager.submit(documents)
+
+
+@app.get("/summary/jobs/{job_id}")
+def get_job(job_id: uuid.UUID) -> dtos.JobStatus:
+    if not (status := job_manager.status(job_id)):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return status
+
+
+@app.post("/summary/backfill", status_code=202)
+async def create_backfill(documents: dtos.Transcripts) -> dtos.BackfillStatus:
+    """Submit transcripts to the provider's batch API: cheaper and off the interactive rate limits, but slow."""
+    if backfill_service is None:
+        raise HTTPException(status_code=404, detail="Batch backend unavailable")
+    _observe_batch("backfill", documents)
+    try:
+        return await backfill_service.asubmit(documents)
+    except errors.LLMError as e:
+        raise HTTPException(status_code=502, detail=str(e)) from e
+
+
+@app.get("/summary/backfill/{batch_id}")
+async def get_backfill(batch_id: str) -> dtos.BackfillStatus:
+    """Batch progress; once it has finished, the results are stored and their ids returned."""
+    if backfill_service is None:
+        raise HTTPException(status_code=404, detail="Batch backend unavailable")
+    try:
+        return await backfill_service.astatus(batch_id)
+    except errors.LLMError as e:
+        raise HTTPException(status_code=502, detail=str(e)) from e
 
 
 if __name__ == "__main__":
@@ -0,0 +1,121 @@
+"""
+Cold start: time from process start to the first successful response.
+
+Each run spawns a fresh ``uvicorn app.views:app`` process and polls it until ``GET /`` answers, then sends one
+``POST /summary/generate``, and reports both times measured from the spawn. Runs are sequential and each one
+starts a new interpreter, so imports, app wiring and the lifespan are all paid every time, as on a
+scale-to-zero instance.
+
+``--backend fake`` (default) serves the generate call from the offline adapter with no latency. ``--backend openai``
+uses the real adapter and SDK against a stand-in chat-completions server started by this script (via
+``OPENAI_BASE_URL``), so the SDK's own first-call work is counted but no network or spend is involved.
+
+    uv run python -m benchmarks.cold_start --runs 10
+    uv run python -m benchmarks.cold_start --runs 10 --backend openai
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+
+class StandInOpenAI(BaseHTTPRequestHandler):
+    """Answers every chat completion with the same structured summary, instantly."""
+
+    protocol_version = "HTTP/1.1"
+    content = json.dumps({"summary": "Ship on Friday.", "action_items": ["Ship it"]})
+
+    def log_message(self, format: str, *args: object) -> None:  # pylint: disable=redefined-builtin
+        pass
+
+    def _reply(self, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        self._reply({"id": self.path.rsplit("/", 1)[-1], "object": "model", "created": 0, "owned_by": "stand-in"})
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        self.rfile.read(int(self.headers["Content-Length"]))
+        message = {"role": "assistant", "content": self.content, "refusal": None}
+        self._reply(
+            {
+                "id": "chatcmpl-stand-in",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "stand-in",
+                "choices": [{"index": 0, "message": message, "finish_reason": "stop", "logprobs": None}],
+                "usage": {"prompt_tokens": 50, "completion_tokens": 10, "total_tokens": 60},
+            }
+        )
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(client: httpx.Client, start: float, deadline: float) -> float:
+    while time.perf_counter() < deadline:
+        try:
+            if client.get("/").is_success:
+                return time.perf_counter() - start
+        except httpx.TransportError:
+            pass
+        time.sleep(0.002)
+    raise SystemExit("server did not answer before the deadline")
+
+
+def run_once(backend: str, timeout: float, openai_url: str) -> tuple[float, float]:
+    port = free_port()
+    env = {**os.environ, "LLM_BACKEND": backend, "FAKE_LLM_LATENCY": "0", "TOKEN_BUDGET_PER_MINUTE": "0", "OPENAI_BASE_URL": openai_url}
+    command = [sys.executable, "-m", "uvicorn", "app.views:app", "--port", str(port), "--log-level", "warning"]
+    start = time.perf_counter()
+    server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)  # pylint: disable=consider-using-with
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=timeout) as client:
+            ready = wait_for(client, start, start + timeout)
+            response = client.post("/summary/generate", json={"text": "Alice: ship it on Friday.\nBob: agreed."})
+            response.raise_for_status()
+            return ready, time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--backend", choices=["fake", "openai"], default="fake")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    stand_in = ThreadingHTTPServer(("127.0.0.1", 0), StandInOpenAI)
+    threading.Thread(target=stand_in.serve_forever, daemon=True).start()
+    openai_url = f"http://127.0.0.1:{stand_in.server_address[1]}/v1"
+    try:
+        samples = [run_once(args.backend, args.timeout, openai_url) for _ in range(args.runs)]
+    finally:
+        stand_in.shutdown()
+    print(f"{args.runs} cold starts, backend {args.backend}, python {sys.version.split()[0]}")
+    print(f"{'':<22} {'median ms':>10} {'min ms':>8} {'max ms':>8}")
+    for label, values in (("first GET /", [ready for ready, _ in samples]), ("first summary", [done for _, done in samples])):
+        print(f"{label:<22} {statistics.median(values) * 1000:>10.0f} {min(values) * 1000:>8.0f} {max(values) * 1000:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
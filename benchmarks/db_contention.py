@@ -0,0 +1,118 @@
+"""
+Repository throughput under mixed sync (threadpool) and async (event loop) load.
+
+Sync worker threads and async tasks hammer the same repository concurrently with a write/read mix,
+which is what the API does when /summary (sync GET) and the async generate paths overlap. ``--baseline`` adds the
+store as it was before its single lock: plain dicts copied on every read, a ``threading.Lock`` for sync callers and an
+``asyncio.Lock`` for async ones, which do not exclude each other.
+
+    uv run python -m benchmarks.db_contention --threads 8 --tasks 64 --ops 2000 --baseline
+"""
+
+import argparse
+import asyncio
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Mapping, Protocol
+
+from app.adapters import db, sqlite
+
+RECORD = {"summary": "s" * 400, "action_items": ["do the thing"] * 5}
+
+
+class Store(Protocol):
+    def create(self, data: Mapping[str, Any]) -> Mapping[str, Any]: ...
+
+    def get(self, obj_id: str) -> Mapping[str, Any] | None: ...
+
+    async def acreate(self, data: Mapping[str, Any]) -> Mapping[str, Any]: ...
+
+    async def aget(self, obj_id: str) -> Mapping[str, Any] | None: ...
+
+
+class SplitLockDB:
+    """The in-memory store before it moved to one lock, reduced to the calls this benchmark makes."""
+
+    def __init__(self) -> None:
+        self._store: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._alock = asyncio.Lock()
+
+    def create(self, data: Mapping[str, Any]) -> dict[str, Any]:
+        record = {**data, "id": str(uuid.uuid4())}
+        with self._lock:
+            self._store[record["id"]] = record
+        return record
+
+    def get(self, obj_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            obj = self._store.get(obj_id)
+            return dict(obj) if obj is not None else None
+
+    async def acreate(self, data: Mapping[str, Any]) -> dict[str, Any]:
+        record = {**data, "id": str(uuid.uuid4())}
+        async with self._alock:
+            self._store[record["id"]] = record
+        return record
+
+    async def aget(self, obj_id: str) -> dict[str, Any] | None:
+        async with self._alock:
+            obj = self._store.get(obj_id)
+            return dict(obj) if obj is not None else None
+
+
+def sync_worker(store: Store, ops: int, barrier: threading.Barrier) -> None:
+    barrier.wait()
+    for _ in range(ops // 2):
+        created = store.create(RECORD)
+        store.get(created["id"])
+
+
+async def async_worker(store: Store, ops: int) -> None:
+    for n in range(ops // 2):
+        created = await store.acreate(RECORD)
+        await store.aget(created["id"])
+        if n % 64 == 0:
+            await asyncio.sleep(0)  # let the other tasks interleave like real request handlers
+
+
+async def run(store: Store, threads: int, tasks: int, ops: int) -> float:
+    barrier = threading.Barrier(threads + 1)
+    workers = [threading.Thread(target=sync_worker, args=(store, ops, barrier)) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    await asyncio.gather(*[async_worker(store, ops) for _ in range(tasks)])
+    for worker in workers:
+        await asyncio.to_thread(worker.join)
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--tasks", type=int, default=64)
+    parser.add_argument("--ops", type=int, default=2000, help="operations per worker (half writes, half reads)")
+    parser.add_argument("--sqlite", action="store_true", help="also run against the SQLite repository")
+    parser.add_argument("--baseline", action="store_true", help="also run against the split-lock store it replaced")
+    args = parser.parse_args()
+
+    stores: list[tuple[str, Store]] = [("memory", db.DB())]
+    if args.baseline:
+        stores.insert(0, ("baseline", SplitLockDB()))
+    if args.sqlite:
+        stores.append(("sqlite", sqlite.SQLiteDB(str(Path(tempfile.mkdtemp()) / "bench.db"))))
+
+    total = (args.threads + args.tasks) * (args.ops // 2) * 2
+    print(f"{args.threads} threads + {args.tasks} async tasks, {total} operations")
+    for label, store in stores:
+        elapsed = await run(store, args.threads, args.tasks, args.ops)
+        print(f"{label:<8} {elapsed:7.2f} s  {total / elapsed:12.0f} ops/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+"""
+Resident memory per stored summary: plain dict records vs the compact in-memory store.
+
+Fills a baseline store (a dict of dict records, which is what the repository used to keep, with no search) and
+``app.adapters.db.DB`` with the same realistic summaries and reports the traced allocation per record, split into the
+compressed records and the search index, plus how the bounded store behaves once ``--max-bytes`` is reached: the
+bytes it accounts for against what is actually traced. Model output routinely contains typographic punctuation
+(’ — “”), which forces CPython to store the whole string at two bytes per character; the compact store keeps UTF-8
+and compresses it.
+
+    uv run python -m benchmarks.db_memory --records 20000
+"""
+
+import argparse
+import random
+import tracemalloc
+import uuid
+from typing import Any, Callable
+
+import pydantic_core
+
+from app.adapters import db, search
+
+SENTENCES = [
+    "The coachee wants to standardize formatting with an auto-formatter so reviews focus on logic — not style.",
+    "They agreed to adopt Google-style docstrings for modules, classes and public functions.",
+    "Test coverage should reach eighty percent in the short term, with TDD on larger features.",
+    "Some developers may push back, so a pilot on a single module will demonstrate quick wins.",
+    "A weekly pairing session on code review will keep the new standards honest.",
+    "Onboarding new engineers is slowed down by the team’s inconsistent naming and module structure.",
+    "The manager is worried the changes will be perceived as “too much process.”",
+    "Release cadence slipped last quarter because regressions were caught late in staging.",
+    "The team will track review turnaround time to show the effect of the guidelines.",
+    "Stakeholders asked for a short written summary of the agreed practices by Friday.",
+]
+ACTIONS = [
+    "Configure the formatter in pre-commit for every repository",
+    "Write docstrings for the billing module",
+    "Raise coverage of the API layer to 80%",
+    "Run the pilot on the ingestion service",
+    "Schedule the weekly review pairing",
+    "Share the style guide with new hires",
+    "Report review turnaround time at the next sync",
+]
+
+
+def summary(rng: random.Random) -> dict[str, Any]:
+    return {
+        "summary": " ".join(rng.sample(SENTENCES, 5)) + f" Follow-up meeting #{rng.randint(1, 10_000)}.",
+        "action_items": rng.sample(ACTIONS, rng.randint(3, 5)),
+    }
+
+
+def measure(fill: Callable[[list[dict[str, Any]]], object], payloads: list[dict[str, Any]]) -> float:
+    tracemalloc.start()
+    store = fill(payloads)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return current / len(payloads)
+
+
+def baseline(payloads: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    store: dict[str, dict[str, Any]] = {}
+    for payload in payloads:
+        obj_id = str(uuid.uuid4())
+        store[obj_id] = {
+            "summary": "".join(payload["summary"]),
+            "action_items": ["".join(a) for a in payload["action_items"]],
+            "id": obj_id,
+        }
+    return store
+
+
+def compact(payloads: list[dict[str, Any]]) -> db.DB:
+    store = db.DB()
+    for payload in payloads:
+        store.create(payload)
+    return store
+
+
+def index(payloads: list[dict[str, Any]]) -> Callable[[list[dict[str, Any]]], search.InvertedIndex]:
+    # Ids and terms are built before tracing starts: in the store the ids are the records' own strings.
+    docs = [(str(uuid.uuid4()), search.term_counts(payload)) for payload in payloads]
+
+    def fill(_: list[dict[str, Any]]) -> search.InvertedIndex:
+        built = search.InvertedIndex()
+        for doc_id, counts in docs:
+            built.add(doc_id, counts)
+        return built
+
+    return fill
+
+
+def bounded(max_bytes: int) -> Callable[[list[dict[str, Any]]], db.DB]:
+    def fill(payloads: list[dict[str, Any]]) -> db.DB:
+        store = db.DB(max_bytes=max_bytes)
+        for payload in payloads:
+            store.create(payload)
+        return store
+
+    return fill
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--max-bytes", type=int, default=1024 * 1024, help="budget for the eviction run")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    payloads = [summary(rng) for _ in range(args.records)]
+    # Encoding a non-ASCII str to UTF-8 caches the bytes inside the str; do it now so the payloads' caches, which
+    # outlive every store, are not counted against the first store that encodes them.
+    pydantic_core.to_json(payloads)
+
+    dict_bytes = measure(baseline, payloads)
+    compact_bytes = measure(compact, payloads)
+    index_bytes = measure(index(payloads), payloads)
+    record_bytes = compact_bytes - index_bytes
+    print(f"{'dict records':>14}: {dict_bytes:8.0f} B/record")
+    print(
+        f"{'compact DB':>14}: {compact_bytes:8.0f} B/record  = {record_bytes:.0f} B record ({dict_bytes / record_bytes:.1f}x smaller"
+        f" than a dict) + {index_bytes:.0f} B search index"
+    )
+
+    tracemalloc.start()
+    store = bounded(args.max_bytes)(payloads)
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = store.footprint()
+    print(
+        f"{'bounded DB':>14}: {stats.records} records, {stats.bytes} / {stats.max_bytes} B accounted, {traced} B traced,"
+        f" {stats.evictions} evicted"
+    )
+
+
+if __name__ == "__main__":
+    main()
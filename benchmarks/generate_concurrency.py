@@ -0,0 +1,64 @@
+"""
+Concurrent throughput of /summary/generate: sync threadpool endpoint (before) vs async endpoint (after).
+
+Both variants drive the same Controller against a FakeLLM with a fixed latency, in-process through
+httpx's ASGI transport, so the only difference is how the endpoint waits on the LLM.
+
+    uv run python -m benchmarks.generate_concurrency --requests 400 --latency 0.25
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.adapters import db, fake
+from app.domain import dtos
+from app.services import controller
+
+
+def build_app(latency: float) -> FastAPI:
+    master_control = controller.Controller(llm_client=fake.FakeLLM(latency=latency))
+    app = FastAPI()
+
+    @app.post("/sync")
+    def summarize_sync(text: dtos.Transcript) -> dtos.LLMResponseId | None:
+        return master_control.summarize(text=text)
+
+    @app.post("/async")
+    async def summarize_async(text: dtos.Transcript) -> dtos.LLMResponseId | None:
+        return await master_control.asummarize_transcript(text=text)
+
+    return app
+
+
+async def run(app: FastAPI, path: str, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[client.post(path, json={"text": f"transcript {n}"}) for n in range(requests)])
+        elapsed = time.perf_counter() - start
+    assert all(r.status_code == 200 for r in responses), "benchmark requests failed"
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.25, help="fake LLM latency in seconds")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    app = build_app(args.latency)
+    print(f"{args.requests} concurrent requests, fake LLM latency {args.latency * 1000:.0f} ms")
+    for label, path in (("before (sync, threadpool)", "/sync"), ("after (async)", "/async")):
+        db.database = db.DB()
+        elapsed = await run(app, path, args.requests)
+        print(f"{label:<28} {elapsed:7.2f} s  {args.requests / elapsed:8.1f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
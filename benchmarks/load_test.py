@@ -0,0 +1,158 @@
+"""
+Load generator for the summarization API.
+
+Replays JSONL payloads (one JSON object per line; the transcript is read from ``text``, falling back to ``body``
+so ``requests.jsonl``-style files work as-is) against POST /summary/generate, POST /summary/batch_generate and
+GET /summary at a fixed concurrency, then reports p50/p95/p99 latency, throughput and error rate per endpoint.
+
+Without ``--url`` the app runs in-process over httpx's ASGI transport with ``LLM_BACKEND=fake``, so the whole
+run is offline; tune the fake with the ``FAKE_LLM_*`` environment variables. The token budget and the provider
+rate limits (``TOKEN_BUDGET_PER_MINUTE``, ``LLM_REQUESTS_PER_MINUTE``, ``LLM_TOKENS_PER_MINUTE``) default to off
+in-process; set them to measure their effect. Against a running server, start it
+with ``LLM_BACKEND=fake`` to measure the service rather than OpenAI.
+
+    uv run python -m benchmarks.load_test --payloads requests.jsonl --requests 1000 --concurrency 64 --unique
+    FAKE_LLM_LATENCY=0.8 FAKE_LLM_LATENCY_SIGMA=0.4 FAKE_LLM_RATE_LIMIT_RATE=0.05 \\
+        uv run python -m benchmarks.load_test --payloads requests.jsonl --mix generate=6,batch=1,get=3
+    uv run python -m benchmarks.load_test --url http://localhost:8000 --payloads requests.jsonl
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+
+
+@dataclass(slots=True)
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+@dataclass(slots=True)
+class LoadRun:
+    client: httpx.AsyncClient
+    transcripts: list[str]
+    batch_size: int
+    rng: random.Random
+    unique: bool = False
+    stats: dict[str, EndpointStats] = field(default_factory=dict)
+    known_ids: list[str] = field(default_factory=list)
+
+    def _transcript(self) -> str:
+        text = self.rng.choice(self.transcripts)
+        # A nonce defeats the result cache and single-flight, so every request reaches the LLM.
+        return f"{text}\n[load-test {self.rng.getrandbits(64):x}]" if self.unique else text
+
+    async def request(self, operation: str) -> None:
+        if operation == "get" and not self.known_ids:
+            operation = "generate"  # nothing stored yet to read back
+        start = time.perf_counter()
+        try:
+            if operation == "generate":
+                response = await self.client.post("/summary/generate", json={"text": self._transcript()})
+                if response.is_success:
+                    self.known_ids.append(response.json()["id"])
+            elif operation == "batch":
+                batch = [{"text": self._transcript()} for _ in range(self.batch_size)]
+                response = await self.client.post("/summary/batch_generate", json={"transcripts": batch})
+                if response.is_success:
+                    self.known_ids.extend(r["id"] for r in response.json()["responses"] if r)
+            else:
+                response = await self.client.get("/summary", params={"id": self.rng.choice(self.known_ids)})
+            failed = not response.is_success
+        except httpx.HTTPError:
+            failed = True
+        stats = self.stats.setdefault(operation, EndpointStats())
+        stats.latencies.append(time.perf_counter() - start)
+        stats.errors += failed
+
+
+def load_transcripts(path: Path) -> list[str]:
+    transcripts = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            item = json.loads(line)
+            transcripts.append(item.get("text") or item["body"])
+    return transcripts
+
+
+def parse_mix(mix: str) -> tuple[list[str], list[int]]:
+    weights = dict(part.split("=") for part in mix.split(","))
+    unknown = set(weights) - {"generate", "batch", "get"}
+    if unknown:
+        raise SystemExit(f"unknown operations in --mix: {', '.join(sorted(unknown))}")
+    return list(weights), [int(weight) for weight in weights.values()]
+
+
+async def drive(run: LoadRun, mix: tuple[list[str], list[int]], requests: int, concurrency: int) -> float:
+    remaining = itertools.count()
+
+    async def worker() -> None:
+        while next(remaining) < requests:
+            await run.request(run.rng.choices(*mix)[0])
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return time.perf_counter() - start
+
+
+def report(run: LoadRun, elapsed: float) -> None:
+    total = sum(len(s.latencies) for s in run.stats.values())
+    print(f"{'endpoint':<10} {'requests':>8} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8}")
+    for operation, stats in sorted(run.stats.items()):
+        count = len(stats.latencies)
+        print(
+            f"{operation:<10} {count:>8} {stats.errors / count:>7.1%} {stats.percentile(0.50) * 1000:>8.1f} "
+            f"{stats.percentile(0.95) * 1000:>8.1f} {stats.percentile(0.99) * 1000:>8.1f} {count / elapsed:>8.1f}"
+        )
+    errors = sum(s.errors for s in run.stats.values())
+    print(f"{'total':<10} {total:>8} {errors / max(total, 1):>7.1%} {'':>26} {total / elapsed:>8.1f}  ({elapsed:.2f} s)")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payloads", type=Path, required=True, help="JSONL file with a text (or body) field per line")
+    parser.add_argument("--url", help="base URL of a running server; omitted = in-process app with the fake LLM")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--mix", default="generate=5,batch=1,get=4", help="relative weights of generate, batch and get")
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--unique", action="store_true", help="make every transcript distinct to bypass the result cache")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    transport: httpx.AsyncBaseTransport | None = None
+    if args.url is None:
+        os.environ.setdefault("LLM_BACKEND", "fake")
+        # The fake bills estimated tokens; don't let the admission budget or the provider rate limits (sized for
+        # OpenAI) turn a throughput run into 429s and paced calls. Set them explicitly to measure their effect.
+        for limit in ("TOKEN_BUDGET_PER_MINUTE", "LLM_REQUESTS_PER_MINUTE", "LLM_TOKENS_PER_MINUTE"):
+            os.environ.setdefault(limit, "0")
+        from app import views  # pylint: disable=import-outside-toplevel  # settings are read at import
+
+        # Unhandled server errors become 500 responses, as they would behind a real server.
+        transport = httpx.ASGITransport(app=views.app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url=args.url or "http://load-test", timeout=None) as client:
+        run = LoadRun(client, load_transcripts(args.payloads), args.batch_size, random.Random(args.seed), args.unique)
+        elapsed = await drive(run, parse_mix(args.mix), args.requests, args.concurrency)
+    print(f"{args.requests} requests, concurrency {args.concurrency}, mix {args.mix}, target {args.url or 'in-process'}")
+    report(run, elapsed)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
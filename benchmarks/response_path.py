@@ -0,0 +1,106 @@
+"""
+CPU cost per item of the summary response path, from a parsed completion to JSON bytes.
+
+Runs ``Controller.asummarize`` against an LLM stub that answers instantly and stores into the in-memory
+``app.adapters.db.DB``, so what is left is the response path itself: building records, storing them, building the
+response models and encoding them. The read side pages the same records back out through
+``Controller.alist_summaries``. Each side is encoded two ways: as the pinned FastAPI (0.121) encodes a typed return
+(dump the model to a dict, validate it against the response model, dump that to JSON-able Python, ``json.dumps``),
+and in one pydantic-core pass, as the batch and page endpoints now do. Times are process CPU time per item, median
+over ``--repeat`` runs.
+
+    uv run python -m benchmarks.response_path --sizes 1 100 1000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from typing import Awaitable, Callable
+
+import pydantic
+
+from app import ports
+from app.adapters import db
+from app.domain import dtos
+from app.services import controller
+
+from benchmarks.db_memory import summary
+
+_BATCH = pydantic.TypeAdapter(dtos.LLMresponses)
+_PAGE = pydantic.TypeAdapter(dtos.SummaryPage)
+
+
+def fastapi_default(adapter: pydantic.TypeAdapter, model: pydantic.BaseModel) -> bytes:
+    value = adapter.validate_python(model.model_dump(by_alias=True))
+    content = adapter.dump_python(value, mode="json", by_alias=True)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def direct(adapter: pydantic.TypeAdapter, model: pydantic.BaseModel) -> bytes:
+    return adapter.dump_json(model)
+
+
+ENCODERS = {"fastapi": fastapi_default, "direct": direct}
+
+
+class InstantLLM(ports.LLm):
+    """Hands back pre-parsed completions, so no time is spent outside the response path."""
+
+    def __init__(self, responses: list[dtos.LLMResponse]) -> None:
+        self._responses = responses
+        self._next = 0
+
+    def _take(self) -> dtos.LLMResponse:
+        self._next += 1
+        return self._responses[self._next % len(self._responses)]
+
+    def run_completion(self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]) -> pydantic.BaseModel | None:
+        return self._take()
+
+    async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]) -> pydantic.BaseModel | None:
+        return self._take()
+
+
+async def cpu_per_item(run: Callable[[], Awaitable[object]], items: int, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.process_time()
+        await run()
+        samples.append((time.process_time() - start) / items)
+    return statistics.median(samples) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    llm = InstantLLM([dtos.LLMResponse(**summary(rng)) for _ in range(64)])
+    print(f"{'batch':>6} | {'encoder':>7} | {'write us/item':>13} | {'read us/item':>12}")
+    for size in args.sizes:
+        for name, encode in ENCODERS.items():
+            ctl = controller.Controller(llm, repository=db.DB())
+            documents = dtos.Transcripts(transcripts=[dtos.Transcript(text=f"Ana: transcript {i}") for i in range(size)])
+
+            async def write() -> bytes:
+                # pylint: disable=cell-var-from-loop
+                summaries = await ctl.asummarize(documents)
+                assert summaries is not None
+                return encode(_BATCH, summaries)
+
+            async def read() -> bytes:
+                # pylint: disable=cell-var-from-loop
+                return encode(_PAGE, await ctl.alist_summaries(None, size))
+
+            write_cost = asyncio.run(cpu_per_item(write, size, args.repeat))
+            read_cost = asyncio.run(cpu_per_item(read, size, args.repeat))
+            print(f"{size:>6} | {name:>7} | {write_cost:>13.1f} | {read_cost:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Search latency as the in-memory store grows.
+
+Fills ``app.adapters.db.DB`` with realistic summaries that each mention one of ``--topics`` distinct project
+names, then times ``DB.search`` for selective queries (a project name plus a common word) and for broad ones
+(two words that appear in a large share of all records). Selective queries only walk the postings of their
+rarest term, so their latency should stay roughly flat with the store size; broad queries scale with the
+number of matches they have to rank.
+
+    uv run python -m benchmarks.search_latency --sizes 10000 50000 200000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from app.adapters import db
+
+from benchmarks.db_memory import summary
+
+
+def timed(database: db.DB, queries: list[str]) -> tuple[float, float]:
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        database.search(query, None, 20)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return statistics.median(samples) * 1000, samples[int(len(samples) * 0.95)] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 200_000])
+    parser.add_argument("--topics", type=int, default=5_000, help="distinct project names across the store")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    database = db.DB()
+    loaded = 0
+    print(f"{'records':>8} | {'selective p50/p95 ms':>20} | {'broad p50/p95 ms':>17}")
+    for size in sorted(args.sizes):
+        payloads = []
+        for _ in range(size - loaded):
+            payload = summary(rng)
+            payload["summary"] += f" Project codename topic{rng.randrange(args.topics)}."
+            payloads.append(payload)
+        database.bulk_create(payloads)
+        loaded = size
+
+        selective = [f"topic{rng.randrange(args.topics)} coverage" for _ in range(args.queries)]
+        broad = ["test coverage", "weekly review", "module pilot"] * (args.queries // 3)
+        sel_p50, sel_p95 = timed(database, selective)
+        broad_p50, broad_p95 = timed(database, broad)
+        print(f"{size:>8} | {sel_p50:>9.3f} / {sel_p95:<8.3f} | {broad_p50:>7.2f} / {broad_p95:<7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Peak memory while summarizing an uploaded transcript set: one JSON body vs the streamed JSONL upload.
+
+The JSON path is what ``POST /summary/batch_generate`` does: read the whole body, validate it into ``Transcripts``,
+summarize everything concurrently and hold the results until the response is built. The streamed path is
+``POST /summary/upload``: the body arrives in 64 KiB chunks, each line is parsed as soon as it is complete, at most
+``--inflight`` transcripts are summarized at once and each result is handed to the response as it finishes. The LLM
+is a stub that yields once, so what is measured is what the service itself keeps alive (traced Python allocations,
+peak over the run); the body is generated on the fly and never counted whole.
+
+    uv run python -m benchmarks.upload_memory --sizes 1000 10000 50000
+"""
+
+import argparse
+import asyncio
+import functools
+import random
+import tracemalloc
+from typing import Any, AsyncIterator, Callable, Coroutine
+
+from app.domain import dtos
+from app.services import ingest
+
+from benchmarks.db_memory import SENTENCES
+
+_CHUNK = 64 * 1024
+
+
+def transcript(rng: random.Random) -> str:
+    turns = (f"{rng.choice(['Ana', 'Bob', 'Cy'])}: {rng.choice(SENTENCES)}" for _ in range(rng.randint(10, 30)))
+    return "\n".join(turns)
+
+
+def jsonl_lines(count: int) -> list[bytes]:
+    rng = random.Random(0)
+    return [dtos.Transcript(text=transcript(rng)).model_dump_json().encode() + b"\n" for _ in range(count)]
+
+
+async def chunked(lines: list[bytes]) -> AsyncIterator[bytes]:
+    buffer = bytearray()
+    for line in lines:
+        buffer += line
+        if len(buffer) >= _CHUNK:
+            yield bytes(buffer[:_CHUNK])
+            del buffer[:_CHUNK]
+    if buffer:
+        yield bytes(buffer)
+
+
+async def summarize(index: int, _text: dtos.Transcript) -> dtos.LLMStreamItem:
+    await asyncio.sleep(0)
+    return dtos.LLMStreamItem(index=index)
+
+
+async def json_body(lines: list[bytes]) -> int:
+    body = b"".join([chunk async for chunk in chunked([b'{"transcripts": [', b",".join(line.rstrip() for line in lines), b"]}"])])
+    documents = dtos.Transcripts.model_validate_json(body)
+    results = await asyncio.gather(*(summarize(index, text) for index, text in enumerate(documents.transcripts)))
+    return len(results)
+
+
+async def streamed(lines: list[bytes], inflight: int = 32) -> int:
+    items = ingest.parse(chunked(lines), "jsonl", ingest.UploadPolicy(max_bytes=1 << 40))
+    return sum([1 async for _ in ingest.process(items, summarize, inflight)])
+
+
+def peak_mib(run: Callable[[list[bytes]], Coroutine[Any, Any, int]], lines: list[bytes]) -> float:
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    assert asyncio.run(run(lines)) == len(lines)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--inflight", type=int, default=32)
+    args = parser.parse_args()
+
+    print(f"{'transcripts':>11} | {'body MiB':>8} | {'JSON body peak MiB':>18} | {'streamed peak MiB':>17}")
+    for size in args.sizes:
+        lines = jsonl_lines(size)
+        body = sum(map(len, lines)) / (1024 * 1024)
+        whole = peak_mib(json_body, lines)
+        stream = peak_mib(functools.partial(streamed, inflight=args.inflight), lines)
+        print(f"{size:>11} | {body:>8.1f} | {whole:>18.1f} | {stream:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
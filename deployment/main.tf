@@ -36,6 +36,11 @@ resource "google_cloud_run_v2_service" "app" {
       ports {
         container_port = 8000
       }
+
+      # Background jobs (/summary/jobs) keep running after the request returns, so CPU must stay allocated.
+      resources {
+        cpu_idle = false
+      }
     }
 
     # small CPU/RAM to stay well inside free
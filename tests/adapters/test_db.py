@@ -1,3 +1,9 @@
+import asyncio
+import json
+import threading
+import uuid
+import zlib
+
 from app.adapters import db
 
 import pytest
@@ -60,3 +66,244 @@ async def test_db_bulk_acreate() -> None:
     ids = [r["id"] for r in results]
     assert len(set(ids)) == 3
     assert all("id" in r and "n" in r for r in results)
+
+
+@pytest.mark.asyncio
+async def test_db_bulk_acreate_once_stores_a_key_once() -> None:
+    database = db.DB()
+
+    ids = await database.bulk_acreate_once("k", [{"n": 0}, {"n": 1}])
+    assert await database.bulk_acreate_once("k", [{"n": 2}]) == ids
+    assert [database.get(i)["n"] for i in ids] == [0, 1]
+    assert len(database.all()) == 2
+
+
+def test_db_forgets_a_once_key_with_its_last_record() -> None:
+    database = db.DB(max_records=2)
+
+    ids = database.bulk_create_once("k", [{"n": 0}, {"n": 1}])
+    database.create({"n": 2})  # evicts the first record; the key still guards the second
+    assert database.bulk_create_once("k", [{"n": 3}]) == ids
+    database.create({"n": 4})  # and now the second
+
+    plain = db.DB()
+    plain.create({"n": 2})
+    plain.create({"n": 4})
+    assert database.footprint().bytes == plain.footprint().bytes  # the key's bytes went with it
+    assert database.bulk_create_once("k", [{"n": 5}]) != ids  # stored again
+    assert database.bulk_create_once("empty", []) == [] and database.bulk_create_once("empty", [{"n": 6}]) != []
+
+
+def test_db_records_are_immutable_and_copy_on_write() -> None:
+    database = db.DB()
+
+    created = database.create({"summary": "s", "action_items": ["a"]})
+    with pytest.raises(TypeError):
+        created["summary"] = "changed"  # type: ignore[index]
+    created["action_items"].append("b")  # a read decodes its own copy, once
+    assert created["action_items"] == ["a", "b"]
+
+    fetched = database.get(created["id"])
+    assert fetched is not None and fetched["action_items"] == ["a"]  # what is stored never changes
+
+    updated = database.update(created["id"], {"summary": "t"})
+    assert updated["summary"] == "t" and created["summary"] == "s"
+
+
+@pytest.mark.asyncio
+async def test_db_sync_and_async_writers_share_one_lock() -> None:
+    database = db.DB()
+    start = threading.Barrier(5)
+
+    def sync_writer() -> None:
+        start.wait()
+        for i in range(500):
+            database.create({"n": i})
+
+    threads = [threading.Thread(target=sync_writer) for _ in range(4)]
+    for t in threads:
+        t.start()
+    start.wait()
+    await asyncio.gather(*[database.bulk_acreate([{"n": i} for i in range(100)]) for _ in range(10)])
+    for t in threads:
+        t.join()
+
+    assert len(await database.aall()) == 4 * 500 + 10 * 100
+
+
+def test_db_evicts_least_recently_used_over_record_limit() -> None:
+    database = db.DB(max_records=2)
+
+    first = database.create({"n": 1})
+    second = database.create({"n": 2})
+    assert database.get(first["id"]) is not None  # first is now most recently used
+    database.create({"n": 3})
+
+    assert database.get(second["id"]) is None
+    assert database.get(first["id"]) is not None
+    stats = database.footprint()
+    assert stats.records == 2 and stats.evictions == 1
+
+
+def test_db_evicts_over_byte_limit_and_tracks_footprint() -> None:
+    single = db.DB()
+    single.create({"summary": "x" * 100})
+    record_size = single.footprint().bytes
+    assert record_size > db.Record(str(uuid.uuid4()), {"summary": "x" * 100}).nbytes  # its index entries count too
+    database = db.DB(max_bytes=3 * record_size)
+
+    for _ in range(5):
+        database.create({"summary": "x" * 100})
+
+    stats = database.footprint()
+    assert stats.records == 3 and stats.evictions == 2
+    assert stats.bytes == 3 * record_size <= stats.max_bytes
+
+    database.delete(database.all()[0]["id"])
+    assert database.footprint().bytes == 2 * record_size
+    for record in database.all():
+        database.update(record["id"], {"summary": "y"})
+        database.delete(record["id"])
+    assert database.footprint().bytes == 0
+
+
+def test_db_expires_records_after_ttl() -> None:
+    now = [0.0]
+    database = db.DB(ttl_seconds=10, clock=lambda: now[0])
+
+    stale = database.create({"n": 1})
+    now[0] = 5.0
+    fresh = database.create({"n": 2})
+    now[0] = 12.0
+
+    assert database.get(stale["id"]) is None
+    assert database.update(stale["id"], {"n": 3}) is None
+    assert [r["id"] for r in database.all()] == [fresh["id"]]
+    assert database.footprint().expirations == 1
+
+    database.create({"n": 3})  # inserts sweep expired records from the LRU end
+    now[0] = 16.0
+    database.create({"n": 4})
+    assert database.get(fresh["id"]) is None
+    assert database.footprint().expirations == 2
+
+
+def test_record_is_compact_and_read_as_a_mapping(monkeypatch: pytest.MonkeyPatch) -> None:
+    record = db.Record("abc", {"summary": "s", "action_items": ["a", "b"], "id": "ignored"})
+    view = record.view()
+
+    assert record.id == view["id"] == "abc"
+    assert dict(view) == {"summary": "s", "action_items": ["a", "b"], "id": "abc"}
+    assert len(view) == 3 and set(view.keys()) == {"summary", "action_items", "id"}
+    assert "Record(" in repr(record) and "Record(" in repr(view)
+    assert not hasattr(record, "__dict__") and not hasattr(view, "__dict__")
+
+    decoded, decompress = [], zlib.decompress
+    monkeypatch.setattr(zlib, "decompress", lambda blob: decoded.append(blob) or decompress(blob))
+    view = record.view()
+    assert view["id"] == "abc" and not decoded
+    assert dict(view.items()) == dict(view) and view["summary"] == "s" and len(view) == 3
+    assert len(decoded) == 1  # once per read, however it is walked
+
+
+def test_record_to_json_includes_the_id() -> None:
+    record = db.Record("abc", {"summary": "“s”", "action_items": ["a"]})
+
+    assert json.loads(record.to_json()) == {"id": "abc", "summary": "“s”", "action_items": ["a"]}
+    assert json.loads(db.Record("empty", {}).to_json()) == {"id": "empty"}
+    for value in (object(), uuid.uuid4(), {"a"}, b"a", {1.5: "key"}):  # json.dumps rejects these too
+        with pytest.raises(TypeError):
+            db.Record("bad", {"summary": value})
+    assert db.Record("nan", {"score": float("nan"), "pair": (1, 2)}).to_dict()["pair"] == [1, 2]
+
+
+def test_db_page_walks_creation_order_with_cursor() -> None:
+    database = db.DB()
+    ids = [database.create({"n": i})["id"] for i in range(5)]
+    database.get(ids[0])  # LRU access must not reorder listings
+
+    first, cursor = database.page(None, 2)
+    second, cursor = database.page(cursor, 2)
+    third, end = database.page(cursor, 2)
+
+    assert [r["id"] for r in first + second + third] == ids
+    assert end is None
+    for cursor in ("not-a-cursor", str(2**63)):
+        with pytest.raises(ValueError):
+            database.page(cursor, 2)
+
+
+def test_db_page_skips_removed_records_and_survives_compaction() -> None:
+    now = [0.0]
+    database = db.DB(ttl_seconds=10, clock=lambda: now[0])
+    ids = [database.create({"n": i})["id"] for i in range(6)]
+
+    page, cursor = database.page(None, 2)
+    for obj_id in ids[1:5]:  # more than half the log: tombstones get compacted
+        database.delete(obj_id)
+    rest, end = database.page(cursor, 2)
+
+    assert [r["id"] for r in page] == ids[:2]
+    assert [r["id"] for r in rest] == [ids[5]] and end is None
+
+    now[0] = 20.0
+    assert database.page(None, 10) == ([], None)
+
+
+@pytest.mark.asyncio
+async def test_db_aiter_records_pages_through_everything() -> None:
+    database = db.DB()
+    ids = [r["id"] for r in await database.bulk_acreate([{"n": i} for i in range(7)])]
+
+    assert [r["id"] async for r in database.aiter_records(batch_size=3)] == ids
+    assert await database.apage(None, 100) == (await database.aall(), None)
+
+
+@pytest.mark.asyncio
+async def test_db_search_follows_writes_and_evictions() -> None:
+    database = db.DB(max_records=3)
+    coverage = await database.acreate({"summary": "Team sync", "action_items": ["Raise test coverage"]})
+    other = await database.acreate({"summary": "Test coverage review", "action_items": ["Add coverage gates"]})
+    database.create({"summary": "Hiring plan", "action_items": []})
+
+    found, end = await database.asearch("test coverage", None, 10)
+    assert [r["id"] for r in found] == [other["id"], coverage["id"]] and end is None
+    first, cursor = database.search("coverage", None, 1)
+    rest, _ = database.search("coverage", cursor, 1)
+    assert {first[0]["id"], rest[0]["id"]} == {coverage["id"], other["id"]}
+
+    await database.aupdate(coverage["id"], {"action_items": ["Write docs"]})
+    assert [r["id"] for r in database.search("test coverage", None, 10)[0]] == [other["id"]]
+    assert [r["id"] for r in database.search("docs", None, 10)[0]] == [coverage["id"]]
+
+    database.delete(other["id"])
+    database.create({"summary": "Budget"})
+    database.create({"summary": "Roadmap"})  # evicts the updated record
+    assert database.search("coverage docs", None, 10) == ([], None)
+    with pytest.raises(ValueError):
+        database.search("docs", "-1", 10)
+
+
+def test_db_search_skips_expired_records() -> None:
+    now = [0.0]
+    database = db.DB(ttl_seconds=10, clock=lambda: now[0])
+    database.create({"summary": "coverage"})
+    now[0] = 20.0
+
+    assert database.search("coverage", None, 10) == ([], None)
+
+
+def test_db_search_pages_count_live_records_only() -> None:
+    now = [0.0]
+    database = db.DB(ttl_seconds=10, clock=lambda: now[0])
+    # Stale records rank first (the term is denser in them) and still sit in the index.
+    stale = [database.create({"summary": "coverage coverage"})["id"] for _ in range(4)]
+    now[0] = 5.0
+    fresh = [database.create({"summary": f"coverage plan {n}"})["id"] for n in range(3)]
+    now[0] = 12.0
+
+    first, cursor = database.search("coverage", None, 2)
+    rest, end = database.search("coverage", cursor, 2)
+
+    assert len(first) == 2 and cursor is not None and len(rest) == 1 and end is None
+    assert sorted(r["id"] for r in first + rest) == sorted(fresh) and not set(stale) & {r["id"] for r in first + rest}
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from app.adapters import fake
+from app.domain import dtos, errors, usage
+
+
+def test_fake_llm_sync_honours_latency() -> None:
+    llm = fake.FakeLLM(latency=0.02)
+
+    start = time.perf_counter()
+    response = llm.run_completion("s", "u", dtos.LLMResponse)
+
+    assert time.perf_counter() - start >= 0.02
+    assert isinstance(response, dtos.LLMResponse) and response.action_items
+
+
+@pytest.mark.asyncio
+async def test_fake_llm_async_uses_custom_payload() -> None:
+    llm = fake.FakeLLM(payload={"summary": "custom", "action_items": []})
+
+    response = await llm.run_completion_async("s", "u", dtos.LLMResponse)
+
+    assert response.summary == "custom"
+
+
+def test_fake_llm_injects_rate_limits_and_errors_deterministically() -> None:
+    def outcomes(seed: int) -> list[str]:
+        llm = fake.FakeLLM(error_rate=0.2, rate_limit_rate=0.3, retry_after=1.5, seed=seed)
+        seen = []
+        for _ in range(200):
+            try:
+                llm.run_completion("s", "u", dtos.LLMResponse)
+                seen.append("ok")
+            except errors.RetryableLLMError as e:
+                assert e.retry_after == 1.5
+                seen.append("429")
+            except errors.LLMError:
+                seen.append("error")
+        return seen
+
+    first = outcomes(seed=7)
+    assert first == outcomes(seed=7)
+    assert 40 < first.count("429") < 80 and 20 < first.count("error") < 60
+
+
+@pytest.mark.asyncio
+async def test_fake_llm_latency_distribution() -> None:
+    llm = fake.FakeLLM(latency=0.01, latency_sigma=0.5, seed=1)
+    latencies = [llm._draw()[0] for _ in range(500)]  # pylint: disable=protected-access
+
+    assert len(set(latencies)) > 1 and all(latency > 0 for latency in latencies)
+    assert 0.008 < sorted(latencies)[250] < 0.012  # median stays at the configured latency
+
+    with pytest.raises(errors.LLMError):
+        await fake.FakeLLM(error_rate=1.0).run_completion_async("s", "u", dtos.LLMResponse)
+
+
+@pytest.mark.asyncio
+async def test_fake_llm_reports_estimated_usage_on_success_only() -> None:
+    llm = fake.FakeLLM(payload={"summary": "x" * 40, "action_items": []})
+
+    with usage.metered() as meter:
+        await llm.run_completion_async("s" * 40, "u" * 400, dtos.LLMResponse)
+        with pytest.raises(errors.LLMError):
+            fake.FakeLLM(error_rate=1.0).run_completion("s", "u", dtos.LLMResponse)
+
+    assert (meter.prompt_tokens, meter.completion_tokens) == (110, 19)
@@ -0,0 +1,225 @@
+import asyncio
+
+import pytest
+
+from app import ports
+from app.adapters import guarded
+from app.domain import dtos, errors
+
+
+class FlakyLLM(ports.LLm):
+    """Fails with ``error`` while it is set; ``gate`` (when given) holds async calls until released."""
+
+    def __init__(self) -> None:
+        self.error: Exception | None = None
+        self.gate: asyncio.Event | None = None
+        self.calls = 0
+        self.lifecycle: list[str] = []
+
+    def run_completion(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return dto(summary="ok", action_items=[])  # type: ignore[call-arg]
+
+    async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        self.calls += 1
+        if self.gate:
+            await self.gate.wait()
+        if self.error:
+            raise self.error
+        return dto(summary="ok", action_items=[])  # type: ignore[call-arg]
+
+    async def astart(self) -> None:
+        self.lifecycle.append("start")
+
+    async def aclose(self) -> None:
+        self.lifecycle.append("close")
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _call(llm: ports.LLm) -> str:
+    result = await llm.run_completion_async("s", "u", dtos.LLMResponse)
+    return result.summary  # type: ignore[union-attr]
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_on_success_and_halves_on_upstream_errors() -> None:
+    upstream = FlakyLLM()
+    llm = guarded.GuardedLLM(
+        upstream, concurrency=guarded.ConcurrencyPolicy(initial=2, maximum=8), circuit=guarded.CircuitPolicy(min_calls=100)
+    )
+
+    for _ in range(4):
+        await _call(llm)
+    assert llm.health().concurrency_limit == 6  # slow start: +1 per success
+
+    upstream.error = errors.RetryableLLMError("429")
+    with pytest.raises(errors.RetryableLLMError):
+        await _call(llm)
+    assert llm.health().concurrency_limit == 3
+
+    upstream.error = None
+    for _ in range(4):
+        await _call(llm)
+    assert llm.health().concurrency_limit == 4  # additive: +1/limit per success
+
+
+@pytest.mark.asyncio
+async def test_slow_calls_count_as_congestion_and_bad_requests_do_not() -> None:
+    clock = Clock()
+    upstream = FlakyLLM()
+    llm = guarded.GuardedLLM(upstream, concurrency=guarded.ConcurrencyPolicy(initial=8, latency_target=1.0), clock=clock)
+
+    upstream.error = errors.LLMError("400")
+    with pytest.raises(errors.LLMError):
+        await _call(llm)
+    assert llm.health().concurrency_limit == 8
+
+    upstream.error = None
+    original = upstream.run_completion_async
+
+    async def slow(*args, **kwargs):
+        clock.now += 2
+        return await original(*args, **kwargs)
+
+    upstream.run_completion_async = slow  # type: ignore[method-assign]
+    await _call(llm)
+    assert llm.health().concurrency_limit == 4
+
+
+@pytest.mark.asyncio
+async def test_latency_is_measured_from_the_slot_not_the_queue() -> None:
+    clock = Clock()
+    upstream = FlakyLLM()
+    upstream.gate = asyncio.Event()
+    llm = guarded.GuardedLLM(upstream, concurrency=guarded.ConcurrencyPolicy(initial=1, maximum=1, latency_target=1.0), clock=clock)
+
+    first = asyncio.ensure_future(_call(llm))
+    queued = asyncio.ensure_future(_call(llm))
+    await asyncio.sleep(0.01)
+    clock.now += 0.5  # the first call takes half the target, while the second waits for its slot
+    released, upstream.gate = upstream.gate, asyncio.Event()
+    released.set()
+    await first
+    await asyncio.sleep(0.01)
+    clock.now += 0.6  # the second call is as quick, but it was queued for longer than the target
+    upstream.gate.set()
+    await queued
+
+    assert llm.health().concurrency_limit == 1 and not llm._limit.last_decrease > 0  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_waits_for_a_slot_and_sheds_past_the_queue_limit() -> None:
+    upstream = FlakyLLM()
+    upstream.gate = asyncio.Event()
+    llm = guarded.GuardedLLM(upstream, "default", concurrency=guarded.ConcurrencyPolicy(initial=1, max_queue=1))
+
+    first = asyncio.ensure_future(_call(llm))
+    second = asyncio.ensure_future(_call(llm))
+    await asyncio.sleep(0.01)
+    assert (upstream.calls, llm.health().inflight, llm.health().waiting) == (1, 1, 1)
+
+    with pytest.raises(errors.LLMUnavailableError, match="waiting"):
+        await _call(llm)
+
+    upstream.gate.set()
+    assert await asyncio.gather(first, second) == ["ok", "ok"]
+    health = llm.health()
+    assert (health.inflight, health.waiting, health.rejected) == (0, 0, 1)
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_fails_fast_and_closes_after_a_successful_probe() -> None:
+    clock = Clock()
+    upstream = FlakyLLM()
+    llm = guarded.GuardedLLM(
+        upstream, circuit=guarded.CircuitPolicy(failure_rate=0.5, min_calls=4, window=4, reset_seconds=30), clock=clock
+    )
+
+    upstream.error = errors.RetryableLLMError("503")
+    for _ in range(4):
+        with pytest.raises(errors.RetryableLLMError):
+            await _call(llm)
+    health = llm.health()
+    assert (health.state, health.opened, health.retry_after_seconds) == (dtos.CircuitState.OPEN, 1, 30)
+
+    clock.now = 10
+    with pytest.raises(errors.LLMUnavailableError) as refused:
+        llm.run_completion("s", "u", dtos.LLMResponse)
+    assert refused.value.retry_after == 20
+    assert upstream.calls == 4  # failed fast, upstream untouched
+
+    clock.now = 31
+    assert llm.health().state == dtos.CircuitState.HALF_OPEN
+    with pytest.raises(errors.RetryableLLMError):
+        await _call(llm)  # the probe fails: open again
+    assert llm.health().state == dtos.CircuitState.OPEN
+
+    clock.now = 62
+    upstream.error = None
+    assert await _call(llm) == "ok"
+    health = llm.health()
+    assert (health.state, health.opened, health.rejected) == (dtos.CircuitState.CLOSED, 2, 1)
+
+
+@pytest.mark.asyncio
+async def test_half_open_admits_one_probe_at_a_time() -> None:
+    clock = Clock()
+    upstream = FlakyLLM()
+    llm = guarded.GuardedLLM(upstream, circuit=guarded.CircuitPolicy(min_calls=1, window=1, reset_seconds=1), clock=clock)
+    upstream.error = errors.RetryableLLMError("503")
+    with pytest.raises(errors.RetryableLLMError):
+        await _call(llm)
+
+    clock.now = 2
+    upstream.error, upstream.gate = None, asyncio.Event()
+    probe = asyncio.ensure_future(_call(llm))
+    await asyncio.sleep(0.01)
+    with pytest.raises(errors.LLMUnavailableError, match="probe"):
+        await _call(llm)
+
+    upstream.gate.set()
+    assert await probe == "ok"
+    assert llm.health().state == dtos.CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_frees_its_slot() -> None:
+    clock = Clock()
+    upstream = FlakyLLM()
+    llm = guarded.GuardedLLM(upstream, circuit=guarded.CircuitPolicy(min_calls=1, window=1, reset_seconds=1), clock=clock)
+    upstream.error = errors.RetryableLLMError("503")
+    with pytest.raises(errors.RetryableLLMError):
+        await _call(llm)
+
+    clock.now = 2
+    upstream.error, upstream.gate = None, asyncio.Event()
+    probe = asyncio.ensure_future(_call(llm))
+    await asyncio.sleep(0.01)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    upstream.gate.set()
+    assert await _call(llm) == "ok"
+    assert llm.health().state == dtos.CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_lifecycle_is_forwarded() -> None:
+    upstream = FlakyLLM()
+    llm = guarded.GuardedLLM(upstream)
+
+    await llm.astart()
+    await llm.aclose()
+
+    assert upstream.lifecycle == ["start", "close"]
@@ -0,0 +1,70 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from app.adapters import fake, instrumented, singleflight
+from app.domain import dtos, errors
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class UpstreamTimeout(Exception):
+    pass
+
+
+class FailingLLM(fake.FakeLLM):
+    async def run_completion_async(self, system_prompt, user_prompt, dto):  # type: ignore[override]
+        try:
+            raise UpstreamTimeout("slow")
+        except UpstreamTimeout as exc:
+            raise errors.RetryableLLMError("timeout") from exc
+
+
+def test_instrumented_llm_records_sync_latency() -> None:
+    before = _sample("llm_completion_duration_seconds_count", mode="sync")
+
+    result = instrumented.InstrumentedLLM(fake.FakeLLM()).run_completion("s", "u", dtos.LLMResponse)
+
+    assert isinstance(result, dtos.LLMResponse)
+    assert _sample("llm_completion_duration_seconds_count", mode="sync") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_instrumented_llm_counts_errors_by_upstream_type() -> None:
+    llm = instrumented.InstrumentedLLM(FailingLLM())
+    before = _sample("llm_errors_total", type="UpstreamTimeout", retryable="true")
+    calls = _sample("llm_completion_duration_seconds_count", mode="async")
+
+    with pytest.raises(errors.RetryableLLMError):
+        await llm.run_completion_async("s", "u", dtos.LLMResponse)
+    with pytest.raises(errors.LLMError):
+        await instrumented.InstrumentedLLM(fake.FakeLLM(error_rate=1.0)).run_completion_async("s", "u", dtos.LLMResponse)
+
+    assert _sample("llm_errors_total", type="UpstreamTimeout", retryable="true") == before + 1
+    assert _sample("llm_errors_total", type="LLMError", retryable="false") >= 1
+    assert _sample("llm_completion_duration_seconds_count", mode="async") == calls + 2
+
+
+class LifecycleLLM(fake.FakeLLM):
+    def __init__(self) -> None:
+        super().__init__()
+        self.events: list[str] = []
+
+    async def astart(self) -> None:
+        self.events.append("start")
+
+    async def aclose(self) -> None:
+        self.events.append("close")
+
+
+@pytest.mark.asyncio
+async def test_wrappers_forward_lifecycle_to_the_real_client() -> None:
+    inner = LifecycleLLM()
+    wrapped = singleflight.SingleFlightLLM(instrumented.InstrumentedLLM(inner))
+
+    await wrapped.astart()
+    await wrapped.aclose()
+
+    assert inner.events == ["start", "close"]
+    await fake.FakeLLM().astart()  # adapters without resources inherit no-op hooks
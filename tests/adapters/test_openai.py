@@ -1,61 +1,91 @@
 import asyncio
 from typing import Any
 
+import httpx
+import openai
 import pydantic
 import pytest
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletionMessage
 
 from app.domain import configurations
 from tests.adapters import mock_data
 from app.adapters import openai as openai_adapter_module
-from app.domain import dtos
+from app.domain import dtos, errors, usage
 
-
-class _DummyMessage:
-    def __init__(self, dto_cls: type[pydantic.BaseModel]):
-        self.parsed = dto_cls(summary="ok", action_items=["a", "b"])  # type: ignore[call-arg]
+_CONTENT = '{"summary": "ok", "action_items": ["a", "b"]}'
 
 
 class _DummyChoice:
-    def __init__(self, dto_cls: type[pydantic.BaseModel]):
-        self.message = _DummyMessage(dto_cls)
+    def __init__(self, content: str | None, refusal: str | None):
+        self.message = ChatCompletionMessage(role="assistant", content=content, refusal=refusal)
 
 
 class _DummyCompletion:
-    def __init__(self, dto_cls: type[pydantic.BaseModel]):
-        self.choices = [_DummyChoice(dto_cls)]
+    def __init__(self, content: str | None = _CONTENT, refusal: str | None = None):
+        self.choices = [_DummyChoice(content, refusal)]
+        self.usage = CompletionUsage(prompt_tokens=120, completion_tokens=30, total_tokens=150)
 
 
 class _SyncCompletions:
-    def parse(
+    def __init__(self) -> None:
+        self.response_formats: list[Any] = []
+
+    def create(
         self,
         *,
         model: str,
         messages: list[dict[str, Any]],
-        response_format: type[pydantic.BaseModel],
+        response_format: Any,
     ):
-        return _DummyCompletion(response_format)
+        self.response_formats.append(response_format)
+        return _DummyCompletion()
 
 
 class _AsyncCompletions:
-    async def parse(
+    async def create(
         self,
         *,
         model: str,
         messages: list[dict[str, Any]],
-        response_format: type[pydantic.BaseModel],
+        response_format: Any,
     ):
         await asyncio.sleep(0)
-        return _DummyCompletion(response_format)
+        return _DummyCompletion()
 
 
 class _SyncClient:
-    def __init__(self, api_key: str):
-        self.beta = type("Beta", (), {"chat": type("Chat", (), {"completions": _SyncCompletions()})})()
+    def __init__(self, api_key: str, **kwargs: Any):
+        self.chat = type("Chat", (), {"completions": _SyncCompletions()})()
+        self.http_client: httpx.Client = kwargs["http_client"]
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+        self.http_client.close()
+
+
+class _Models:
+    def __init__(self, fail: bool = False) -> None:
+        self.retrieved = 0
+        self._fail = fail
+
+    async def retrieve(self, model: str) -> None:
+        self.retrieved += 1
+        if self._fail:
+            raise openai.APIConnectionError(request=httpx.Request("GET", "https://api.openai.com"))
 
 
 class _AsyncClient:
-    def __init__(self, api_key: str):
-        self.beta = type("Beta", (), {"chat": type("Chat", (), {"completions": _AsyncCompletions()})})()
+    def __init__(self, api_key: str, **kwargs: Any):
+        self.chat = type("Chat", (), {"completions": _AsyncCompletions()})()
+        self.http_client: httpx.AsyncClient = kwargs["http_client"]
+        self.models = _Models()
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+        await self.http_client.aclose()
 
 
 @pytest.fixture(autouse=True)
@@ -94,3 +124,151 @@ async def test_openai_adapter_async() -> None:
 
     assert data["summary"] == "ok"
     assert data["action_items"] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_openai_adapter_records_reported_usage() -> None:
+    adapter = openai_adapter_module.OpenAIAdapter("key", "model")
+
+    with usage.metered() as meter:
+        adapter.run_completion("s", "u", dtos.LLMResponse)
+        await adapter.run_completion_async("s", "u", dtos.LLMResponse)
+
+    assert (meter.prompt_tokens, meter.completion_tokens, meter.total_tokens) == (240, 60, 300)
+
+
+def test_openai_adapter_sends_the_schema_built_once() -> None:
+    adapter = openai_adapter_module.OpenAIAdapter("key", "model")
+
+    adapter.run_completion("s", "u", dtos.LLMResponse)
+    adapter.run_completion("s", "u", dtos.LLMResponse)
+
+    first, second = adapter._client.chat.completions.response_formats  # pylint: disable=protected-access
+    assert first is second is openai_adapter_module.response_format(dtos.LLMResponse)
+    assert first["type"] == "json_schema" and first["json_schema"]["strict"] is True
+
+
+class _Owner(pydantic.BaseModel):
+    name: str
+    email: str | None = None
+
+
+class _Nested(pydantic.BaseModel):
+    title: str
+    owners: list[_Owner]
+
+
+def test_response_format_is_strict_at_every_level() -> None:
+    assert openai_adapter_module.response_format(dtos.LLMResponse)["json_schema"] == {  # type: ignore[typeddict-item]
+        "name": "LLMResponse",
+        "strict": True,
+        "schema": {
+            "properties": {
+                "summary": {"title": "Summary", "type": "string"},
+                "action_items": {"items": {"type": "string"}, "title": "Action Items", "type": "array"},
+            },
+            "required": ["summary", "action_items"],
+            "title": "LLMResponse",
+            "type": "object",
+            "additionalProperties": False,
+        },
+    }
+    schema: dict[str, Any] = openai_adapter_module.response_format(_Nested)["json_schema"]["schema"]  # type: ignore[typeddict-item]
+    owner = schema["$defs"]["_Owner"]
+    assert schema["additionalProperties"] is False and owner["additionalProperties"] is False
+    assert owner["required"] == ["name", "email"] and "default" not in owner["properties"]["email"]
+    assert {"type": "null"} in owner["properties"]["email"]["anyOf"]
+
+
+@pytest.mark.parametrize(
+    "completion, expected", [(_DummyCompletion(refusal="I can't help with that"), None), (_DummyCompletion(content=None), None)]
+)
+def test_openai_adapter_refusals_return_none(monkeypatch: pytest.MonkeyPatch, completion: _DummyCompletion, expected: None) -> None:
+    adapter = openai_adapter_module.OpenAIAdapter("key", "model")
+    monkeypatch.setattr(adapter._client.chat.completions, "create", lambda **kwargs: completion)  # pylint: disable=protected-access
+
+    assert adapter.run_completion("s", "u", dtos.LLMResponse) is expected
+
+
+def test_openai_adapter_rejects_output_off_schema(monkeypatch: pytest.MonkeyPatch) -> None:
+    adapter = openai_adapter_module.OpenAIAdapter("key", "model")
+    monkeypatch.setattr(
+        adapter._client.chat.completions,
+        "create",
+        lambda **kwargs: _DummyCompletion(content='{"summary": 1}'),  # pylint: disable=protected-access
+    )
+
+    with pytest.raises(errors.LLMError, match="schema"):
+        adapter.run_completion("s", "u", dtos.LLMResponse)
+
+
+def test_client_options_configure_the_pool() -> None:
+    options = openai_adapter_module.ClientOptions(max_connections=8, max_keepalive_connections=4, timeout=30.0, connect_timeout=2.0)
+
+    kwargs = options.client_kwargs()
+
+    assert kwargs["limits"] == httpx.Limits(max_connections=8, max_keepalive_connections=4, keepalive_expiry=30.0)
+    assert kwargs["timeout"] == httpx.Timeout(30.0, connect=2.0)
+    assert kwargs["http2"] is False
+
+
+@pytest.mark.asyncio
+async def test_openai_adapter_clients_are_lazy_shared_and_closed() -> None:
+    adapter = openai_adapter_module.OpenAIAdapter("key", "model", options=openai_adapter_module.ClientOptions(warmup_connections=3))
+    assert adapter._sync_client is None and adapter._async_client is None  # pylint: disable=protected-access
+
+    await adapter.astart()
+    aclient = adapter._aclient  # pylint: disable=protected-access
+    assert aclient is adapter._aclient and aclient.models.retrieved == 3  # pylint: disable=protected-access
+    adapter.run_completion("s", "u", dtos.LLMResponse)
+    sync_client = adapter._client  # pylint: disable=protected-access
+
+    await adapter.aclose()
+
+    assert aclient.closed and sync_client.closed
+    assert adapter._aclient is not aclient  # pylint: disable=protected-access
+    await adapter.aclose()
+
+
+@pytest.mark.asyncio
+async def test_openai_adapter_warmup_failures_are_not_fatal(monkeypatch: pytest.MonkeyPatch) -> None:
+    adapter = openai_adapter_module.OpenAIAdapter("key", "model", options=openai_adapter_module.ClientOptions(warmup_connections=2))
+    monkeypatch.setattr(adapter._aclient, "models", _Models(fail=True))  # pylint: disable=protected-access
+
+    await adapter.astart()
+
+    assert adapter._aclient.models.retrieved == 2  # pylint: disable=protected-access
+    await adapter.aclose()
+
+
+def _status_error(cls: type[openai.APIStatusError], status: int, headers: dict[str, str] | None = None) -> openai.APIStatusError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status, request=request, headers=headers)
+    return cls("upstream", response=response, body=None)
+
+
+@pytest.mark.parametrize(
+    "exc, expected, retry_after",
+    [
+        (_status_error(openai.RateLimitError, 429, {"retry-after": "2"}), errors.RetryableLLMError, 2.0),
+        (_status_error(openai.InternalServerError, 503, {"retry-after": "soon"}), errors.RetryableLLMError, None),
+        (_status_error(openai.APIStatusError, 520), errors.RetryableLLMError, None),
+        (openai.APITimeoutError(httpx.Request("POST", "https://api.openai.com")), errors.RetryableLLMError, None),
+        (_status_error(openai.BadRequestError, 400), errors.LLMError, None),
+        (openai.OpenAIError("no key"), errors.LLMError, None),
+    ],
+)
+def test_openai_adapter_translates_errors(
+    monkeypatch: pytest.MonkeyPatch, exc: Exception, expected: type, retry_after: float | None
+) -> None:
+    def _raise(**kwargs: Any):
+        raise exc
+
+    adapter = openai_adapter_module.OpenAIAdapter("key", "model")
+    monkeypatch.setattr(adapter._client.chat.completions, "create", _raise)  # pylint: disable=protected-access
+
+    with pytest.raises(expected) as info:
+        adapter.run_completion("s", "u", dtos.LLMResponse)
+
+    assert type(info.value) is expected
+    assert getattr(info.value, "retry_after", None) == retry_after
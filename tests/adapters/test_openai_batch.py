@@ -0,0 +1,141 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+import pytest
+
+from app.adapters import openai as openai_adapter_module
+from app.domain import dtos, errors
+
+
+def _completion(content: str | None, refusal: str | None = None) -> dict[str, Any]:
+    return {
+        "status_code": 200,
+        "body": {
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content, "refusal": refusal}}],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120},
+        },
+    }
+
+
+class StandInBatchAPI(BaseHTTPRequestHandler):
+    """Just enough of the Files and Batches endpoints for the SDK to submit, poll and download a batch."""
+
+    state: dict[str, Any]
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        pass
+
+    def _reply(self, payload: Any, raw: bytes | None = None) -> None:
+        body = raw if raw is not None else json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream" if raw is not None else "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _batch(self) -> dict[str, Any]:
+        finished = self.state["polls"] >= 2
+        return {
+            "id": "batch_1",
+            "object": "batch",
+            "endpoint": "/v1/chat/completions",
+            "input_file_id": "file_in",
+            "completion_window": "24h",
+            "created_at": 0,
+            "status": "completed" if finished else "in_progress",
+            "output_file_id": "file_out" if finished else None,
+            "error_file_id": "file_err" if finished else None,
+            "request_counts": {"total": len(self.state["requests"]), "completed": 2 if finished else 0, "failed": 1 if finished else 0},
+        }
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.path == "/v1/files":
+            # Multipart upload: the JSONL lines are the only ones starting with a custom_id object.
+            self.state["requests"] = [json.loads(line) for line in re.findall(rb'^\{"custom_id".*$', body, re.M)]
+            self._reply(
+                {"id": "file_in", "object": "file", "bytes": len(body), "created_at": 0, "filename": "batch.jsonl", "purpose": "batch"}
+            )
+        else:
+            self.state["batch_request"] = json.loads(body)
+            self._reply(self._batch())
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        if self.path == "/v1/batches/batch_1":
+            self.state["polls"] += 1
+            self._reply(self._batch())
+        elif self.path == "/v1/files/file_out/content":
+            ok, refused, _ = self.state["requests"]
+            lines = [
+                {"custom_id": ok["custom_id"], "response": _completion(json.dumps({"summary": "s", "action_items": ["a"]})), "error": None},
+                {"custom_id": refused["custom_id"], "response": _completion(None, refusal="no"), "error": None},
+            ]
+            self._reply(None, raw="\n".join(json.dumps(line) for line in lines).encode())
+        elif self.path == "/v1/files/file_err/content":
+            failed = self.state["requests"][2]
+            line = {
+                "custom_id": failed["custom_id"],
+                "response": {"status_code": 500, "body": {"error": {"message": "overloaded"}}},
+                "error": None,
+            }
+            self._reply(None, raw=json.dumps(line).encode())
+        else:
+            self.send_error(404)
+
+
+@pytest.fixture()
+def stand_in() -> Iterator[tuple[str, dict[str, Any]]]:
+    state: dict[str, Any] = {"polls": 0, "requests": []}
+    handler = type("Handler", (StandInBatchAPI,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/v1", state
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_batch_adapter_round_trip_against_stand_in_server(stand_in: tuple[str, dict[str, Any]]) -> None:
+    base_url, state = stand_in
+    adapter = openai_adapter_module.OpenAIBatchAdapter("key", "model", base_url=base_url)
+
+    batch_id = adapter.submit("system", {"0": "first", "1": "second", "2": "third"}, dtos.LLMResponse)
+
+    assert batch_id == "batch_1"
+    assert state["batch_request"]["endpoint"] == "/v1/chat/completions"
+    request = state["requests"][0]
+    assert request["custom_id"] == "0" and request["url"] == "/v1/chat/completions"
+    assert request["body"]["messages"][1] == {"role": "user", "content": "first"}
+    assert request["body"]["response_format"]["json_schema"]["schema"]["required"] == ["summary", "action_items"]
+
+    pending = adapter.status(batch_id)
+    assert (pending.status, pending.finished, pending.total) == ("in_progress", False, 3)
+    assert adapter.status(batch_id).finished
+
+    outcomes = adapter.results(batch_id, dtos.LLMResponse)
+    summary, spent = outcomes["0"]
+    assert summary == dtos.LLMResponse(summary="s", action_items=["a"])
+    assert spent.total_tokens == 120
+    assert type(outcomes["1"][0]) is errors.LLMError
+    assert isinstance(outcomes["2"][0], errors.RetryableLLMError) and "overloaded" in str(outcomes["2"][0])
+
+
+def test_batch_adapter_translates_provider_errors(stand_in: tuple[str, dict[str, Any]]) -> None:
+    adapter = openai_adapter_module.OpenAIBatchAdapter("key", "model", base_url=stand_in[0])
+
+    with pytest.raises(errors.LLMError):
+        adapter.status("missing")
+
+
+def test_parse_batch_item_rejects_output_off_schema() -> None:
+    item = {"custom_id": "0", "response": _completion('{"summary": 1}'), "error": None}
+
+    outcome, spent = openai_adapter_module._parse_batch_item(item, dtos.LLMResponse)  # pylint: disable=protected-access
+
+    assert isinstance(outcome, errors.LLMError) and "schema" in str(outcome)
+    assert spent.prompt_tokens == 100
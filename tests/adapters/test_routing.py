@@ -0,0 +1,182 @@
+import asyncio
+
+import pytest
+
+from app import ports
+from app.adapters import routing
+from app.domain import dtos, errors, tokens, usage
+from app.services import scheduler
+
+
+class ScriptedLLM(ports.LLm):
+    """Answers with its own name after the next scripted delay (the last one repeats); can be told to fail."""
+
+    def __init__(self, name: str, delays: list[float], fail: bool = False) -> None:
+        self.name = name
+        self.calls = 0
+        self.cancelled = 0
+        self.lifecycle: list[str] = []
+        self._delays = delays
+        self._fail = fail
+
+    def run_completion(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        self.calls += 1
+        return dto(summary=self.name, action_items=[])  # type: ignore[call-arg]
+
+    async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        delay = self._delays[min(self.calls, len(self._delays) - 1)]
+        self.calls += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self._fail:
+            raise errors.RetryableLLMError(f"{self.name} failed")
+        return dto(summary=self.name, action_items=[])  # type: ignore[call-arg]
+
+    async def astart(self) -> None:
+        self.lifecycle.append("start")
+
+    async def aclose(self) -> None:
+        self.lifecycle.append("close")
+
+
+async def _summary(llm: routing.RoutingLLM, user_prompt: str = "u") -> str:
+    result = await llm.run_completion_async("s", user_prompt, dtos.LLMResponse)
+    return result.summary  # type: ignore[union-attr]
+
+
+@pytest.mark.asyncio
+async def test_routes_by_estimated_prompt_tokens() -> None:
+    small, large = ScriptedLLM("small", [0]), ScriptedLLM("large", [0])
+    llm = routing.RoutingLLM([routing.Route("large", large), routing.Route("small", small, max_prompt_tokens=10)])
+
+    assert await _summary(llm, "short") == "small"
+    assert await _summary(llm, "x" * 100) == "large"
+    assert llm.run_completion("s", "x" * 100, dtos.LLMResponse).summary == "large"  # type: ignore[union-attr]
+
+    stats = llm.stats()
+    assert [(route.name, route.calls) for route in stats.routes] == [("small", 1), ("large", 2)]
+    assert stats.hedge is None and stats.routes[0].hedge_after_seconds is None
+
+
+@pytest.mark.asyncio
+async def test_hedges_slow_calls_after_the_route_percentile_and_cancels_the_loser() -> None:
+    # Five quick calls set the threshold; the sixth stalls and the hedge answers first.
+    primary, secondary = ScriptedLLM("primary", [0.01] * 5 + [5.0]), ScriptedLLM("hedge", [0.01])
+    llm = routing.RoutingLLM([routing.Route("default", primary)], routing.Route("hedge", secondary), min_samples=5, max_hedge_fraction=0.5)
+
+    assert [await _summary(llm) for _ in range(5)] == ["primary"] * 5
+    assert secondary.calls == 0
+    threshold = llm.stats().routes[0].hedge_after_seconds
+    assert threshold is not None and threshold < 1
+
+    assert await _summary(llm) == "hedge"
+    await asyncio.sleep(0)
+    assert primary.cancelled == 1
+
+    stats = llm.stats()
+    assert (stats.routes[0].hedged, stats.routes[0].hedge_wins) == (1, 1)
+    assert stats.hedge is not None and stats.hedge.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_failure_falls_back_to_the_primary() -> None:
+    primary, secondary = ScriptedLLM("primary", [0.01] * 2 + [0.2]), ScriptedLLM("hedge", [0], fail=True)
+    llm = routing.RoutingLLM([routing.Route("default", primary)], routing.Route("hedge", secondary), min_samples=2, max_hedge_fraction=1)
+
+    await _summary(llm)
+    await _summary(llm)
+
+    assert await _summary(llm) == "primary"
+    assert secondary.calls == 1
+    stats = llm.stats()
+    assert (stats.routes[0].hedged, stats.routes[0].hedge_wins) == (1, 0)
+    assert stats.hedge is not None and stats.hedge.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_both_failing_raises_the_primary_error() -> None:
+    primary = ScriptedLLM("primary", [0.01] * 2 + [0.1], fail=False)
+    llm = routing.RoutingLLM(
+        [routing.Route("default", primary)],
+        routing.Route("hedge", ScriptedLLM("hedge", [0], fail=True)),
+        min_samples=2,
+        max_hedge_fraction=1,
+    )
+    await _summary(llm)
+    await _summary(llm)
+    primary._fail = True  # pylint: disable=protected-access
+
+    with pytest.raises(errors.RetryableLLMError, match="primary failed"):
+        await _summary(llm)
+
+
+@pytest.mark.asyncio
+async def test_hedge_fraction_caps_extra_calls() -> None:
+    primary, secondary = ScriptedLLM("primary", [0.01] * 4 + [0.1]), ScriptedLLM("hedge", [0])
+    llm = routing.RoutingLLM(
+        [routing.Route("default", primary)], routing.Route("hedge", secondary), hedge_percentile=0.5, min_samples=4, max_hedge_fraction=0.25
+    )
+
+    for _ in range(8):
+        await _summary(llm)
+
+    # Calls 5 to 8 are all slow, but 8 calls at 25% allow only 2 hedges.
+    assert secondary.calls == 2
+    assert llm.stats().routes[0].hedged == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_caller_cancels_both_calls() -> None:
+    primary, secondary = ScriptedLLM("primary", [0.01] * 2 + [5.0]), ScriptedLLM("hedge", [5.0])
+    llm = routing.RoutingLLM([routing.Route("default", primary)], routing.Route("hedge", secondary), min_samples=2, max_hedge_fraction=1)
+    await _summary(llm)
+    await _summary(llm)
+
+    task = asyncio.ensure_future(_summary(llm))
+    await asyncio.sleep(0.1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert (primary.cancelled, secondary.cancelled) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_hedges_are_admitted_by_the_scheduler_and_losers_are_charged() -> None:
+    primary, secondary = ScriptedLLM("primary", [0.01] * 2 + [5.0]), ScriptedLLM("hedge", [0.01])
+    limits = scheduler.RateLimitedScheduler(max_concurrency=4)
+    llm = routing.RoutingLLM(
+        [routing.Route("default", primary)], routing.Route("hedge", secondary), min_samples=2, max_hedge_fraction=1, hedge_slot=limits.slot
+    )
+    await _summary(llm)
+    await _summary(llm)
+
+    with usage.metered() as meter:
+        assert await _summary(llm) == "hedge"
+        await asyncio.sleep(0)
+
+    assert limits.stats().admitted == 1  # the hedge; primaries are admitted by the caller
+    assert primary.cancelled == 1 and meter.prompt_tokens == tokens.estimate_tokens("s", "u")
+
+
+@pytest.mark.asyncio
+async def test_lifecycle_reaches_every_route() -> None:
+    clients = [ScriptedLLM("a", [0]), ScriptedLLM("b", [0]), ScriptedLLM("hedge", [0])]
+    llm = routing.RoutingLLM(
+        [routing.Route("a", clients[0]), routing.Route("b", clients[1], max_prompt_tokens=5)], routing.Route("hedge", clients[2])
+    )
+
+    await llm.astart()
+    await llm.aclose()
+
+    assert all(client.lifecycle == ["start", "close"] for client in clients)
+
+
+def test_rejects_empty_or_duplicate_routes() -> None:
+    with pytest.raises(ValueError):
+        routing.RoutingLLM([])
+    with pytest.raises(ValueError, match="unique"):
+        routing.RoutingLLM([routing.Route("a", ScriptedLLM("a", [0]))], routing.Route("a", ScriptedLLM("b", [0])))
@@ -0,0 +1,35 @@
+from app.adapters import search
+
+
+def test_terms_lowercase_and_drop_stopwords() -> None:
+    assert search.terms("Raise the Test-Coverage to 80%, won't_we?") == ["raise", "test", "coverage", "80", "won", "t"]
+
+
+def test_term_counts_cover_summary_and_action_items() -> None:
+    counts = search.term_counts({"summary": "Coverage talk", "action_items": ["raise coverage"], "id": "x"})
+    assert counts == {"coverage": 2, "talk": 1, "raise": 1}
+    assert search.term_counts({}) == {}
+
+
+def test_index_ranks_matches_containing_every_term() -> None:
+    index = search.InvertedIndex()
+    index.add("both-often", {"test": 3, "coverage": 2})
+    index.add("both-once", {"test": 1, "coverage": 1, "docs": 6})
+    index.add("test-only", {"test": 1})
+
+    assert index.search("test coverage", limit=10) == ["both-often", "both-once"]
+    assert index.search("test coverage", limit=1, offset=1) == ["both-once"]
+    assert index.search("missing", limit=10) == []
+    assert index.search("the", limit=10) == []
+
+
+def test_index_remove_cleans_postings_without_the_document() -> None:
+    index = search.InvertedIndex()
+    added = index.add("a", {"test": 1, "docs": 2})
+    assert added > 0 and index.remove("a") == added
+    assert index.remove("a") == 0  # already gone
+
+    assert index.search("test", limit=10) == [] and index.search("docs", limit=10) == []
+    index.add("b", {"docs": 1})
+    index.add("b", {"test": 1})  # re-indexing replaces the earlier terms
+    assert index.search("docs", limit=10) == [] and index.search("test", limit=10) == ["b"]
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.adapters import singleflight
+from app.domain import dtos
+
+
+class SlowLLM:
+    def __init__(self, delay: float = 0.05, fail: bool = False) -> None:
+        self.calls = 0
+        self._delay = delay
+        self._fail = fail
+
+    def run_completion(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        self.calls += 1
+        time.sleep(self._delay)
+        if self._fail:
+            raise RuntimeError("boom")
+        return dto(summary=user_prompt, action_items=[])  # type: ignore[call-arg]
+
+    async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        self.calls += 1
+        await asyncio.sleep(self._delay)
+        if self._fail:
+            raise RuntimeError("boom")
+        return dto(summary=user_prompt, action_items=[])  # type: ignore[call-arg]
+
+
+@pytest.mark.asyncio
+async def test_singleflight_coalesces_async_callers() -> None:
+    inner = SlowLLM()
+    llm = singleflight.SingleFlightLLM(inner)
+
+    results = await asyncio.gather(*[llm.run_completion_async("s", "u", dtos.LLMResponse) for _ in range(5)])
+    other = await llm.run_completion_async("s", "other", dtos.LLMResponse)
+
+    assert inner.calls == 2
+    assert all(r.summary == "u" for r in results)
+    assert other.summary == "other"
+    assert llm.inflight() == 0
+
+
+def test_singleflight_coalesces_sync_callers() -> None:
+    inner = SlowLLM()
+    llm = singleflight.SingleFlightLLM(inner)
+    results: list = []
+
+    threads = [threading.Thread(target=lambda: results.append(llm.run_completion("s", "u", dtos.LLMResponse))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert inner.calls == 1
+    assert len(results) == 5
+
+
+@pytest.mark.asyncio
+async def test_singleflight_shares_between_sync_and_async_paths() -> None:
+    inner = SlowLLM()
+    llm = singleflight.SingleFlightLLM(inner)
+
+    sync_call = asyncio.to_thread(llm.run_completion, "s", "u", dtos.LLMResponse)
+    async_call = llm.run_completion_async("s", "u", dtos.LLMResponse)
+    results = await asyncio.gather(sync_call, async_call)
+
+    assert inner.calls == 1
+    assert results[0].summary == results[1].summary == "u"
+
+
+@pytest.mark.asyncio
+async def test_singleflight_propagates_errors_to_followers() -> None:
+    inner = SlowLLM(fail=True)
+    llm = singleflight.SingleFlightLLM(inner)
+
+    results = await asyncio.gather(*[llm.run_completion_async("s", "u", dtos.LLMResponse) for _ in range(3)], return_exceptions=True)
+
+    assert inner.calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+    with pytest.raises(RuntimeError):
+        llm.run_completion("s", "u", dtos.LLMResponse)
+    assert llm.inflight() == 0
+
+
+@pytest.mark.asyncio
+async def test_singleflight_follower_takes_over_from_a_cancelled_leader() -> None:
+    inner = SlowLLM()
+    llm = singleflight.SingleFlightLLM(inner)
+
+    leader = asyncio.create_task(llm.run_completion_async("s", "u", dtos.LLMResponse))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(llm.run_completion_async("s", "u", dtos.LLMResponse))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert (await follower).summary == "u"
+    assert leader.cancelled()
+    assert inner.calls == 2
+    assert llm.inflight() == 0
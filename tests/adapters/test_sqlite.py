@@ -0,0 +1,139 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.adapters import sqlite
+
+
+@pytest.fixture()
+def database(tmp_path):
+    db = sqlite.SQLiteDB(str(tmp_path / "records.db"), pool_size=2)
+    yield db
+    db.close()
+
+
+def test_sqlite_crud_sync_basic(database: sqlite.SQLiteDB) -> None:
+    created = database.create({"a": 1, "items": ["x"]})
+    assert "id" in created and created["a"] == 1
+
+    assert database.get(created["id"]) == created
+
+    updated = database.update(created["id"], {"a": 2, "id": "ignored"})
+    assert updated == {"a": 2, "items": ["x"], "id": created["id"]}
+    assert database.get(created["id"]) == updated
+
+    assert database.update("missing", {"a": 3}) is None
+    assert database.get("missing") is None
+
+    assert database.delete(created["id"]) is True
+    assert database.delete("missing") is False
+    assert database.all() == []
+
+
+@pytest.mark.asyncio
+async def test_sqlite_crud_async_basic(database: sqlite.SQLiteDB) -> None:
+    created = await database.acreate({"a": 1})
+
+    assert await database.aget(created["id"]) == created
+    assert (await database.aupdate(created["id"], {"a": 2}))["a"] == 2
+    assert await database.aupdate("missing", {"a": 3}) is None
+    assert len(await database.aall()) == 1
+    assert await database.adelete(created["id"]) is True
+    assert await database.adelete("missing") is False
+
+
+@pytest.mark.asyncio
+async def test_sqlite_bulk_acreate_is_one_transaction(database: sqlite.SQLiteDB) -> None:
+    results = await database.bulk_acreate([{"n": i} for i in range(3)])
+
+    assert len({r["id"] for r in results}) == 3
+    assert [r["n"] for r in database.all()] == [0, 1, 2]
+
+    with pytest.raises(TypeError):
+        await database.bulk_acreate([{"n": 3}, {"bad": object()}, {"n": 4}])  # not JSON serializable
+    assert len(database.all()) == 3
+
+
+@pytest.mark.asyncio
+async def test_sqlite_bulk_acreate_once_stores_a_key_once_across_processes(database: sqlite.SQLiteDB, tmp_path) -> None:
+    other = sqlite.SQLiteDB(str(tmp_path / "records.db"), pool_size=1)  # another worker on the same file
+    try:
+        first, second = await asyncio.gather(
+            database.bulk_acreate_once("k", [{"n": 0}, {"n": 1}]), other.bulk_acreate_once("k", [{"n": 0}, {"n": 1}])
+        )
+    finally:
+        other.close()
+
+    assert first == second
+    assert [r["id"] for r in database.all()] == first
+
+
+def test_sqlite_rolls_back_failed_transactions(database: sqlite.SQLiteDB, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sqlite.uuid, "uuid4", lambda: "duplicate-id")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        database.create({"a": 1}) and database.create({"a": 2})
+
+    assert len(database.all()) == 1
+
+
+def test_sqlite_is_shared_between_instances(tmp_path) -> None:
+    path = str(tmp_path / "shared.db")
+    worker_a, worker_b = sqlite.SQLiteDB(path), sqlite.SQLiteDB(path)
+
+    created = worker_a.create({"summary": "s"})
+
+    assert worker_b.get(created["id"]) == created
+    worker_a.close()
+    worker_b.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_pages_in_creation_order(database: sqlite.SQLiteDB) -> None:
+    ids = [r["id"] for r in await database.bulk_acreate([{"n": i} for i in range(5)])]
+    database.delete(ids[2])
+
+    first, cursor = await database.apage(None, 2)
+    rest, end = await database.apage(cursor, 10)
+
+    assert [r["id"] for r in first] == ids[:2]
+    assert [r["id"] for r in rest] == ids[3:] and end is None
+    assert [r["id"] async for r in database.aiter_records(batch_size=2)] == [ids[0], ids[1], ids[3], ids[4]]
+    for cursor in ("x", "-1", str(2**63)):  # the last would overflow SQLite's INTEGER
+        with pytest.raises(ValueError):
+            database.page(cursor, 2)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_search_is_maintained_by_triggers(database: sqlite.SQLiteDB) -> None:
+    coverage = await database.acreate({"summary": "Team sync", "action_items": ["Raise test coverage"]})
+    other = await database.acreate({"summary": "Test coverage review", "action_items": ["Add coverage gates"]})
+    await database.acreate({"summary": "Hiring plan", "action_items": []})
+
+    found, end = await database.asearch("test coverage", None, 10)
+    assert {r["id"] for r in found} == {coverage["id"], other["id"]} and end is None
+    first, cursor = database.search("coverage", None, 1)
+    assert len(first) == 1 and database.search("coverage", cursor, 1)[1] is None
+
+    database.update(coverage["id"], {"action_items": ["Write docs"]})
+    database.delete(other["id"])
+    assert database.search("coverage", None, 10) == ([], None)
+    assert [r["id"] for r in database.search("docs", None, 10)[0]] == [coverage["id"]]
+    assert database.search('the "', None, 10) == ([], None)
+    for cursor in ("-5", str(2**63)):
+        with pytest.raises(ValueError):
+            database.search("docs", cursor, 10)
+
+
+def test_sqlite_search_backfills_existing_rows(tmp_path) -> None:
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute(sqlite._SCHEMA)  # pylint: disable=protected-access
+    conn.execute("INSERT INTO records (id, data) VALUES ('old', ?)", ('{"summary": "legacy coverage", "action_items": []}',))
+    conn.commit()
+    conn.close()
+
+    database = sqlite.SQLiteDB(path, pool_size=1)
+    assert [r["id"] for r in database.search("coverage", None, 10)[0]] == ["old"]
+    database.close()
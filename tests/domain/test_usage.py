@@ -0,0 +1,38 @@
+import asyncio
+import concurrent.futures
+import contextvars
+
+import pytest
+
+from app.domain import usage
+
+
+def test_record_outside_a_meter_is_ignored() -> None:
+    usage.record(10, 5)  # must not raise
+
+
+def test_nested_meters_all_see_inner_usage() -> None:
+    with usage.metered() as outer:
+        usage.record(10, 1)
+        with usage.metered() as inner:
+            usage.record(5, 2)
+        usage.record(1, 1)
+
+    assert (inner.prompt_tokens, inner.completion_tokens) == (5, 2)
+    assert (outer.prompt_tokens, outer.completion_tokens, outer.total_tokens) == (16, 4, 20)
+    assert outer.usage().model_dump() == {"prompt_tokens": 16, "completion_tokens": 4, "total_tokens": 20}
+
+
+@pytest.mark.asyncio
+async def test_meter_follows_work_into_tasks_and_threads() -> None:
+    async def call() -> None:
+        await asyncio.sleep(0)
+        usage.record(3, 1)
+
+    with usage.metered() as meter:
+        await asyncio.gather(*[call() for _ in range(4)])
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+            for future in [pool.submit(contextvars.copy_context().run, usage.record, 2, 2) for _ in range(8)]:
+                future.result()
+
+    assert (meter.prompt_tokens, meter.completion_tokens) == (28, 20)
@@ -40,6 +40,11 @@ class DummyManager(manager_port.Manager):
         super().summarize(text)
         return None
 
+    async def asummarize_transcript(self, text):  # type: ignore[override]
+        # Exercise base abstract 'pass' line
+        await super().asummarize_transcript(text)
+        return None
+
     async def asummarize(self, documents):  # type: ignore[override]
         # Exercise base abstract 'pass' line
         await super().asummarize(documents)
@@ -54,6 +59,7 @@ def test_manager_abstract_methods_via_super():
 @pytest.mark.asyncio
 async def test_manager_async_abstract_methods_via_super():
     mgr = DummyManager()
+    assert await mgr.asummarize_transcript(object()) is None
     assert await mgr.asummarize(object()) is None
 
 
@@ -74,12 +80,21 @@ class DummyRepository(repository_port.Repository):
     def all(self):  # type: ignore[override]
         return super().all()
 
+    def page(self, cursor, limit):  # type: ignore[override]
+        return super().page(cursor, limit)
+
+    def search(self, query, cursor, limit):  # type: ignore[override]
+        return super().search(query, cursor, limit)
+
     async def acreate(self, data):  # type: ignore[override]
         return await super().acreate(data)
 
     async def bulk_acreate(self, data):  # type: ignore[override]
         return await super().bulk_acreate(data)
 
+    async def bulk_acreate_once(self, key, data):  # type: ignore[override]
+        return await super().bulk_acreate_once(key, data)
+
     async def aget(self, obj_id):  # type: ignore[override]
         return await super().aget(obj_id)
 
@@ -92,6 +107,12 @@ class DummyRepository(repository_port.Repository):
     async def aall(self):  # type: ignore[override]
         return await super().aall()
 
+    async def apage(self, cursor, limit):  # type: ignore[override]
+        return await super().apage(cursor, limit)
+
+    async def asearch(self, query, cursor, limit):  # type: ignore[override]
+        return await super().asearch(query, cursor, limit)
+
 
 def test_repository_sync_abstract_methods_raise_notimplemented():
     repo = DummyRepository()
@@ -105,6 +126,10 @@ def test_repository_sync_abstract_methods_raise_notimplemented():
         repo.delete("1")
     with pytest.raises(NotImplementedError):
         repo.all()
+    with pytest.raises(NotImplementedError):
+        repo.page(None, 1)
+    with pytest.raises(NotImplementedError):
+        repo.search("q", None, 1)
 
 
 @pytest.mark.asyncio
@@ -114,6 +139,8 @@ async def test_repository_async_abstract_methods_raise_notimplemented():
         await repo.acreate({})
     with pytest.raises(NotImplementedError):
         await repo.bulk_acreate([])
+    with pytest.raises(NotImplementedError):
+        await repo.bulk_acreate_once("k", [])
     with pytest.raises(NotImplementedError):
         await repo.aget("1")
     with pytest.raises(NotImplementedError):
@@ -122,3 +149,7 @@ async def test_repository_async_abstract_methods_raise_notimplemented():
         await repo.adelete("1")
     with pytest.raises(NotImplementedError):
         await repo.aall()
+    with pytest.raises(NotImplementedError):
+        await repo.apage(None, 1)
+    with pytest.raises(NotImplementedError):
+        await repo.asearch("q", None, 1)
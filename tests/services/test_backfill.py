@@ -0,0 +1,97 @@
+import asyncio
+from typing import Mapping
+
+import pydantic
+import pytest
+
+from app.adapters import db as db_module
+from app.domain import dtos, errors
+from app.ports import batch
+from app.services import backfill, preprocess
+
+
+class FakeBatchLLM(batch.BatchLLm):
+    def __init__(self, polls_until_done: int = 1) -> None:
+        self.prompts: dict[str, str] = {}
+        self.polls = 0
+        self.fetches = 0
+        self._polls_until_done = polls_until_done
+
+    def submit(self, system_prompt: str, user_prompts: Mapping[str, str], dto: type[pydantic.BaseModel]) -> str:
+        self.prompts = dict(user_prompts)
+        return "batch_1"
+
+    def status(self, batch_id: str) -> dtos.BackfillStatus:
+        self.polls += 1
+        done = self.polls >= self._polls_until_done
+        return dtos.BackfillStatus(id=batch_id, status="completed" if done else "in_progress", finished=done, total=len(self.prompts))
+
+    def results(self, batch_id: str, dto: type[pydantic.BaseModel]) -> dict[str, batch.Outcome]:
+        self.fetches += 1
+        spent = dtos.TokenUsage(prompt_tokens=10, completion_tokens=2, total_tokens=12)
+        # Item 1 failed upstream and item 2 never ran.
+        return {"0": (dto(summary="s0", action_items=[]), spent), "1": (errors.LLMError("bad request"), spent)}  # type: ignore[call-arg]
+
+
+@pytest.fixture()
+def fresh_db(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(db_module, "database", db_module.DB(), raising=True)
+    return db_module.database
+
+
+DOCS = dtos.Transcripts(transcripts=[dtos.Transcript(text=t) for t in ("first", "second", "third")])
+
+
+@pytest.mark.asyncio
+async def test_backfill_stores_results_once_when_finished(fresh_db) -> None:  # type: ignore[no-redef]
+    client = FakeBatchLLM(polls_until_done=2)
+    service = backfill.BackfillService(client)
+
+    submitted = await service.asubmit(DOCS)
+    assert (submitted.id, submitted.total, submitted.finished) == ("batch_1", 3, False)
+    assert "first" in client.prompts["0"] and "Transcript(" not in client.prompts["0"]
+
+    assert not (await service.astatus("batch_1")).finished
+    done, again = await asyncio.gather(service.astatus("batch_1"), service.astatus("batch_1"))
+
+    assert done == again and client.fetches == 1
+    assert done.result_ids[1:] == [None, None]
+    assert [(e.index, e.retryable) for e in done.errors] == [(1, False), (2, True)]
+    stored = fresh_db.get(str(done.result_ids[0]))
+    assert stored["summary"] == "s0" and stored["usage"]["total_tokens"] == 12
+    assert len(fresh_db.all()) == 1
+
+
+@pytest.mark.asyncio
+async def test_backfill_is_stored_once_across_services_and_bounded(fresh_db, monkeypatch: pytest.MonkeyPatch) -> None:  # type: ignore[no-redef]
+    monkeypatch.setattr(backfill, "_COLLECTED_MAX", 1)
+    clients = [FakeBatchLLM(), FakeBatchLLM()]
+    services = [backfill.BackfillService(client) for client in clients]  # one per worker, sharing the store
+    for service in services:
+        await service.asubmit(DOCS)
+
+    first, second = [await service.astatus("batch_1") for service in services]
+
+    assert first == second and len(fresh_db.all()) == 1
+    await services[0].astatus("batch_2")  # pushes batch_1 out of the collected outcomes
+    assert await services[0].astatus("batch_1") == first
+    assert clients[0].fetches == 3 and len(fresh_db.all()) == 2  # batch_1 once, batch_2 once
+
+
+@pytest.mark.asyncio
+async def test_backfill_run_polls_until_finished(fresh_db) -> None:  # type: ignore[no-redef]
+    client = FakeBatchLLM(polls_until_done=3)
+
+    done = await backfill.BackfillService(client).arun(DOCS, poll_interval=0)
+
+    assert done.finished and client.polls == 3 and done.result_ids[0] is not None
+
+
+@pytest.mark.asyncio
+async def test_backfill_preprocesses_prompts(fresh_db) -> None:  # type: ignore[no-redef]
+    client = FakeBatchLLM()
+    service = backfill.BackfillService(client, preprocessor=preprocess.Preprocessor(["whitespace"]))
+
+    await service.asubmit(dtos.Transcripts(transcripts=[dtos.Transcript(text="Ana:   hi \n\n Bob: hello")]))
+
+    assert client.prompts["0"].endswith("Ana: hi\nBob: hello")
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.domain import dtos, errors, usage
+from app.services import budget
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_estimate_covers_prompts_and_expected_completion() -> None:
+    bare = budget.TokenBudget(0).estimate([dtos.Transcript(text="x" * 400)])
+    padded = budget.TokenBudget(0, completion_tokens=300).estimate([dtos.Transcript(text="x" * 400)] * 2)
+
+    assert bare > 100 and padded == 2 * (bare + 300)
+
+
+@pytest.mark.asyncio
+async def test_budget_rejects_until_spend_leaves_the_window() -> None:
+    clock = FakeClock()
+    tokens = budget.TokenBudget(1000, window_seconds=60, clock=clock)
+
+    async with tokens.admit("generate", 400):
+        usage.record(500, 100)
+    clock.now += 10
+    async with tokens.admit("generate", 300):
+        usage.record(250, 50)
+
+    clock.now += 1
+    assert tokens.retry_after(100) == 0.0
+    # 900 spent: 500 more only fit once the first 600 expire, 50s from now.
+    assert tokens.retry_after(500) == pytest.approx(49.0)
+    with pytest.raises(errors.TokenBudgetExceeded) as info:
+        async with tokens.admit("generate", 500):
+            pass
+    assert info.value.retry_after == pytest.approx(49.0)
+
+    clock.now += 49
+    assert tokens.retry_after(500) == 0.0
+    stats = tokens.stats()
+    assert (stats.spent_tokens, stats.reserved_tokens, stats.rejected) == (300, 0, 1)
+
+
+@pytest.mark.asyncio
+async def test_budget_reservations_block_a_burst_before_anything_is_billed() -> None:
+    tokens = budget.TokenBudget(1000, window_seconds=60, clock=FakeClock())
+
+    async with tokens.admit("batch_generate", 700):
+        assert tokens.stats().reserved_tokens == 700
+        assert tokens.retry_after(400) == 60
+        # Oversized requests still get through once nothing else is outstanding.
+        assert tokens.retry_after(5000) > 0
+    assert tokens.retry_after(5000) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_budget_wait_defers_instead_of_rejecting() -> None:
+    tokens = budget.TokenBudget(100, window_seconds=0.05)
+    async with tokens.admit("jobs", 100):
+        usage.record(100, 0)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    async with tokens.admit("jobs", 100, wait=True):
+        pass
+
+    assert loop.time() - start >= 0.03
+
+
+@pytest.mark.asyncio
+async def test_budget_counts_tokens_per_endpoint() -> None:
+    def counted(kind: str) -> float:
+        return REGISTRY.get_sample_value("llm_tokens_total", {"endpoint": "budget-test", "kind": kind}) or 0.0
+
+    before = counted("prompt"), counted("completion")
+    async with budget.TokenBudget(0).admit("budget-test", 10) as meter:
+        usage.record(7, 3)
+
+    assert meter.total_tokens == 10
+    assert (counted("prompt") - before[0], counted("completion") - before[1]) == (7, 3)
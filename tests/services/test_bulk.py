@@ -0,0 +1,172 @@
+import asyncio
+import dataclasses
+import json
+from pathlib import Path
+
+import pytest
+
+from app.adapters import db as db_module
+from app.domain import dtos, errors
+from app.services import bulk, controller, retry
+
+
+class FakeLLM:
+    """
+    Summarizes instantly; prompts containing ``bad`` fail, ``flaky`` ones fail retryably while ``flaky`` is set and,
+    while ``gate`` is set, ``slow`` ones wait for it.
+    """
+
+    def __init__(self, flaky: bool = False) -> None:
+        self.prompts: list[str] = []
+        self.gate: asyncio.Event | None = None
+        self.flaky = flaky
+
+    def run_completion(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        raise NotImplementedError
+
+    async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        self.prompts.append(user_prompt)
+        if self.gate and "slow" in user_prompt:
+            await self.gate.wait()
+        await asyncio.sleep(0)
+        if "bad" in user_prompt:
+            raise RuntimeError("bad")
+        if self.flaky and "flaky" in user_prompt:
+            raise errors.RetryableLLMError("429")
+        return dto(summary="s", action_items=[])  # type: ignore[call-arg]
+
+
+def _runner(llm: FakeLLM, source: Path, output: Path, **policy) -> bulk.BulkRunner:
+    ctl = controller.Controller(llm_client=llm, retry_policy=retry.RetryPolicy(max_attempts=1), repository=db_module.DB())  # type: ignore[arg-type]
+    return bulk.BulkRunner(ctl, source, output, bulk.BulkPolicy(**policy))
+
+
+def _written(output: Path) -> list[dtos.LLMStreamItem]:
+    return [dtos.LLMStreamItem.model_validate_json(line) for line in output.read_bytes().splitlines()]
+
+
+def _jsonl(path: Path, texts: list[str]) -> Path:
+    path.write_text("".join(json.dumps({"text": text}) + "\n" for text in texts))
+    return path
+
+
+@pytest.mark.asyncio
+async def test_run_writes_one_item_per_line_and_a_finished_checkpoint(tmp_path: Path) -> None:
+    source = tmp_path / "in.jsonl"
+    source.write_text('{"text": "Ana: one"}\n{"request_id": "r2", "body": "Bob: two"}\n\nnot json\n{"text": "bad"}')
+    llm, output = FakeLLM(), tmp_path / "out.jsonl"
+    reports: list[dtos.BulkProgress] = []
+
+    progress = await _runner(llm, source, output).run(reports.append, progress_seconds=0)
+
+    items = {item.index: item for item in _written(output)}
+    assert sorted(items) == [0, 1, 3, 4]  # the blank line is skipped
+    assert items[0].response and items[1].response
+    assert items[3].error and not items[3].error.retryable and "bad" in items[4].error.error  # type: ignore[union-attr]
+    assert len(llm.prompts) == 3
+    assert (progress.total, progress.completed, progress.failed, progress.resumed) == (5, 5, 2, 0)
+    assert reports and reports[-1].eta_seconds == 0
+    checkpoint = json.loads(output.with_name("out.jsonl.checkpoint").read_text())
+    assert (checkpoint["line"], checkpoint["offset"], checkpoint["done"]) == (5, source.stat().st_size, [])
+    assert checkpoint["output_offset"] == output.stat().st_size
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_finished_lines_and_drops_a_torn_one(tmp_path: Path) -> None:
+    texts = [f"Ana: line {n}" for n in range(6)]
+    source = _jsonl(tmp_path / "in.jsonl", texts)
+    output = tmp_path / "out.jsonl"
+    written = [dtos.LLMStreamItem(index=n).model_dump_json() + "\n" for n in (0, 1, 3)]
+    output.write_text("".join(written) + '{"index": 4, "resp')  # line 3 came after the checkpoint, line 4 was torn
+    checkpoint = bulk.Checkpoint(
+        input=str(source.resolve()),
+        line=2,
+        offset=len(json.dumps({"text": texts[0]})) + len(json.dumps({"text": texts[1]})) + 2,
+        output_offset=len(written[0]) + len(written[1]),
+    )
+    output.with_name("out.jsonl.checkpoint").write_text(json.dumps(dataclasses.asdict(checkpoint)))
+    llm = FakeLLM()
+
+    progress = await _runner(llm, source, output).run()
+
+    assert sorted(prompt.rsplit("line ", 1)[1][0] for prompt in llm.prompts) == ["2", "4", "5"]
+    assert sorted(item.index for item in _written(output)) == list(range(6))
+    assert (progress.resumed, progress.completed) == (3, 6)
+
+
+@pytest.mark.asyncio
+async def test_interrupted_run_resumes_where_it_stopped(tmp_path: Path) -> None:
+    source = _jsonl(tmp_path / "in.jsonl", ["Ana: zero", "Ana: slow one", "Ana: two", "Ana: three", "Ana: four"])
+    output = tmp_path / "out.jsonl"
+    llm = FakeLLM()
+    llm.gate = asyncio.Event()
+
+    run = asyncio.ensure_future(_runner(llm, source, output, concurrency=2, checkpoint_seconds=0).run())
+    while not output.exists() or len(_written(output)) < 4:  # everything but the slow line
+        await asyncio.sleep(0.01)
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run
+    checkpoint = json.loads(output.with_name("out.jsonl.checkpoint").read_text())
+    assert (checkpoint["line"], checkpoint["done"]) == (1, [2, 3, 4])
+
+    resumed = FakeLLM()
+    progress = await _runner(resumed, source, output).run()
+
+    assert len(resumed.prompts) == 1 and "slow one" in resumed.prompts[0]
+    assert sorted(item.index for item in _written(output)) == [0, 1, 2, 3, 4]
+    assert progress.completed == 5
+
+
+@pytest.mark.asyncio
+async def test_retryable_failures_are_left_for_the_next_run(tmp_path: Path) -> None:
+    source = _jsonl(tmp_path / "in.jsonl", ["Ana: flaky zero", "Ana: one", "Ana: flaky two", "bad", "Ana: four"])
+    output = tmp_path / "out.jsonl"
+
+    progress = await _runner(FakeLLM(flaky=True), source, output).run()
+
+    assert sorted(item.index for item in _written(output)) == [1, 3, 4]
+    assert (progress.completed, progress.failed, progress.retryable) == (3, 1, 2)
+    checkpoint = json.loads(output.with_name("out.jsonl.checkpoint").read_text())
+    offsets = [0, len(json.dumps({"text": "Ana: flaky zero"})) + len(json.dumps({"text": "Ana: one"})) + 2]
+    assert (checkpoint["line"], checkpoint["retry"]) == (5, [[0, offsets[0]], [2, offsets[1]]])
+
+    still = FakeLLM(flaky=True)
+    progress = await _runner(still, source, output).run()
+    assert len(still.prompts) == 2 and progress.retryable == 2
+
+    llm = FakeLLM()
+    progress = await _runner(llm, source, output).run()
+
+    assert sorted(prompt.rsplit(" ", 1)[1] for prompt in llm.prompts) == ["two", "zero"]
+    assert sorted(item.index for item in _written(output)) == list(range(5))
+    assert (progress.completed, progress.failed, progress.retryable, progress.resumed) == (5, 0, 0, 3)
+    assert json.loads(output.with_name("out.jsonl.checkpoint").read_text())["retry"] == []
+
+
+@pytest.mark.asyncio
+async def test_refuses_to_mix_runs_until_reset(tmp_path: Path) -> None:
+    source = _jsonl(tmp_path / "in.jsonl", ["Ana: hi"])
+    other = _jsonl(tmp_path / "other.jsonl", ["Bob: hi"])
+    output = tmp_path / "out.jsonl"
+    output.write_text('{"index": 0}\n')
+
+    with pytest.raises(ValueError, match="no checkpoint"):
+        await _runner(FakeLLM(), source, output).run()
+
+    runner = _runner(FakeLLM(), source, output)
+    runner.reset()
+    await runner.run()
+    with pytest.raises(ValueError, match="holds results for"):
+        await _runner(FakeLLM(), other, output).run()
+
+
+def test_throughput_and_eta_follow_the_recent_rate() -> None:
+    state = bulk._Run(bulk.Checkpoint(input="in.jsonl"), done=set(), retry={}, total=1000, started=0.0)  # pylint: disable=protected-access
+    state.stats.summarized = 300
+    assert state.progress(10.0).items_per_second == 30
+
+    state.stats.summarized = 330  # rate-limited from here on: 1 item/s
+    progress = state.progress(40.0)
+    assert progress.items_per_second == 1 and progress.elapsed_seconds == 40
+    assert progress.eta_seconds == 1000
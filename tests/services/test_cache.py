@@ -0,0 +1,58 @@
+import time
+
+from app.domain import dtos
+from app.services import cache
+
+
+def _response(summary: str = "s") -> dtos.LLMResponse:
+    return dtos.LLMResponse(summary=summary, action_items=["a"])
+
+
+def test_cache_key_normalizes_whitespace_and_namespace() -> None:
+    c1 = cache.ResultCache(max_bytes=1024, ttl_seconds=60, namespace=("model-a", "prompt"))
+    c2 = cache.ResultCache(max_bytes=1024, ttl_seconds=60, namespace=("model-b", "prompt"))
+
+    assert c1.key("hello   world\n") == c1.key(" hello world")
+    assert c1.key("hello") != c2.key("hello")
+
+
+def test_cache_hit_miss_counters() -> None:
+    c = cache.ResultCache(max_bytes=1024, ttl_seconds=60)
+    key = c.key("hello")
+
+    assert c.get(key) is None
+    c.put(key, _response())
+    assert c.get(key) == _response()
+
+    stats = c.stats()
+    assert stats.hits == 1 and stats.misses == 1 and stats.entries == 1
+    assert 0 < stats.bytes <= stats.max_bytes
+
+
+def test_cache_lru_eviction_respects_byte_budget() -> None:
+    size = len(cache.ResultCache(1, 1).key("x")) + len(_response().model_dump_json())
+    c = cache.ResultCache(max_bytes=size * 2, ttl_seconds=60)
+    k1, k2, k3 = c.key("one"), c.key("two"), c.key("three")
+
+    c.put(k1, _response())
+    c.put(k2, _response())
+    assert c.get(k1) is not None  # k1 becomes most recently used
+    c.put(k3, _response())
+
+    assert c.get(k2) is None
+    assert c.get(k1) is not None and c.get(k3) is not None
+    assert c.stats().evictions == 1
+
+
+def test_cache_ttl_expiry_and_oversized_values() -> None:
+    c = cache.ResultCache(max_bytes=1024, ttl_seconds=0.01)
+    key = c.key("hello")
+    c.put(key, _response())
+    c.put(key, _response("again"))  # replacing an entry keeps the byte count consistent
+    time.sleep(0.02)
+
+    assert c.get(key) is None
+    assert c.stats().expirations == 1 and c.stats().bytes == 0
+
+    c.put(c.key("big"), _response("x" * 2048))
+    assert c.stats().entries == 0
@@ -0,0 +1,36 @@
+from app.domain import dtos, tokens
+from app.services import chunking
+from tests.adapters import mock_data
+
+
+def test_split_turns_on_speaker_labels() -> None:
+    turns = chunking.split_turns("intro line\nAna: hi there\nBob | PCC: hello\nstill Bob\n\nAna: bye")
+
+    assert turns == ["intro line", "Ana: hi there", "Bob | PCC: hello\nstill Bob", "Ana: bye"]
+
+
+def test_chunk_transcript_keeps_whole_turns_within_budget() -> None:
+    chunks = chunking.chunk_transcript(mock_data.TRANSCRIPT, max_tokens=300)
+
+    assert len(chunks) > 1
+    assert all(tokens.estimate_tokens(chunk) <= 300 for chunk in chunks)
+    assert all(chunk.startswith(("Mark Foster", "Liam Garcia")) for chunk in chunks)
+    assert "".join(chunks).replace("\n", "") == "".join(chunking.split_turns(mock_data.TRANSCRIPT)).replace("\n", "")
+
+
+def test_chunk_transcript_splits_oversized_turns() -> None:
+    long_turn = "Ana: " + " ".join(["This sentence is short."] * 40) + " " + "x" * 200
+    chunks = chunking.chunk_transcript(long_turn, max_tokens=20)
+
+    assert len(chunks) > 5
+    assert all(tokens.estimate_tokens(chunk) <= 20 for chunk in chunks)
+    assert chunking.chunk_transcript("", max_tokens=10) == []
+
+
+def test_format_partials() -> None:
+    text = chunking.format_partials(
+        [dtos.LLMResponse(summary="first", action_items=["a", "b"]), dtos.LLMResponse(summary="second", action_items=[])]
+    )
+
+    assert "Part 1:\nSummary: first\nNext actions:\n- a\n- b" in text
+    assert "Part 2:\nSummary: second" in text
@@ -1,19 +1,27 @@
 import sys
 import types
 import asyncio
+import pydantic
 import pytest
 
 from app.services.controller import Controller
-from app.domain import dtos
+from app.domain import dtos, errors, usage
 from app.adapters import db as db_module
-from app.adapters import db
+from app.adapters import db, sqlite
+from app.services import cache, chunking, preprocess, retry, scheduler
+from tests.adapters import mock_data
 
 
 class FakeLLM:
+    def __init__(self) -> None:
+        self.calls = 0
+
     def run_completion(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        self.calls += 1
         return dto(summary="sum", action_items=["x"])  # type: ignore[call-arg]
 
     async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        self.calls += 1
         await asyncio.sleep(0)
         return dto(summary="asum", action_items=["ax"])  # type: ignore[call-arg]
 
@@ -56,3 +64,305 @@ def test_controller_get_summary(fresh_db) -> None:  # type: ignore[no-redef]
     assert got.summary == "s"
     assert got.action_items == ["a"]
     assert str(got.id) == created["id"]  # type: ignore[literal-required]
+
+
+def test_controller_summarize_uses_cache(fresh_db) -> None:  # type: ignore[no-redef]
+    llm = FakeLLM()
+    ctl = Controller(llm_client=llm, cache=cache.ResultCache(max_bytes=1024, ttl_seconds=60))
+
+    first = ctl.summarize(dtos.Transcript(text="hello  there"))
+    second = ctl.summarize(dtos.Transcript(text="hello there"))
+
+    assert llm.calls == 1
+    assert first.id != second.id  # every request still gets its own record
+    assert ctl.cache_stats().hits == 1
+
+
+@pytest.mark.asyncio
+async def test_controller_asummarize_dedupes_and_uses_cache(fresh_db) -> None:  # type: ignore[no-redef]
+    llm = FakeLLM()
+    ctl = Controller(llm_client=llm, cache=cache.ResultCache(max_bytes=1024, ttl_seconds=60))
+
+    docs = dtos.Transcripts(transcripts=[dtos.Transcript(text="a"), dtos.Transcript(text="a"), dtos.Transcript(text="b")])
+    out = await ctl.asummarize(docs)
+
+    assert llm.calls == 2
+    assert len(out.responses) == 3
+    assert len({r.id for r in out.responses}) == 3
+
+    await ctl.asummarize(docs)
+    assert llm.calls == 2
+
+
+def test_controller_cache_stats_disabled(fresh_db) -> None:  # type: ignore[no-redef]
+    assert Controller(llm_client=FakeLLM()).cache_stats() is None
+
+
+@pytest.mark.asyncio
+async def test_controller_asummarize_through_scheduler(fresh_db) -> None:  # type: ignore[no-redef]
+    sched = scheduler.RateLimitedScheduler(max_concurrency=1)
+    ctl = Controller(llm_client=FakeLLM(), scheduler=sched)
+
+    docs = dtos.Transcripts(transcripts=[dtos.Transcript(text="a"), dtos.Transcript(text="b")])
+    out = await ctl.asummarize(docs)
+
+    assert len(out.responses) == 2
+    assert ctl.scheduler_stats().admitted == 2
+    assert Controller(llm_client=FakeLLM()).scheduler_stats() is None
+
+
+def test_controller_store_stats(fresh_db, tmp_path) -> None:  # type: ignore[no-redef]
+    ctl = Controller(llm_client=FakeLLM())
+    ctl.summarize(dtos.Transcript(text="hi"))
+
+    assert ctl.store_stats().records == 1
+    sqlite_ctl = Controller(llm_client=FakeLLM(), repository=sqlite.SQLiteDB(str(tmp_path / "s.db")))
+    assert sqlite_ctl.store_stats() is None
+
+
+class FlakyLLM(FakeLLM):
+    """Fails permanently for 'bad', transiently once for 'flaky', returns nothing for 'empty'."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._seen: set[str] = set()
+
+    async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        self.calls += 1
+        if "bad" in user_prompt:
+            raise errors.LLMError("bad request")
+        if "flaky" in user_prompt and "flaky" not in self._seen:
+            self._seen.add("flaky")
+            raise errors.RetryableLLMError("rate limited")
+        if "empty" in user_prompt:
+            return None
+        return dto(summary=user_prompt, action_items=[])  # type: ignore[call-arg]
+
+
+@pytest.mark.asyncio
+async def test_controller_asummarize_partial_success_preserves_order(fresh_db) -> None:  # type: ignore[no-redef]
+    policy = retry.RetryPolicy(max_attempts=2, base_delay=0.001, max_delay=0.001)
+    ctl = Controller(llm_client=FlakyLLM(), retry_policy=policy)
+
+    docs = dtos.Transcripts(transcripts=[dtos.Transcript(text=t) for t in ("ok", "bad", "flaky", "empty")])
+    out = await ctl.asummarize(docs)
+
+    assert [r is not None for r in out.responses] == [True, False, True, False]
+    assert "ok" in out.responses[0].summary and "flaky" in out.responses[2].summary
+    assert [(e.index, e.retryable) for e in out.errors] == [(1, False), (3, False)]
+    assert out.errors[0].error.startswith("LLMError")
+
+
+@pytest.mark.asyncio
+async def test_controller_astream_summarize_yields_each_item(fresh_db) -> None:  # type: ignore[no-redef]
+    llm = FlakyLLM()
+    ctl = Controller(llm_client=llm, retry_policy=retry.RetryPolicy(max_attempts=1))
+
+    docs = dtos.Transcripts(transcripts=[dtos.Transcript(text=t) for t in ("ok", "bad", "ok")])
+    items = [item async for item in ctl.astream_summarize(docs)]
+
+    assert sorted(item.index for item in items) == [0, 1, 2]
+    assert llm.calls == 2  # the duplicate "ok" shares one call
+    by_index = {item.index: item for item in items}
+    assert by_index[1].error is not None and by_index[1].response is None
+    assert by_index[0].response.id != by_index[2].response.id
+    assert db_module.database.get(str(by_index[0].response.id)) is not None
+
+
+@pytest.mark.asyncio
+async def test_controller_astream_summarize_cancels_pending_on_close(fresh_db) -> None:  # type: ignore[no-redef]
+    class SlowLLM(FakeLLM):
+        async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+            await asyncio.sleep(0 if "fast" in user_prompt else 10)
+            return dto(summary="s", action_items=[])  # type: ignore[call-arg]
+
+    ctl = Controller(llm_client=SlowLLM())
+    stream = ctl.astream_summarize(dtos.Transcripts(transcripts=[dtos.Transcript(text="fast"), dtos.Transcript(text="slow")]))
+
+    first = await anext(stream)
+    await stream.aclose()
+
+    assert first.index == 0
+    assert len(db_module.database.all()) == 1
+
+
+class RecordingLLM(FakeLLM):
+    def __init__(self, empty: bool = False) -> None:
+        super().__init__()
+        self.prompts: list[str] = []
+        self._empty = empty
+
+    def run_completion(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        self.prompts.append(user_prompt)
+        return None if self._empty else dto(summary=f"part {len(self.prompts)}", action_items=["x"])  # type: ignore[call-arg]
+
+    async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        return self.run_completion(system_prompt, user_prompt, dto)
+
+
+LONG = dtos.Transcript(text=mock_data.TRANSCRIPT)
+POLICY = chunking.ChunkingPolicy(threshold_tokens=500, chunk_tokens=300)
+
+
+def test_controller_summarize_map_reduces_long_transcripts(fresh_db) -> None:  # type: ignore[no-redef]
+    llm = RecordingLLM()
+    resp = Controller(llm_client=llm, chunking_policy=POLICY).summarize(LONG)
+
+    chunk_prompts = [p for p in llm.prompts if "part" in p and "of a longer conversation" in p]
+    assert len(chunk_prompts) == len(chunking.chunk_transcript(LONG.text, 300))
+    assert "Partial summaries" in llm.prompts[-1]
+    assert resp.summary == f"part {len(llm.prompts)}"
+
+
+@pytest.mark.asyncio
+async def test_controller_asummarize_map_reduces_long_transcripts(fresh_db) -> None:  # type: ignore[no-redef]
+    llm = RecordingLLM()
+    ctl = Controller(llm_client=llm, chunking_policy=POLICY, scheduler=scheduler.RateLimitedScheduler(max_concurrency=4))
+
+    out = await ctl.asummarize(dtos.Transcripts(transcripts=[LONG, dtos.Transcript(text="short")]))
+
+    assert len(llm.prompts) == len(chunking.chunk_transcript(LONG.text, 300)) + 2
+    assert all(r is not None for r in out.responses)
+
+
+@pytest.mark.asyncio
+async def test_controller_map_reduce_handles_empty_and_failing_chunks(fresh_db) -> None:  # type: ignore[no-redef]
+    assert Controller(llm_client=RecordingLLM(empty=True), chunking_policy=POLICY).summarize(LONG) is None
+
+    out = await Controller(llm_client=RecordingLLM(empty=True), chunking_policy=POLICY).asummarize(dtos.Transcripts(transcripts=[LONG]))
+    assert out.responses == [None]
+
+    class FailingLLM(RecordingLLM):
+        async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+            if "part 2 of" in user_prompt:
+                raise errors.LLMError("chunk failed")
+            await asyncio.sleep(0.01)
+            return self.run_completion(system_prompt, user_prompt, dto)
+
+    ctl = Controller(llm_client=FailingLLM(), chunking_policy=POLICY)
+    out = await ctl.asummarize(dtos.Transcripts(transcripts=[LONG]))
+    assert out.errors[0].error == "LLMError: chunk failed"
+
+
+class VerboseLLM(RecordingLLM):
+    """Partial summaries long enough that merging them all at once would overflow a chunk."""
+
+    def run_completion(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        self.prompts.append(user_prompt)
+        return dto(summary=f"part {len(self.prompts)} " + "detail " * 60, action_items=["x"])  # type: ignore[call-arg]
+
+
+@pytest.mark.asyncio
+async def test_controller_reduces_long_partials_in_rounds(fresh_db) -> None:  # type: ignore[no-redef]
+    chunks = len(chunking.chunk_transcript(LONG.text, 300))
+    sync_llm, async_llm = VerboseLLM(), VerboseLLM()
+
+    resp = Controller(llm_client=sync_llm, chunking_policy=POLICY).summarize(LONG)
+    aresp = await Controller(llm_client=async_llm, chunking_policy=POLICY).asummarize_transcript(LONG)
+
+    for llm, result in ((sync_llm, resp), (async_llm, aresp)):
+        reduces = [p for p in llm.prompts if "Partial summaries" in p]
+        assert len(llm.prompts) == chunks + len(reduces) and len(reduces) > 1
+        assert max(p.count("Part ") for p in reduces) < chunks  # no single prompt merges every chunk
+        assert "Partial summaries" in llm.prompts[-1] and result.summary.startswith(f"part {len(llm.prompts)} ")
+
+
+def test_controller_sync_map_reduce_uses_a_shared_bounded_pool(fresh_db) -> None:  # type: ignore[no-redef]
+    ctl = Controller(llm_client=RecordingLLM(), chunking_policy=POLICY, scheduler=scheduler.RateLimitedScheduler(max_concurrency=2))
+
+    ctl.summarize(LONG)
+    ctl.summarize(dtos.Transcript(text=LONG.text + " again"))
+
+    assert ctl._map_pool._max_workers == 2  # pylint: disable=protected-access
+    assert len(ctl._map_pool._threads) <= 2  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_controller_prompts_with_the_transcript_text(fresh_db) -> None:  # type: ignore[no-redef]
+    llm = RecordingLLM()
+
+    Controller(llm_client=llm).summarize(dtos.Transcript(text="Ana: hi\nBob: hello"))
+    await Controller(llm_client=llm).asummarize_transcript(dtos.Transcript(text="Ana: bye"))
+
+    assert llm.prompts[0].endswith("Transcript:\n                    Ana: hi\nBob: hello")
+    assert llm.prompts[1].endswith("Ana: bye")
+    assert not any("text=" in prompt for prompt in llm.prompts)
+
+
+def test_controller_preprocesses_before_prompting_and_chunking(fresh_db) -> None:  # type: ignore[no-redef]
+    llm = RecordingLLM()
+    preprocessor = preprocess.Preprocessor()
+    ctl = Controller(llm_client=llm, chunking_policy=POLICY, preprocessor=preprocessor)
+
+    ctl.summarize(LONG)
+
+    shrunk = preprocess.Preprocessor().run(LONG.text)
+    assert len(llm.prompts) == len(chunking.chunk_transcript(shrunk, 300)) + 1
+    assert "Speakers: Mark = Mark Foster | MCC, ACTC" in llm.prompts[0]
+    assert ctl.preprocess_stats() == preprocessor.stats() and preprocessor.stats().transcripts == 1
+    assert Controller(llm_client=llm).preprocess_stats() is None
+
+
+@pytest.mark.asyncio
+async def test_controller_asummarize_transcript(fresh_db) -> None:  # type: ignore[no-redef]
+    llm = FakeLLM()
+    ctl = Controller(llm_client=llm, cache=cache.ResultCache(max_bytes=1024, ttl_seconds=60))
+
+    first = await ctl.asummarize_transcript(dtos.Transcript(text="hello"))
+    second = await ctl.asummarize_transcript(dtos.Transcript(text="hello"))
+
+    assert first.summary == "asum" and first.id != second.id
+    assert llm.calls == 1
+    assert await db_module.database.aget(str(first.id)) is not None
+    assert await Controller(llm_client=RecordingLLM(empty=True)).asummarize_transcript(dtos.Transcript(text="x")) is None
+
+
+class BilledLLM(FakeLLM):
+    async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        usage.record(len(user_prompt), 5)
+        return await super().run_completion_async(system_prompt, user_prompt, dto)
+
+
+@pytest.mark.asyncio
+async def test_controller_stores_usage_per_record(fresh_db) -> None:  # type: ignore[no-redef]
+    ctl = Controller(llm_client=BilledLLM(), cache=cache.ResultCache(max_bytes=1024, ttl_seconds=60))
+
+    with usage.metered() as request:
+        out = await ctl.asummarize(dtos.Transcripts(transcripts=[dtos.Transcript(text="a"), dtos.Transcript(text="bb")]))
+    repeat = await ctl.asummarize_transcript(dtos.Transcript(text="a"))
+
+    first, second = out.responses
+    assert first.usage.completion_tokens == 5 and second.usage.prompt_tokens == first.usage.prompt_tokens + 1
+    assert request.total_tokens == first.usage.total_tokens + second.usage.total_tokens
+    assert repeat.usage == dtos.TokenUsage()  # served from the cache, nothing spent
+    assert fresh_db.get(str(first.id))["usage"] == first.usage.model_dump()
+
+
+def test_controller_uses_injected_repository(fresh_db, tmp_path) -> None:  # type: ignore[no-redef]
+    store = sqlite.SQLiteDB(str(tmp_path / "ctl.db"))
+    ctl = Controller(llm_client=FakeLLM(), repository=store)
+
+    resp = ctl.summarize(dtos.Transcript(text="hello"))
+
+    assert store.get(str(resp.id)) is not None
+    assert fresh_db.all() == []
+    assert ctl.get_summary(str(resp.id)).summary == "sum"
+    assert ctl.get_summary("missing") is None
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_controller_responses_match_what_is_stored(fresh_db) -> None:  # type: ignore[no-redef]
+    ctl = Controller(llm_client=FakeLLM(), cache=cache.ResultCache(max_bytes=1024, ttl_seconds=60))
+
+    out = await ctl.asummarize(dtos.Transcripts(transcripts=[dtos.Transcript(text="a"), dtos.Transcript(text="a ")]))
+    single = await ctl.asummarize_transcript(dtos.Transcript(text="b"))
+
+    # Built from the stored models rather than read back, yet identical to what a later read returns.
+    for response in [*out.responses, single]:
+        assert response == ctl.get_summary(str(response.id))
+    assert out.responses[0].id != out.responses[1].id
+    with pytest.raises(pydantic.ValidationError):
+        single.summary = "changed"  # type: ignore[misc]
+    page = await ctl.alist_summaries(None, 10)
+    assert page.items == [*out.responses, single]
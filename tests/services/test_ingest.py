@@ -0,0 +1,133 @@
+import asyncio
+from typing import AsyncIterator
+
+import pytest
+
+from app.domain import dtos, errors
+from app.services import ingest
+
+POLICY = ingest.UploadPolicy(max_bytes=1000, max_transcript_bytes=40, max_inflight=2)
+
+
+async def _chunks(*parts: bytes) -> AsyncIterator[bytes]:
+    for part in parts:
+        yield part
+
+
+async def _parsed(chunks: AsyncIterator[bytes], fmt: ingest.Format = "jsonl", policy: ingest.UploadPolicy = POLICY) -> list:
+    return [item async for item in ingest.parse(chunks, fmt, policy)]
+
+
+@pytest.mark.asyncio
+async def test_parse_jsonl_across_chunk_boundaries() -> None:
+    # Lines (and a multi-byte character) split across chunks, a blank line and no trailing newline.
+    body = '{"text": "Ana: hola"}\n\n{"text": "Bob: café"}\r\n{"text": "Cy: bye"}'.encode()
+    items = await _parsed(_chunks(body[:5], body[5:30], body[30:44], body[44:]))
+
+    assert [item.text for item in items] == ["Ana: hola", "Bob: café", "Cy: bye"]
+
+
+@pytest.mark.asyncio
+async def test_parse_reports_bad_and_oversized_lines_and_keeps_going() -> None:
+    long_line = b'{"text": "' + b"x" * 60 + b'"}'
+    items = await _parsed(_chunks(b'{"text": "ok"}\nnot json\n{"text": "  "}\n', long_line[:30], long_line[30:] + b'\n{"text": "after"}\n'))
+
+    assert isinstance(items[0], dtos.Transcript)
+    assert isinstance(items[1], ValueError) and isinstance(items[2], ValueError)
+    assert isinstance(items[3], errors.UploadTooLarge) and items[3].limit == 40
+    assert items[4].text == "after" and len(items) == 5
+
+
+@pytest.mark.asyncio
+async def test_parse_stops_at_the_upload_limit() -> None:
+    line = b'{"text": "Ana: hi"}\n'
+    policy = ingest.UploadPolicy(max_bytes=len(line) * 2, max_transcript_bytes=100)
+
+    items = await _parsed(_chunks(line, line, line, line), policy=policy)
+
+    assert [type(item) for item in items] == [dtos.Transcript, dtos.Transcript, errors.UploadTooLarge]
+    assert "upload" in str(items[2])
+
+
+@pytest.mark.asyncio
+async def test_parse_text_is_one_transcript() -> None:
+    assert [item.text for item in await _parsed(_chunks(b"Ana: one\n", b"Bob: two \n"), "text")] == ["Ana: one\nBob: two"]
+
+    too_long = await _parsed(_chunks(b"x" * 30, b"x" * 30), "text")
+    assert len(too_long) == 1 and isinstance(too_long[0], errors.UploadTooLarge)
+    assert isinstance((await _parsed(_chunks(b"\xff"), "text"))[0], UnicodeDecodeError)
+
+
+@pytest.mark.asyncio
+async def test_parse_files_shares_the_byte_budget() -> None:
+    policy = ingest.UploadPolicy(max_bytes=25, max_transcript_bytes=100)
+    files: list[tuple[ingest.Format, AsyncIterator[bytes]]] = [
+        ("text", _chunks(b"Ana: first")),
+        ("jsonl", _chunks(b'{"text": "Bob: second"}\n')),
+        ("text", _chunks(b"never read")),
+    ]
+
+    items = [item async for item in ingest.parse_files(files, policy)]
+
+    assert items[0].text == "Ana: first"
+    assert isinstance(items[1], errors.UploadTooLarge) and len(items) == 2
+
+
+@pytest.mark.asyncio
+async def test_process_starts_items_while_reading_and_bounds_inflight() -> None:
+    running = 0
+    peak = 0
+    read = 0
+
+    async def items() -> AsyncIterator[ingest.Parsed]:
+        nonlocal read
+        for n in range(6):
+            read += 1
+            yield ValueError("bad line") if n == 3 else dtos.Transcript(text=f"t{n}")
+
+    async def summarize(index: int, text: dtos.Transcript) -> dtos.LLMStreamItem:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if text.text == "t5":
+            raise errors.RetryableLLMError("429")
+        return dtos.LLMStreamItem(index=index)
+
+    results = []
+    async for item in ingest.process(items(), summarize, max_inflight=2):
+        if not results:
+            assert read < 6  # the first result goes out before the upload is fully read
+        results.append(item)
+
+    assert peak == 2
+    assert sorted(item.index for item in results) == list(range(6))
+    failed = {item.index: item.error for item in results if item.error}
+    assert failed[3].retryable is False and "bad line" in failed[3].error
+    assert failed[5].retryable is True
+
+
+@pytest.mark.asyncio
+async def test_process_cancels_pending_items_when_closed() -> None:
+    cancelled = 0
+
+    async def items() -> AsyncIterator[ingest.Parsed]:
+        yield dtos.Transcript(text="fast")
+        yield dtos.Transcript(text="slow")
+
+    async def summarize(index: int, text: dtos.Transcript) -> dtos.LLMStreamItem:
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(0 if text.text == "fast" else 5)
+        except asyncio.CancelledError:
+            cancelled += 1
+            raise
+        return dtos.LLMStreamItem(index=index)
+
+    stream = ingest.process(items(), summarize, max_inflight=2)
+    await anext(stream)
+    await stream.aclose()
+    await asyncio.sleep(0)
+
+    assert cancelled == 1
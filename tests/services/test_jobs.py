@@ -0,0 +1,80 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.adapters import db as db_module
+from app.domain import dtos
+from app.services import controller, jobs
+
+
+class FakeLLM:
+    def run_completion(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        raise NotImplementedError
+
+    async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        await asyncio.sleep(0.01)
+        if "bad" in user_prompt:
+            raise RuntimeError("bad")
+        return dto(summary="s", action_items=[])  # type: ignore[call-arg]
+
+
+@pytest.fixture()
+def fresh_db(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(db_module, "database", db_module.DB(), raising=True)
+    return db_module.database
+
+
+async def _wait_for(manager: jobs.JobManager, job_id: uuid.UUID) -> dtos.JobStatus:
+    for _ in range(200):
+        if (status := manager.status(job_id)) and status.status == dtos.JobState.COMPLETED:
+            return status
+        await asyncio.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+@pytest.mark.asyncio
+async def test_job_manager_processes_items_in_background(fresh_db) -> None:  # type: ignore[no-redef]
+    manager = jobs.JobManager(controller.Controller(llm_client=FakeLLM()), workers=2, retention_seconds=60)
+    await manager.start()
+    try:
+        docs = dtos.Transcripts(transcripts=[dtos.Transcript(text=t) for t in ("a", "bad", "c")])
+        queued = manager.submit(docs)
+        assert queued.status == dtos.JobState.QUEUED and queued.completed == 0
+
+        done = await _wait_for(manager, queued.id)
+    finally:
+        await manager.stop()
+
+    assert done.completed == 3
+    assert done.result_ids[1] is None and [e.index for e in done.errors] == [1]
+    assert all(fresh_db.get(str(rid)) for rid in (done.result_ids[0], done.result_ids[2]))
+
+
+@pytest.mark.asyncio
+async def test_job_manager_survives_controller_errors_and_prunes(fresh_db, monkeypatch: pytest.MonkeyPatch) -> None:  # type: ignore[no-redef]
+    ctl = controller.Controller(llm_client=FakeLLM())
+
+    async def explode(index: int, text: dtos.Transcript) -> dtos.LLMStreamItem:
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(ctl, "asummarize_item", explode)
+    manager = jobs.JobManager(ctl, workers=1, retention_seconds=0)
+    await manager.start()
+    try:
+        job = manager.submit(dtos.Transcripts(transcripts=[dtos.Transcript(text="a")]))
+        done = await _wait_for(manager, job.id)
+        assert done.errors[0].error.startswith("RuntimeError")
+
+        empty = manager.submit(dtos.Transcripts(transcripts=[]))
+        assert empty.status == dtos.JobState.COMPLETED
+        assert manager.status(job.id) is None  # pruned once past retention
+    finally:
+        await manager.stop()
+
+
+def test_job_manager_requires_start() -> None:
+    manager = jobs.JobManager(controller.Controller(llm_client=FakeLLM()), workers=1, retention_seconds=60)
+    with pytest.raises(RuntimeError):
+        manager.submit(dtos.Transcripts(transcripts=[]))
+    assert manager.status(uuid.uuid4()) is None
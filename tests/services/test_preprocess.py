@@ -0,0 +1,60 @@
+import pytest
+
+from app.domain import tokens
+from app.services import chunking, preprocess
+from tests.adapters import mock_data
+
+
+def test_normalize_whitespace_keeps_one_turn_per_line() -> None:
+    text = "  Ana:   hi\tthere \n\n\nBob | PCC:  hello  \n"
+
+    assert preprocess.normalize_whitespace(text) == "Ana: hi there\nBob | PCC: hello"
+
+
+def test_alias_speakers_shortens_repeated_labels_with_a_legend() -> None:
+    text = preprocess.normalize_whitespace(mock_data.TRANSCRIPT)
+
+    aliased = preprocess.alias_speakers(text)
+
+    assert aliased.startswith("Speakers: Mark = Mark Foster | MCC, ACTC; Liam = Liam Garcia\n")
+    assert "Mark Foster | MCC, ACTC:" not in aliased.split("\n", 1)[1]
+    assert len(chunking.split_turns(aliased)) == len(chunking.split_turns(text)) + 1
+    assert tokens.estimate_tokens(aliased) < tokens.estimate_tokens(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Ana Lopez: hi\nAna Smith: hello\nAna Lopez: bye\nAna Smith: bye",  # first names collide
+        "Bob: hi\nBob: hello",  # nothing to shorten
+        "Note: a single long label before the talk starts",  # not a repeated speaker
+    ],
+)
+def test_alias_speakers_leaves_ambiguous_or_unprofitable_labels(text: str) -> None:
+    assert preprocess.alias_speakers(text) == text
+
+
+def test_drop_filler_removes_disfluencies_only() -> None:
+    text = "Liam: Um, so we, uh, need it. You know, it works um.\nAna: Uh-huh, it is, you know, fine. Hmm, okay. Umbrella."
+
+    assert preprocess.drop_filler(text) == "Liam: so we need it. it works.\nAna: Uh-huh, it is fine. okay. Umbrella."
+
+
+def test_preprocessor_reports_tokens_saved_per_stage() -> None:
+    preprocessor = preprocess.Preprocessor(["whitespace", "speakers", "filler"])
+
+    shrunk = preprocessor.run(mock_data.TRANSCRIPT)
+    preprocessor.run(mock_data.TRANSCRIPT)
+
+    stats = preprocessor.stats()
+    assert stats.stages == ["whitespace", "speakers", "filler"]
+    assert stats.transcripts == 2
+    assert stats.input_tokens == 2 * tokens.estimate_tokens(mock_data.TRANSCRIPT)
+    assert stats.output_tokens == 2 * tokens.estimate_tokens(shrunk)
+    assert stats.saved_tokens["speakers"] > 0
+    assert sum(stats.saved_tokens.values()) == stats.input_tokens - stats.output_tokens
+
+
+def test_preprocessor_rejects_unknown_stages() -> None:
+    with pytest.raises(ValueError, match="stopwords"):
+        preprocess.Preprocessor(["whitespace", "stopwords"])  # type: ignore[list-item]
@@ -0,0 +1,75 @@
+import pytest
+
+from app.domain import errors
+from app.services import retry
+
+FAST = retry.RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.002)
+
+
+class Flaky:
+    def __init__(self, failures: int, exc: Exception | None = None) -> None:
+        self.calls = 0
+        self._failures = failures
+        self._exc = exc or errors.RetryableLLMError("429")
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self.calls <= self._failures:
+            raise self._exc
+        return "ok"
+
+    async def acall(self) -> str:
+        return self()
+
+
+def test_retry_policy_delay_is_jittered_and_capped() -> None:
+    policy = retry.RetryPolicy(base_delay=1, max_delay=4)
+    delays = [policy.delay(attempt) for attempt in range(10) for _ in range(20)]
+
+    assert all(0 <= d <= 4 for d in delays)
+    assert len(set(delays)) > 1
+    assert policy.delay(0, retry_after=10) == 10
+
+
+def test_retry_recovers_from_transient_errors() -> None:
+    fn = Flaky(failures=2)
+    assert retry.retry(fn, FAST) == "ok"
+    assert fn.calls == 3
+
+
+def test_retry_gives_up_and_skips_permanent_errors() -> None:
+    fn = Flaky(failures=5)
+    with pytest.raises(errors.RetryableLLMError):
+        retry.retry(fn, FAST)
+    assert fn.calls == 3
+
+    permanent = Flaky(failures=5, exc=errors.LLMError("400"))
+    with pytest.raises(errors.LLMError):
+        retry.retry(permanent, FAST)
+    assert permanent.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_aretry_recovers_and_gives_up() -> None:
+    fn = Flaky(failures=1)
+    assert await retry.aretry(fn.acall, FAST) == "ok"
+
+    failing = Flaky(failures=5)
+    with pytest.raises(errors.RetryableLLMError):
+        await retry.aretry(failing.acall, FAST)
+    assert failing.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_unavailable_upstream_is_not_retried() -> None:
+    unavailable = Flaky(failures=5, exc=errors.LLMUnavailableError("circuit open", retry_after=30))
+    with pytest.raises(errors.LLMUnavailableError):
+        retry.retry(unavailable, FAST)
+    with pytest.raises(errors.LLMUnavailableError):
+        await retry.aretry(unavailable.acall, FAST)
+    assert unavailable.calls == 2
+
+
+def test_retry_requires_an_attempt() -> None:
+    with pytest.raises(RuntimeError):
+        retry.retry(Flaky(failures=0), retry.RetryPolicy(max_attempts=0))
@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+import pytest
+
+from app.domain import tokens
+from app.services import scheduler
+
+
+def test_estimate_tokens() -> None:
+    assert tokens.estimate_tokens("") == 0
+    assert tokens.estimate_tokens("abcd", "abcde") == 3
+
+
+@pytest.mark.asyncio
+async def test_scheduler_bounds_concurrency() -> None:
+    sched = scheduler.RateLimitedScheduler(max_concurrency=2)
+    peak = 0
+
+    async def work() -> None:
+        nonlocal peak
+        async with sched.slot(tokens=1):
+            peak = max(peak, sched.stats().running)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[work() for _ in range(6)])
+
+    stats = sched.stats()
+    assert peak == 2
+    assert stats.admitted == 6 and stats.running == 0 and stats.waiting == 0
+    assert stats.avg_queue_wait_seconds > 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_enforces_token_budget() -> None:
+    sched = scheduler.RateLimitedScheduler(max_concurrency=10, tokens_per_minute=6000)
+
+    async with sched.slot(tokens=6000) as first:
+        assert first.queue_wait < 0.05
+
+    start = time.monotonic()
+    async with sched.slot(tokens=6) as second:
+        pass
+
+    assert time.monotonic() - start >= 0.05
+    assert second.queue_wait >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_scheduler_enforces_request_budget() -> None:
+    sched = scheduler.RateLimitedScheduler(max_concurrency=10, requests_per_minute=600)
+
+    await asyncio.gather(*[_enter(sched) for _ in range(600)])
+    async with sched.slot(tokens=0) as ticket:
+        pass
+
+    assert ticket.queue_wait >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_scheduler_releases_slot_when_cancelled_while_waiting() -> None:
+    sched = scheduler.RateLimitedScheduler(max_concurrency=1, tokens_per_minute=60)
+    async with sched.slot(tokens=60):
+        pass
+
+    waiter = asyncio.create_task(_enter(sched, tokens=60))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert sched.stats().waiting == 0
+    assert sched._semaphore.locked() is False  # pylint: disable=protected-access
+
+
+async def _enter(sched: scheduler.RateLimitedScheduler, tokens: int = 0) -> None:
+    async with sched.slot(tokens=tokens):
+        pass
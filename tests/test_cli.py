@@ -0,0 +1,37 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app import cli, views
+from app.adapters import db as db_module
+from app.services import controller
+from tests.test_views import FakeLLM
+
+
+@pytest.fixture(autouse=True)
+def fake_controller(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(views, "master_control", controller.Controller(llm_client=FakeLLM(), repository=db_module.DB()), raising=True)
+
+
+def test_bulk_command_reports_progress_and_exit_status(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    source = tmp_path / "in.jsonl"
+    source.write_text('{"text": "Ana: hi"}\n{"text": "boom"}\n')
+    output = tmp_path / "out.jsonl"
+
+    assert cli.main(["bulk", str(source), "--output", str(output), "--progress-seconds", "0"]) == 1  # one item failed
+    assert sorted(json.loads(line)["index"] for line in output.read_text().splitlines()) == [0, 1]
+    assert "2/2 lines, 1 failed" in capsys.readouterr().err
+
+    assert cli.main(["bulk", str(source), "-o", str(output)]) == 0  # resumed with nothing left to do
+    assert len(output.read_text().splitlines()) == 2
+
+    output.with_name("out.jsonl.checkpoint").unlink()
+    assert cli.main(["bulk", str(source), "-o", str(output)]) == 2
+    assert "--restart" in capsys.readouterr().err
+    assert cli.main(["bulk", str(source), "-o", str(output), "--restart"]) == 1
+
+
+def test_duration() -> None:
+    assert cli._duration(75) == "1m15s"  # pylint: disable=protected-access
+    assert cli._duration(3 * 3600 + 61) == "3h01m01s"  # pylint: disable=protected-access
@@ -0,0 +1,17 @@
+from prometheus_client import REGISTRY
+
+from app import metrics
+
+
+def test_render_uses_default_registry() -> None:
+    metrics.STORE_RECORDS.set(3)
+
+    assert b"store_records 3.0" in metrics.render()
+
+
+def test_render_aggregates_worker_processes(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    # No worker has written samples yet, so the multiprocess registry is empty.
+    assert metrics.render() == b""
+    assert REGISTRY.get_sample_value("store_records") is not None
@@ -0,0 +1,280 @@
+import asyncio
+import json
+import time
+from typing import Iterator, Mapping
+
+import pydantic
+import pytest
+from fastapi.testclient import TestClient
+
+from app import views
+from app.adapters import db as db_module
+from app.adapters import fake, guarded, openai, routing
+from app.domain import dtos, errors, usage
+from app.ports import batch
+from app.services import backfill, budget, cache, controller, ingest, jobs, scheduler
+
+
+class FakeLLM:
+    def run_completion(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        return dto(summary="sum", action_items=["x"])  # type: ignore[call-arg]
+
+    async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        await asyncio.sleep(0)
+        if "boom" in user_prompt:
+            raise RuntimeError("boom")
+        return dto(summary="asum", action_items=["ax"])  # type: ignore[call-arg]
+
+
+class FakeBatchLLM(batch.BatchLLm):
+    def submit(self, system_prompt: str, user_prompts: Mapping[str, str], dto: type[pydantic.BaseModel]) -> str:
+        return "batch_1"
+
+    def status(self, batch_id: str) -> dtos.BackfillStatus:
+        return dtos.BackfillStatus(id=batch_id, status="completed", finished=True, total=1)
+
+    def results(self, batch_id: str, dto: type[pydantic.BaseModel]) -> dict[str, batch.Outcome]:
+        return {"0": (dto(summary="s", action_items=[]), dtos.TokenUsage())}  # type: ignore[call-arg]
+
+
+class FailingBatchLLM(FakeBatchLLM):
+    def submit(self, system_prompt: str, user_prompts: Mapping[str, str], dto: type[pydantic.BaseModel]) -> str:
+        raise errors.LLMError("upstream down")
+
+    def status(self, batch_id: str) -> dtos.BackfillStatus:
+        raise errors.LLMError("upstream down")
+
+
+@pytest.fixture()
+def client(monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+    monkeypatch.setattr(db_module, "database", db_module.DB(), raising=True)
+    ctl = controller.Controller(
+        llm_client=FakeLLM(),
+        cache=cache.ResultCache(max_bytes=1024, ttl_seconds=60),
+        scheduler=scheduler.RateLimitedScheduler(max_concurrency=4),
+    )
+    monkeypatch.setattr(views, "master_control", ctl, raising=True)
+    monkeypatch.setattr(views, "token_budget", budget.TokenBudget(0), raising=True)
+    monkeypatch.setattr(views, "job_manager", jobs.JobManager(ctl, workers=2, retention_seconds=60), raising=True)
+    with TestClient(views.app) as test_client:
+        yield test_client
+
+
+def test_root_and_stats(client: TestClient) -> None:
+    assert client.get("/").json() == {"message": "Hello AceUp"}
+    assert client.get("/cache/stats").json()["entries"] == 0
+    assert client.get("/scheduler/stats").json()["admitted"] == 0
+    assert client.get("/store/stats").json()["records"] == 0
+    assert client.get("/preprocess/stats").status_code == 404
+    assert client.get("/routing/stats").json()["routes"][0]["name"] == "default"
+
+
+def test_generate_and_get_summary(client: TestClient) -> None:
+    created = client.post("/summary/generate", json={"text": "hello"}).json()
+    assert created["summary"] == "asum"  # served by the async path
+
+    fetched = client.get("/summary", params={"id": created["id"]}).json()
+    assert fetched == created
+
+
+def test_batch_generate_partial_and_total_failure(client: TestClient) -> None:
+    partial = client.post("/summary/batch_generate", json={"transcripts": [{"text": "a"}, {"text": "boom"}]})
+    assert partial.status_code == 200
+    body = partial.json()
+    assert body["responses"][0]["summary"] == "asum" and body["responses"][1] is None
+    assert body["errors"][0]["index"] == 1
+
+    failed = client.post("/summary/batch_generate", json={"transcripts": [{"text": "boom"}]})
+    assert failed.status_code == 502
+
+
+def test_token_budget_rejects_with_retry_after(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    exhausted = budget.TokenBudget(100)
+
+    async def spend() -> None:
+        async with exhausted.admit("test", 0):
+            usage.record(100, 0)
+
+    asyncio.run(spend())
+    monkeypatch.setattr(views, "token_budget", exhausted, raising=True)
+
+    for path, payload in (
+        ("/summary/generate", {"text": "hello"}),
+        ("/summary/batch_generate", {"transcripts": [{"text": "a"}]}),
+        ("/summary/batch_generate/stream", {"transcripts": [{"text": "a"}]}),
+    ):
+        response = client.post(path, json=payload)
+        assert response.status_code == 429
+        assert 0 < int(response.headers["retry-after"]) <= 60
+
+    stats = client.get("/budget/stats").json()
+    assert stats["spent_tokens"] == 100 and stats["rejected"] == 3
+    assert b'token_budget_rejections_total{endpoint="generate"}' in client.get("/metrics").content
+
+
+class DownLLM(FakeLLM):
+    def run_completion(self, system_prompt: str, user_prompt: str, dto: type[dtos.LLMResponse]):
+        raise errors.RetryableLLMError("503")
+
+
+def test_health_reports_circuits_and_open_circuit_is_a_503(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    upstream = guarded.GuardedLLM(DownLLM(), "default", circuit=guarded.CircuitPolicy(min_calls=1, window=1))  # type: ignore[arg-type]
+    hedge = guarded.GuardedLLM(FakeLLM(), "hedge")  # type: ignore[arg-type]
+    monkeypatch.setattr(views, "llm_router", routing.RoutingLLM([routing.Route("default", upstream)], routing.Route("hedge", hedge)))
+    monkeypatch.setattr(views.master_control, "_llm_client", upstream, raising=True)
+
+    health = client.get("/health")
+    assert health.status_code == 200
+    assert health.json()["status"] == "ok"
+    assert [circuit["name"] for circuit in health.json()["circuits"]] == ["default", "hedge"]
+
+    with pytest.raises(errors.RetryableLLMError):
+        upstream.run_completion("s", "u", dtos.LLMResponse)
+    health = client.get("/health")
+    assert health.status_code == 503
+    assert health.json()["status"] == "unavailable"
+    assert health.json()["circuits"][0]["state"] == "open"
+
+    refused = client.post("/summary/generate", json={"text": "hello"})
+    assert refused.status_code == 503
+    assert 0 < int(refused.headers["retry-after"]) <= 30
+    assert client.get("/health").json()["circuits"][0]["rejected"] == 1
+
+
+def test_backfill_endpoints(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(views, "backfill_service", None, raising=True)
+    assert client.post("/summary/backfill", json={"transcripts": [{"text": "a"}]}).status_code == 404
+    assert client.get("/summary/backfill/batch_1").status_code == 404
+
+    service = backfill.BackfillService(FakeBatchLLM())
+    monkeypatch.setattr(views, "backfill_service", service, raising=True)
+    submitted = client.post("/summary/backfill", json={"transcripts": [{"text": "a"}]})
+    assert submitted.status_code == 202 and submitted.json()["id"] == "batch_1"
+    assert client.get("/summary/backfill/batch_1").json()["finished"] is True
+
+    monkeypatch.setattr(service, "_batch_client", FailingBatchLLM(), raising=True)
+    assert client.post("/summary/backfill", json={"transcripts": [{"text": "a"}]}).status_code == 502
+    assert client.get("/summary/backfill/other").status_code == 502
+
+
+def test_batch_generate_stream_ndjson(client: TestClient) -> None:
+    response = client.post("/summary/batch_generate/stream", json={"transcripts": [{"text": "a"}, {"text": "b"}]})
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    items = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(item["index"] for item in items) == [0, 1]
+    assert all(item["response"]["summary"] == "asum" for item in items)
+
+
+def test_upload_streams_jsonl_text_and_files(client: TestClient) -> None:
+    body = b'{"text": "a"}\nnot json\n{"text": "boom"}\n'
+    response = client.post("/summary/upload", content=body, headers={"content-type": "application/x-ndjson"})
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    items = {item["index"]: item for item in map(json.loads, response.text.splitlines())}
+    assert items[0]["response"]["summary"] == "asum"
+    assert items[1]["error"]["retryable"] is False and "boom" in items[2]["error"]["error"]
+
+    text = client.post("/summary/upload", content=b"Ana: hi", headers={"content-type": "text/plain; charset=utf-8"})
+    assert json.loads(text.text)["response"]["summary"] == "asum"
+
+    files = [
+        ("files", ("one.txt", b"Ana: one", "text/plain")),
+        ("files", ("many.jsonl", b'{"text": "b"}\n{"text": "c"}', "application/octet-stream")),
+    ]
+    items = {item["index"]: item for item in map(json.loads, client.post("/summary/upload", files=files).text.splitlines())}
+    assert sorted(items) == [0, 1, 2] and not any(item["error"] for item in items.values())
+
+
+def test_upload_rejects_oversized_and_unsupported_bodies(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    assert client.post("/summary/upload", json={"text": "a"}).status_code == 415
+    assert client.post("/summary/upload", files=[("files", ("a.pdf", b"%PDF", "application/pdf"))]).status_code == 415
+
+    monkeypatch.setattr(views, "upload_policy", ingest.UploadPolicy(max_bytes=16), raising=True)
+    assert client.post("/summary/upload", content=b"x" * 17, headers={"content-type": "text/plain"}).status_code == 413
+
+    def chunked() -> Iterator[bytes]:  # no Content-Length
+        yield b'--b\r\nContent-Disposition: form-data; name="files"; filename="a.txt"\r\n\r\n'
+        yield b"x" * 64 + b"\r\n--b--\r\n"
+
+    multipart = {"content-type": "multipart/form-data; boundary=b"}
+    assert client.post("/summary/upload", content=chunked(), headers=multipart).status_code == 413
+    assert client.post("/summary/upload", content=b"--b\r\nnot a part", headers=multipart).status_code == 400
+
+
+def test_list_and_export_summaries(client: TestClient) -> None:
+    ids = [client.post("/summary/generate", json={"text": text}).json()["id"] for text in ("a", "b", "c")]
+
+    first = client.get("/summaries", params={"limit": 2}).json()
+    rest = client.get("/summaries", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    assert [s["id"] for s in first["items"] + rest["items"]] == ids
+    assert rest["next_cursor"] is None
+    assert client.get("/summaries", params={"cursor": "bogus"}).status_code == 400
+    assert client.get("/summaries", params={"cursor": "9" * 30}).status_code == 400
+
+    export = client.get("/summaries/export")
+    assert export.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line)["id"] for line in export.text.splitlines()] == ids
+
+
+def test_search_summaries(client: TestClient) -> None:
+    created = client.post("/summary/generate", json={"text": "hello"}).json()
+
+    found = client.get("/summary/search", params={"q": "asum"}).json()
+    assert [s["id"] for s in found["items"]] == [created["id"]] and found["next_cursor"] is None
+    assert client.get("/summary/search", params={"q": "nothing"}).json()["items"] == []
+    assert client.get("/summary/search", params={"q": "asum", "cursor": "x"}).status_code == 400
+    assert client.get("/summary/search", params={"q": "asum", "cursor": "9" * 30}).status_code == 400
+
+
+def test_jobs_endpoints(client: TestClient) -> None:
+    created = client.post("/summary/jobs", json={"transcripts": [{"text": "a"}, {"text": "b"}]})
+    assert created.status_code == 202
+    job_id = created.json()["id"]
+
+    for _ in range(100):
+        status = client.get(f"/summary/jobs/{job_id}").json()
+        if status["status"] == "completed":
+            break
+        time.sleep(0.01)
+
+    assert status["completed"] == 2
+    assert client.get("/summary", params={"id": status["result_ids"][0]}).json()["summary"] == "asum"
+    assert client.get("/summary/jobs/00000000-0000-0000-0000-000000000000").status_code == 404
+    assert asyncio.iscoroutinefunction(views.create_job)  # the job queue is only safe to use on the event loop
+
+
+def test_metrics_endpoint(client: TestClient) -> None:
+    client.post("/summary/generate", json={"text": "hello"})
+    client.post("/summary/batch_generate", json={"transcripts": [{"text": "a"}, {"text": "b"}]})
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_request_duration_seconds_count{endpoint="/summary/generate",method="POST",status="200"}' in body
+    assert 'summary_batch_size_sum{endpoint="batch_generate"}' in body
+    assert 'transcript_characters_total{endpoint="generate"}' in body
+    assert 'repository_operation_duration_seconds_count{backend="memory",operation="insert"}' in body
+    assert "llm_queue_wait_seconds_count" in body
+    assert "store_records 3.0" in body
+    assert client.get("/missing").status_code == 404
+    assert 'endpoint="unmatched"' in client.get("/metrics").text
+
+
+def test_build_llm_selects_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(views.configurations.app_settings, "LLM_BACKEND", "fake")
+    assert isinstance(views._build_llm("model"), fake.FakeLLM)  # pylint: disable=protected-access
+
+    monkeypatch.setattr(views.configurations.app_settings, "LLM_BACKEND", "openai")
+    assert isinstance(views._build_llm("model"), openai.OpenAIAdapter)  # pylint: disable=protected-access
+
+
+def test_build_router_adds_small_and_hedge_routes(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(views.configurations.app_settings, "LLM_BACKEND", "fake")
+    assert [route.name for route in views._build_router().stats().routes] == ["default"]  # pylint: disable=protected-access
+
+    monkeypatch.setattr(views.configurations.app_settings, "OPENAI_SMALL_MODEL", "small-model")
+    monkeypatch.setattr(views.configurations.app_settings, "OPENAI_HEDGE_MODEL", "hedge-model")
+    stats = views._build_router().stats()  # pylint: disable=protected-access
+    assert [(route.name, route.max_prompt_tokens) for route in stats.routes] == [("small", 2000), ("default", None)]
+    assert stats.hedge is not None and stats.hedge.name == "hedge"